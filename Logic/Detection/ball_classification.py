@@ -2,10 +2,20 @@
 
 import math
 
+import numpy as np
+import cv2
+
 
 class BallClassification:
     """Responsible for classifying game balls"""
 
+    WHITE_CLASS = 1
+    BLACK_CLASS = 2
+
+    ball_masks = {}
+    ball_rectangles = {}
+    colour_class_lut = None
+
     @staticmethod
     def get_ball_radius(x_position, y_position, options):
         """
@@ -19,9 +29,35 @@ class BallClassification:
 
         return math.sqrt(math.pow(options.ball_radius - x_position, 2) + math.pow(options.ball_radius - y_position, 2))
 
-    def get_ball_pixels(self, frame, position, options):
+    def get_ball_mask(self, options):
         """
-        Responsible for returning an array of pixels that represent the circle
+        Responsible for returning the boolean circular mask of a ball patch, built once per ball radius
+
+        Args:
+            options (Options): The options to be used
+        Returns:
+            np.ndarray: The (2r - 1, 2r - 1) mask of pixels within the ball radius
+        """
+
+        ball_radius = options.ball_radius
+
+        if ball_radius not in self.ball_masks:
+            size = max(int(2 * ball_radius) - 1, 0)
+            positions = np.arange(size)
+
+            distances = (ball_radius - positions[:, None]) ** 2 + (ball_radius - positions[None, :]) ** 2
+
+            ball_mask = distances < ball_radius ** 2
+            ball_mask.setflags(write=False)
+
+            self.ball_masks[ball_radius] = ball_mask
+
+        return self.ball_masks[ball_radius]
+
+    @staticmethod
+    def get_ball_frame(frame, position, options):
+        """
+        Responsible for returning the square patch of the frame surrounding a ball
 
         Args:
             frame (numpy): The frame to find the balls in
@@ -29,21 +65,211 @@ class BallClassification:
             options (Options): The options to be used
         """
 
-        ball_pixels = []
-
         min_x_position = int(position[0] - options.ball_radius)
         min_y_position = int(position[1] - options.ball_radius)
         max_x_position = int(position[0] + options.ball_radius)
         max_y_position = int(position[1] + options.ball_radius)
 
-        ball_frame = frame[min_y_position:max_y_position, min_x_position:max_x_position].copy()
+        return frame[min_y_position:max_y_position, min_x_position:max_x_position]
+
+    def get_ball_pixels(self, frame, position, options):
+        """
+        Responsible for returning an array of pixels that represent the circle
 
-        for x_position, _ in enumerate(ball_frame[0:-1]):
-            for y_position, _ in enumerate(ball_frame[0:-1]):
-                if self.get_ball_radius(x_position, y_position, options) < options.ball_radius:
-                    ball_pixels.append(ball_frame[x_position][y_position])
+        Args:
+            frame (numpy): The frame to find the balls in
+            position (tuple): The position of the ball
+            options (Options): The options to be used
+        """
 
-        return ball_pixels
+        ball_frame = self.get_ball_frame(frame, position, options)
+        ball_mask = self.get_ball_mask(options)
+
+        # The patch is scanned as a square with the side of its row count, trimmed by the last row
+        size = max(len(ball_frame) - 1, 0)
+
+        return ball_frame[:size, :size][ball_mask[:size, :size]]
+
+    def get_ball_patches(self, frame, positions, options):
+        """
+        Responsible for stacking the patches of every ball into a single array
+
+        Args:
+            frame (numpy): The frame to find the balls in
+            positions (list[tuple]): The positions of the balls
+            options (Options): The options to be used
+        Returns:
+            tuple[np.ndarray, list[int]]: The (N, 2r - 1, 2r - 1, 3) patches and the indices of the balls whose
+            patch is clipped by the frame and therefore not part of the stack
+        """
+
+        size = self.get_ball_mask(options).shape[0]
+
+        patches = []
+        clipped_indices = []
+
+        for i, position in enumerate(positions):
+            ball_frame = self.get_ball_frame(frame, position, options)
+
+            if ball_frame.shape[0] == size + 1 and ball_frame.shape[1] == size + 1:
+                patches.append(ball_frame[:size, :size])
+            else:
+                clipped_indices.append(i)
+
+        if not patches:
+            return np.empty((0, size, size, 3), dtype=frame.dtype), clipped_indices
+
+        return np.stack(patches), clipped_indices
+
+    def get_colour_counts(self, patches, options):
+        """
+        Responsible for counting the white, black and total pixels of every ball patch at once
+
+        Args:
+            patches (np.ndarray): The (N, 2r - 1, 2r - 1, 3) ball patches
+            options (Options): The options to be used
+        Returns:
+            tuple[np.ndarray, np.ndarray, int]: The white counts, black counts and pixel count of each ball
+        """
+
+        ball_mask = self.get_ball_mask(options)
+
+        is_white = np.all(patches >= 192, axis=-1)
+        is_black = np.all(patches <= 64, axis=-1)
+
+        white_counts = np.count_nonzero(is_white & ball_mask, axis=(1, 2))
+        black_counts = np.count_nonzero(is_black & ball_mask, axis=(1, 2))
+
+        return white_counts, black_counts, int(np.count_nonzero(ball_mask))
+
+    def get_colour_class_lut(self):
+        """
+        Responsible for returning the lookup table that maps a channel value to the colour classes it allows
+
+        A pixel belongs to a colour class when all three of its BGR channels allow it, which reproduces the
+        thresholds of get_white_count and get_black_count.
+
+        Returns:
+            np.ndarray: The 256 entry lookup table of colour class bits
+        """
+
+        if self.colour_class_lut is None:
+            channel_values = np.arange(256)
+
+            colour_class_lut = np.zeros(256, dtype=np.uint8)
+            colour_class_lut[(channel_values >= 192) & (channel_values <= 255)] |= self.WHITE_CLASS
+            colour_class_lut[(channel_values >= 0) & (channel_values <= 64)] |= self.BLACK_CLASS
+
+            BallClassification.colour_class_lut = colour_class_lut
+
+        return self.colour_class_lut
+
+    def get_colour_integrals(self, frame, board_positions, options):
+        """
+        Responsible for building one integral image per colour class for the board region
+
+        The region is padded by the ball radius so the balls on the edge of the board are fully covered.
+
+        Args:
+            frame (numpy): The frame to find the balls in
+            board_positions (tuple): The board positions
+            options (Options): The options to be used
+        Returns:
+            tuple[np.ndarray, np.ndarray, tuple[int, int]]: The white and black integral images and the frame
+            position of their origin
+        """
+
+        min_x_position = max(int(board_positions[0] - options.ball_radius), 0)
+        min_y_position = max(int(board_positions[1] - options.ball_radius), 0)
+        max_x_position = int(board_positions[2] + options.ball_radius)
+        max_y_position = int(board_positions[3] + options.ball_radius)
+
+        board_frame = frame[min_y_position:max_y_position, min_x_position:max_x_position]
+
+        channel_classes = cv2.LUT(board_frame, self.get_colour_class_lut())
+        colour_classes = channel_classes[..., 0] & channel_classes[..., 1] & channel_classes[..., 2]
+
+        white_integral = cv2.integral(colour_classes & self.WHITE_CLASS)
+        black_integral = cv2.integral((colour_classes & self.BLACK_CLASS) >> 1)
+
+        return white_integral, black_integral, (min_x_position, min_y_position)
+
+    def get_ball_rectangles(self, options):
+        """
+        Responsible for decomposing the ball mask into rectangles of consecutive rows sharing the same span
+
+        Args:
+            options (Options): The options to be used
+        Returns:
+            np.ndarray: The (R, 4) rectangles as first row, last row + 1, first column, last column + 1
+        """
+
+        ball_radius = options.ball_radius
+
+        if ball_radius not in self.ball_rectangles:
+            rectangles = []
+
+            for row, mask_row in enumerate(self.get_ball_mask(options)):
+                columns = np.flatnonzero(mask_row)
+
+                if not len(columns):
+                    continue
+
+                span = (int(columns[0]), int(columns[-1]) + 1)
+
+                if rectangles and rectangles[-1][1] == row and tuple(rectangles[-1][2:]) == span:
+                    rectangles[-1][1] = row + 1
+                else:
+                    rectangles.append([row, row + 1, span[0], span[1]])
+
+            self.ball_rectangles[ball_radius] = np.array(rectangles, dtype=np.intp).reshape(-1, 4)
+
+        return self.ball_rectangles[ball_radius]
+
+    def get_integral_colour_counts(self, colour_integrals, positions, options):
+        """
+        Responsible for counting the white and black pixels of every ball from the colour integral images
+
+        Args:
+            colour_integrals (tuple): The integral images returned by get_colour_integrals
+            positions (list[tuple]): The positions of the balls
+            options (Options): The options to be used
+        Returns:
+            tuple[np.ndarray, np.ndarray, int, np.ndarray]: The white counts, black counts, pixel count of each ball
+            and a flag per ball telling whether it lies within the integral images
+        """
+
+        white_integral, black_integral, origin = colour_integrals
+
+        size = self.get_ball_mask(options).shape[0]
+        rectangles = self.get_ball_rectangles(options)
+        total = int(np.count_nonzero(self.get_ball_mask(options)))
+
+        positions = np.array([(int(position[0]), int(position[1])) for position in positions],
+                             dtype=np.intp).reshape(-1, 2)
+
+        min_x_positions = positions[:, 0] - int(options.ball_radius) - origin[0]
+        min_y_positions = positions[:, 1] - int(options.ball_radius) - origin[1]
+
+        is_valid = ((min_x_positions >= 0) & (min_y_positions >= 0) &
+                    (min_x_positions + size < white_integral.shape[1]) &
+                    (min_y_positions + size < white_integral.shape[0]))
+
+        min_x_positions = np.where(is_valid, min_x_positions, 0)[:, None]
+        min_y_positions = np.where(is_valid, min_y_positions, 0)[:, None]
+
+        top = min_y_positions + rectangles[:, 0]
+        bottom = min_y_positions + rectangles[:, 1]
+        left = min_x_positions + rectangles[:, 2]
+        right = min_x_positions + rectangles[:, 3]
+
+        counts = []
+
+        for integral in (white_integral, black_integral):
+            areas = integral[bottom, right] - integral[top, right] - integral[bottom, left] + integral[top, left]
+            counts.append(np.where(is_valid, areas.sum(axis=1), 0))
+
+        return counts[0], counts[1], total, is_valid
 
     @staticmethod
     def get_white_count(ball_pixels):
@@ -51,20 +277,12 @@ class BallClassification:
         Finding the number of white pixels within the ball pixels
 
         Args:
-            ball_pixels (list): The ball pixels
+            ball_pixels (list|np.ndarray): The ball pixels
         """
 
-        white_count = 0
-
-        for pixel in ball_pixels:
-            is_b_valid = 192 <= pixel[0] <= 255
-            is_g_valid = 192 <= pixel[1] <= 255
-            is_r_valid = 192 <= pixel[2] <= 255
+        ball_pixels = np.asarray(ball_pixels).reshape(-1, 3)
 
-            if is_b_valid and is_g_valid and is_r_valid:
-                white_count += 1
-
-        return white_count
+        return int(np.count_nonzero(np.all((ball_pixels >= 192) & (ball_pixels <= 255), axis=-1)))
 
     @staticmethod
     def get_black_count(ball_pixels):
@@ -72,20 +290,12 @@ class BallClassification:
         Finding the number of black pixels within the ball pixels
 
         Args:
-            ball_pixels (list): The ball pixels
+            ball_pixels (list|np.ndarray): The ball pixels
         """
 
-        black_count = 0
-
-        for pixel in ball_pixels:
-            is_b_valid = 0 <= pixel[0] <= 64
-            is_g_valid = 0 <= pixel[1] <= 64
-            is_r_valid = 0 <= pixel[2] <= 64
-
-            if is_b_valid and is_g_valid and is_r_valid:
-                black_count += 1
+        ball_pixels = np.asarray(ball_pixels).reshape(-1, 3)
 
-        return black_count
+        return int(np.count_nonzero(np.all((ball_pixels >= 0) & (ball_pixels <= 64), axis=-1)))
 
     @staticmethod
     def is_solid_ball(color_count, total):
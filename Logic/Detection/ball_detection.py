@@ -1,5 +1,7 @@
 """Ball Detection Module"""
 
+import math
+
 import numpy as np
 import cv2
 
@@ -49,6 +51,129 @@ class BallDetection:
 
         return detected_holes
 
+    def find_corner_holes_coarse(self, entire_frame):
+        """
+        Responsible for returning an array of hole positions, finding candidates on a downscaled frame and refining
+        each of them on the region around it in the entire frame
+
+        Args:
+            entire_frame (np.ndArray): The entire frame to find the holes in
+        """
+
+        detected_holes = []
+
+        scale = min(1.0, constants.COARSE_HOLE_RADIUS / constants.HOLE_RADIUS)
+
+        gray_image = cv2.cvtColor(entire_frame, cv2.COLOR_BGR2GRAY)
+        coarse_image = cv2.resize(gray_image, None, fx=scale, fy=scale, interpolation=cv2.INTER_LINEAR)
+
+        holes = cv2.HoughCircles(coarse_image, cv2.HOUGH_GRADIENT, 1, constants.HOLE_RADIUS * scale, param1=150,
+                                 param2=constants.COARSE_HOLE_THRESHOLD,
+                                 minRadius=max(int((constants.HOLE_RADIUS - 2) * scale) - 1, 1),
+                                 maxRadius=math.ceil(constants.HOLE_RADIUS * scale) + 1)
+
+        if holes is not None:
+            for (x_position, y_position, _) in holes[0, :]:
+                candidate = (int(round(x_position / scale)), int(round(y_position / scale)))
+
+                hole = self.find_hole_near(gray_image, candidate, int(constants.HOLE_RADIUS * 1.5))
+
+                if hole is not None and all(math.dist(hole, other) >= constants.HOLE_RADIUS
+                                            for other in detected_holes):
+                    detected_holes.append(hole)
+
+        return detected_holes
+
+    @staticmethod
+    def find_hole_near(entire_frame, hole, search_radius=None):
+        """
+        Responsible for returning the hole closest to a position, searching only the region around it
+
+        Args:
+            entire_frame (np.ndArray): The entire frame to find the hole in
+            hole (tuple[int, int]): The expected position of the hole
+            search_radius (int|None): Half the size of the searched region, twice the hole radius by default
+        Returns:
+            tuple[int, int] | None: The position of the hole or None if not found
+        """
+
+        search_radius = search_radius or 2 * constants.HOLE_RADIUS
+
+        min_x = max(int(hole[0]) - search_radius, 0)
+        min_y = max(int(hole[1]) - search_radius, 0)
+
+        region = entire_frame[min_y:int(hole[1]) + search_radius, min_x:int(hole[0]) + search_radius]
+
+        if region.size == 0:
+            return None
+
+        if region.ndim == 3:
+            region = cv2.cvtColor(region, cv2.COLOR_BGR2GRAY)
+
+        holes = cv2.HoughCircles(region, cv2.HOUGH_GRADIENT, 1, constants.HOLE_RADIUS, param1=150, param2=16,
+                                 minRadius=constants.HOLE_RADIUS-2, maxRadius=constants.HOLE_RADIUS)
+
+        if holes is None:
+            return None
+
+        holes = np.round(holes[0, :, :2]).astype("int") + (min_x, min_y)
+        closest_index = np.argmin(np.hypot(holes[:, 0] - hole[0], holes[:, 1] - hole[1]))
+
+        return int(holes[closest_index][0]), int(holes[closest_index][1])
+
+    def are_holes_valid(self, entire_frame, holes):
+        """
+        Responsible for checking that every hole is still found at its position
+
+        Args:
+            entire_frame (np.ndArray): The entire frame to check the holes in
+            holes (list[tuple[int, int]]): The holes to be checked
+        Returns:
+            bool: Whether every hole was found within half a hole radius of its position
+        """
+
+        gray_image = cv2.cvtColor(entire_frame, cv2.COLOR_BGR2GRAY)
+
+        for hole in holes:
+            found_hole = self.find_hole_near(gray_image, hole)
+
+            if found_hole is None or math.dist(found_hole, hole) > constants.HOLE_RADIUS / 2:
+                return False
+
+        return True
+
+    @staticmethod
+    def get_frame_signature(entire_frame):
+        """
+        Responsible for returning a cheap signature of a frame, a small grayscale thumbnail
+
+        Args:
+            entire_frame (np.ndArray): The entire frame to be signed
+        Returns:
+            np.ndarray: The 32 x 18 thumbnail
+        """
+
+        gray_image = cv2.cvtColor(entire_frame, cv2.COLOR_BGR2GRAY)
+
+        return cv2.resize(gray_image, (32, 18), interpolation=cv2.INTER_AREA)
+
+    @staticmethod
+    def get_ball_edges(board_frame):
+        """
+        Responsible for returning the edges used to find the balls, sharpening the frame first to increase the ball
+        detection accuracy
+
+        Args:
+            board_frame (np.ndArray): The board frame, or a region of it, to find the edges in
+        """
+
+        blur = cv2.GaussianBlur(board_frame, (0, 0), 3)
+
+        sharp_foreground = cv2.addWeighted(board_frame, 2, blur, -1, 0)
+        sharp_foreground = np.maximum(sharp_foreground, 10)
+
+        return cv2.Canny(sharp_foreground, 200, 300)
+
     @staticmethod
     def find_balls(board_frame_edges):
         """
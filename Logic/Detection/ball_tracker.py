@@ -0,0 +1,250 @@
+"""Ball Tracker Module"""
+
+import math
+
+import numpy as np
+import cv2
+
+from Logic import constants
+from Logic.Detection.ball_detection import BallDetection
+
+
+class BallTracker:
+    """
+    Responsible for keeping ball identities across frames and confirming the balls that did not move with small
+    region checks, so the entire board only needs to be searched when tracks are lost or the board moved
+
+    Attributes:
+        tracks (list[list]):
+            The tracked balls as [track id, x position, y position, ball colour, grayscale patch].
+
+        board_thumbnail (np.ndarray|None):
+            Downscaled grayscale board of the last full detection.
+
+        confirmed_frames (int):
+            Number of frames whose balls were confirmed without a full detection.
+
+        detected_frames (int):
+            Number of frames that needed a full detection.
+    """
+
+    THUMBNAIL_SCALE = 0.25
+    PIXEL_THRESHOLD = 24
+    MOTION_THRESHOLD = 0.01
+    UNTRACKED_THRESHOLD = 4
+    PATCH_THRESHOLD = 6
+
+    ball_detection = BallDetection()
+
+    def __init__(self):
+        self.tracks = []
+        self.next_track_id = 0
+
+        self.board_thumbnail = None
+
+        self.confirmed_frames = 0
+        self.detected_frames = 0
+
+    def get_balls(self):
+        """
+        Responsible for returning the tracked balls in the structure used by the bot
+
+        Returns:
+            list[tuple[int, int, BallColour]]: The tracked balls
+        """
+
+        return [(track[1], track[2], track[3]) for track in self.tracks]
+
+    def get_ball_ids(self):
+        """
+        Responsible for returning the track id of each tracked ball, in the order of get_balls
+
+        Returns:
+            list[int]: The track ids
+        """
+
+        return [track[0] for track in self.tracks]
+
+    def get_board_thumbnail(self, gray_frame, board_positions):
+        """
+        Responsible for returning the downscaled grayscale board used to detect large motion
+
+        Args:
+            gray_frame (np.ndarray): The grayscale frame
+            board_positions (tuple): The board positions
+        """
+
+        board_frame = gray_frame[board_positions[1]:board_positions[3], board_positions[0]:board_positions[2]]
+
+        return cv2.resize(board_frame, None, fx=self.THUMBNAIL_SCALE, fy=self.THUMBNAIL_SCALE,
+                          interpolation=cv2.INTER_LINEAR)
+
+    @staticmethod
+    def get_patch(gray_frame, x_position, y_position):
+        """
+        Responsible for returning the grayscale patch surrounding a ball
+
+        Args:
+            gray_frame (np.ndarray): The grayscale frame
+            x_position (int): The x position of the ball
+            y_position (int): The y position of the ball
+        """
+
+        patch_radius = constants.BALL_RADIUS + 2
+
+        return gray_frame[max(y_position - patch_radius, 0):y_position + patch_radius,
+                          max(x_position - patch_radius, 0):x_position + patch_radius].copy()
+
+    def is_board_moved(self, gray_frame, board_positions):
+        """
+        Responsible for checking whether a large share of the board, or any part of it away from the tracked balls,
+        changed since the last full detection
+
+        A change away from every tracked ball is a ball the tracks do not know about, e.g. one that was hidden
+        behind another ball, which only a full detection can find.
+
+        Args:
+            gray_frame (np.ndarray): The grayscale frame
+            board_positions (tuple): The board positions
+        """
+
+        board_thumbnail = self.get_board_thumbnail(gray_frame, board_positions)
+
+        if self.board_thumbnail is None or board_thumbnail.shape != self.board_thumbnail.shape:
+            return True
+
+        changed_pixels = (cv2.absdiff(board_thumbnail, self.board_thumbnail) > self.PIXEL_THRESHOLD).astype(np.uint8)
+
+        if np.count_nonzero(changed_pixels) > self.MOTION_THRESHOLD * changed_pixels.size:
+            return True
+
+        # The tracked balls can move within the region they are relocated in
+        track_radius = int(math.ceil(3 * constants.BALL_RADIUS * self.THUMBNAIL_SCALE))
+
+        for track in self.tracks:
+            track_position = (int((track[1] - board_positions[0]) * self.THUMBNAIL_SCALE),
+                              int((track[2] - board_positions[1]) * self.THUMBNAIL_SCALE))
+            cv2.circle(changed_pixels, track_position, track_radius, 0, -1)
+
+        return np.count_nonzero(changed_pixels) > self.UNTRACKED_THRESHOLD
+
+    def confirm_balls(self, frame, board_positions):
+        """
+        Responsible for confirming every tracked ball, relocating the ones that moved slightly within a small
+        region around them
+
+        Args:
+            frame (np.ndarray): The frame to confirm the balls in
+            board_positions (tuple): The board positions
+        Returns:
+            bool: Whether every ball was confirmed, otherwise the entire board has to be searched
+        """
+
+        if not self.tracks:
+            return False
+
+        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        if self.is_board_moved(gray_frame, board_positions):
+            return False
+
+        for track in self.tracks:
+            patch = self.get_patch(gray_frame, track[1], track[2])
+
+            if patch.shape == track[4].shape and np.mean(cv2.absdiff(patch, track[4])) <= self.PATCH_THRESHOLD:
+                continue
+
+            ball_position = self.relocate_ball(frame, track[1], track[2])
+
+            if ball_position is None:
+                return False
+
+            track[1], track[2] = ball_position
+            track[4] = self.get_patch(gray_frame, track[1], track[2])
+
+        self.confirmed_frames += 1
+
+        return True
+
+    def relocate_ball(self, frame, x_position, y_position):
+        """
+        Responsible for finding a ball near its previous position, searching only the region around it
+
+        Args:
+            frame (np.ndarray): The frame to find the ball in
+            x_position (int): The previous x position of the ball
+            y_position (int): The previous y position of the ball
+        Returns:
+            tuple[int, int] | None: The position of the ball or None if it was not found
+        """
+
+        search_radius = 3 * constants.BALL_RADIUS
+
+        min_x = max(x_position - search_radius, 0)
+        min_y = max(y_position - search_radius, 0)
+
+        region = frame[min_y:y_position + search_radius, min_x:x_position + search_radius]
+        detected_balls = self.ball_detection.find_balls(self.ball_detection.get_ball_edges(region))
+
+        closest_ball = None
+        closest_distance = constants.BALL_RADIUS
+
+        for detected_ball in detected_balls:
+            ball_position = (int(detected_ball[0] + min_x), int(detected_ball[1] + min_y))
+            distance = math.dist(ball_position, (x_position, y_position))
+
+            if distance <= closest_distance:
+                closest_ball = ball_position
+                closest_distance = distance
+
+        return closest_ball
+
+    def update_tracks(self, frame, board_positions, balls):
+        """
+        Responsible for replacing the tracks with the balls of a full detection, keeping the identity of each ball
+        that is close to a previous track
+
+        Args:
+            frame (np.ndarray): The frame the balls were detected in
+            board_positions (tuple): The board positions
+            balls (list[tuple[int, int, BallColour]]): The detected balls
+        """
+
+        gray_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+
+        previous_tracks = list(self.tracks)
+        self.tracks = []
+
+        for ball in balls:
+            track_id = None
+            closest_distance = 2 * constants.BALL_RADIUS
+
+            for previous_track in previous_tracks:
+                distance = math.dist((ball[0], ball[1]), (previous_track[1], previous_track[2]))
+
+                if distance <= closest_distance:
+                    track_id = previous_track[0]
+                    closest_distance = distance
+
+            if track_id is None:
+                track_id = self.next_track_id
+                self.next_track_id += 1
+            else:
+                previous_tracks = [track for track in previous_tracks if track[0] != track_id]
+
+            self.tracks.append([track_id, int(ball[0]), int(ball[1]), ball[2],
+                                self.get_patch(gray_frame, int(ball[0]), int(ball[1]))])
+
+        self.board_thumbnail = self.get_board_thumbnail(gray_frame, board_positions)
+        self.detected_frames += 1
+
+    def print_tracking(self):
+        """
+        Responsible for outputting how many frames were confirmed without a full detection
+        """
+
+        total_frames = self.confirmed_frames + self.detected_frames
+
+        if total_frames:
+            print(f'Ball tracking: {self.confirmed_frames} of {total_frames} frames confirmed without a full '
+                  f'board detection')
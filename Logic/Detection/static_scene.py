@@ -0,0 +1,90 @@
+"""Static Scene Module"""
+
+import numpy as np
+import cv2
+
+
+class StaticSceneDetector:
+    """
+    Responsible for detecting that the board did not change since the last analysed frame, so its analysis can be
+    reused
+
+    The board is compared block by block rather than on average, as a single rolling ball only changes the few
+    blocks around it.
+
+    Parameters:
+        threshold (float):
+            Largest absolute difference of any block of the downscaled grayscale board for the board to be unchanged.
+
+    Attributes:
+        board_thumbnail (np.ndarray|None):
+            Downscaled grayscale board of the last analysed frame.
+
+        static_frames (int):
+            Number of frames that reused the previous analysis.
+    """
+
+    # Each thumbnail pixel is the mean of a 4 by 4 block, small enough for a ball moving a pixel to change it
+    THUMBNAIL_SCALE = 0.25
+
+    def __init__(self, threshold):
+        self.threshold = threshold
+
+        self.board_thumbnail = None
+        self.static_frames = 0
+
+    def get_board_thumbnail(self, frame, board_positions):
+        """
+        Responsible for returning the downscaled grayscale board
+
+        Args:
+            frame (np.ndarray): The frame
+            board_positions (tuple): The board positions
+        """
+
+        board_frame = frame[board_positions[1]:board_positions[3], board_positions[0]:board_positions[2]]
+        gray_board = cv2.cvtColor(board_frame, cv2.COLOR_BGR2GRAY)
+
+        return cv2.resize(gray_board, None, fx=self.THUMBNAIL_SCALE, fy=self.THUMBNAIL_SCALE,
+                          interpolation=cv2.INTER_AREA)
+
+    def is_static(self, frame, board_positions):
+        """
+        Responsible for checking whether the board is unchanged since the last analysed frame, the board of a
+        changed frame becoming the reference of the following frames
+
+        Args:
+            frame (np.ndarray): The frame
+            board_positions (tuple): The board positions
+        Returns:
+            bool: Whether the previous analysis can be reused
+        """
+
+        board_thumbnail = self.get_board_thumbnail(frame, board_positions)
+
+        is_static = (self.board_thumbnail is not None and board_thumbnail.shape == self.board_thumbnail.shape and
+                     np.max(cv2.absdiff(board_thumbnail, self.board_thumbnail)) <= self.threshold)
+
+        if is_static:
+            self.static_frames += 1
+        else:
+            self.board_thumbnail = board_thumbnail
+
+        return is_static
+
+    def reset(self):
+        """
+        Responsible for forgetting the reference board, so the next frame is analysed
+        """
+
+        self.board_thumbnail = None
+
+    def print_static(self, total_frames):
+        """
+        Responsible for outputting how many frames reused the previous analysis
+
+        Args:
+            total_frames (int): The number of analysed frames
+        """
+
+        print(f'Static scene: {self.static_frames} of {total_frames} frames reused the previous analysis')
@@ -0,0 +1,152 @@
+"""Table Cache Module"""
+
+import json
+import logging
+import os
+import tempfile
+
+import numpy as np
+
+from Logic.Detection.ball_detection import BallDetection
+
+logger = logging.getLogger(__name__)
+
+
+class TableCache:
+    """
+    Responsible for persisting the corner holes of the tables seen before, so later videos from the same capture
+    setup skip the full frame hole detection
+
+    The cache can be shared by concurrent runs, so it is merged with the file before each write and replaced
+    atomically, and a missing or unreadable file is treated as an empty cache.
+
+    Parameters:
+        cache_path (str):
+            File path of the JSON cache.
+
+    Attributes:
+        tables (dict[str, list[dict]]):
+            The cached tables keyed by frame resolution, each with the frame signature and corner holes.
+    """
+
+    SIGNATURE_THRESHOLD = 24
+    MAX_TABLES = 8
+
+    ball_detection = BallDetection()
+
+    def __init__(self, cache_path):
+        self.cache_path = cache_path
+        self.tables = self.load_tables()
+
+    def load_tables(self):
+        """
+        Responsible for reading the cached tables from the file
+
+        Returns:
+            dict[str, list[dict]]: The cached tables, empty when the file is missing or unreadable
+        """
+
+        if not os.path.isfile(self.cache_path):
+            return {}
+
+        try:
+            with open(self.cache_path, encoding='utf-8') as cache_file:
+                tables = json.load(cache_file)
+        except (OSError, ValueError) as error:
+            logger.warning('Ignoring the unreadable table cache %s: %s', self.cache_path, error)
+            return {}
+
+        if not isinstance(tables, dict):
+            logger.warning('Ignoring the table cache %s, which does not contain tables', self.cache_path)
+            return {}
+
+        return tables
+
+    @staticmethod
+    def get_resolution_key(frame):
+        """
+        Responsible for returning the key of the frame resolution
+
+        Args:
+            frame (np.ndArray): The frame
+        """
+
+        return f'{frame.shape[1]}x{frame.shape[0]}'
+
+    def find_holes(self, frame):
+        """
+        Responsible for returning the cached corner holes of the most similar table that are still valid
+
+        Args:
+            frame (np.ndArray): The frame to find the holes in
+        Returns:
+            list[tuple[int, int]] | None: The corner holes or None if no cached table matches the frame
+        """
+
+        tables = self.tables.get(self.get_resolution_key(frame), [])
+
+        if not tables:
+            return None
+
+        signature = self.ball_detection.get_frame_signature(frame).astype(int)
+
+        differences = [np.mean(np.abs(signature - np.array(table['signature']))) for table in tables]
+
+        for table_index in np.argsort(differences):
+            if differences[table_index] > self.SIGNATURE_THRESHOLD:
+                break
+
+            holes = [(int(hole[0]), int(hole[1])) for hole in tables[table_index]['holes']]
+
+            if self.ball_detection.are_holes_valid(frame, holes):
+                return holes
+
+        return None
+
+    def store_holes(self, frame, holes):
+        """
+        Responsible for caching the corner holes of a frame, replacing the entry of a matching table
+
+        Args:
+            frame (np.ndArray): The frame the holes were found in
+            holes (list[tuple[int, int]]): The corner holes
+        """
+
+        signature = self.ball_detection.get_frame_signature(frame).astype(int)
+        resolution_key = self.get_resolution_key(frame)
+
+        # Other runs may have stored tables since this cache was read, so they are merged in rather than overwritten
+        stored_tables = self.load_tables()
+        stored_tables.update({key: tables for key, tables in self.tables.items() if key not in stored_tables})
+
+        tables = [{'signature': signature.tolist(), 'holes': [[int(hole[0]), int(hole[1])] for hole in holes]}]
+
+        for table in stored_tables.get(resolution_key, []) + self.tables.get(resolution_key, []):
+            if np.mean(np.abs(signature - np.array(table['signature']))) > self.SIGNATURE_THRESHOLD and \
+                    all(table['signature'] != other['signature'] for other in tables):
+                tables.append(table)
+
+        stored_tables[resolution_key] = tables[:self.MAX_TABLES]
+        self.tables = stored_tables
+
+        self.save_tables()
+
+    def save_tables(self):
+        """
+        Responsible for replacing the file with the cached tables in one step, so a concurrent reader never loads
+        a partly written file
+        """
+
+        cache_folder = os.path.dirname(os.path.abspath(self.cache_path))
+        file_descriptor, temporary_path = tempfile.mkstemp(prefix='.table_cache_', suffix='.json', dir=cache_folder)
+
+        try:
+            with os.fdopen(file_descriptor, 'w', encoding='utf-8') as cache_file:
+                json.dump(self.tables, cache_file)
+
+            # The temporary file is only readable by its owner, while the cache is shared like any other file
+            os.chmod(temporary_path, 0o644)
+            os.replace(temporary_path, self.cache_path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
@@ -0,0 +1,153 @@
+"""Ball Grid Module"""
+
+import math
+import numpy as np
+from numba import njit
+
+from Logic.Path.vectors import distance_from_point_to_segment
+
+
+@njit(cache=True)
+def get_blocking_balls(cell_starts, cell_balls, origin, columns, rows, cell_size, ball_points, segment_starts,
+                       segment_finishes, radius):
+    """
+    Responsible for finding the balls within a radius of each segment, walking the grid cells the segment crosses
+    and only checking the balls in and around them
+
+    Args:
+        cell_starts (np.ndArray): The position of the first ball of each cell in cell_balls, and the ball count last
+        cell_balls (np.ndArray): The ball indices ordered by cell
+        origin (np.ndArray): The position of the corner of the first cell
+        columns (int): The number of cell columns
+        rows (int): The number of cell rows
+        cell_size (float): The size of the cells
+        ball_points (np.ndArray): The position of each ball
+        segment_starts (np.ndArray): The first point of each segment
+        segment_finishes (np.ndArray): The second point of each segment
+        radius (float): The largest distance from a segment of a blocking ball
+
+    Returns:
+        np.ndArray: The segments by balls boolean matrix, True where the ball blocks the segment
+    """
+
+    blocked = np.zeros((segment_starts.shape[0], ball_points.shape[0]), dtype=np.bool_)
+    checked = np.full(ball_points.shape[0], -1, dtype=np.int64)
+
+    # A ball within the radius of a segment is at most reach cells away from a cell the segment crosses
+    reach = max(int(math.ceil(radius / cell_size)), 1)
+
+    for i in range(segment_starts.shape[0]):
+        segment_start = (segment_starts[i, 0], segment_starts[i, 1])
+        segment_finish = (segment_finishes[i, 0], segment_finishes[i, 1])
+
+        start_x = (segment_start[0] - origin[0]) / cell_size
+        start_y = (segment_start[1] - origin[1]) / cell_size
+        finish_x = (segment_finish[0] - origin[0]) / cell_size
+        finish_y = (segment_finish[1] - origin[1]) / cell_size
+
+        cell_x = int(math.floor(start_x))
+        cell_y = int(math.floor(start_y))
+        finish_cell_x = int(math.floor(finish_x))
+        finish_cell_y = int(math.floor(finish_y))
+
+        direction_x = finish_x - start_x
+        direction_y = finish_y - start_y
+
+        step_x = 1 if direction_x > 0 else -1
+        step_y = 1 if direction_y > 0 else -1
+
+        # Distances along the segment, as a share of its length, to the next column and row boundaries
+        delta_x = abs(1 / direction_x) if direction_x != 0 else math.inf
+        delta_y = abs(1 / direction_y) if direction_y != 0 else math.inf
+
+        next_x = ((cell_x + 1 - start_x) if direction_x > 0 else (start_x - cell_x)) * delta_x
+        next_y = ((cell_y + 1 - start_y) if direction_y > 0 else (start_y - cell_y)) * delta_y
+
+        steps = abs(finish_cell_x - cell_x) + abs(finish_cell_y - cell_y)
+
+        for step in range(steps + 1):
+            for neighbour_y in range(max(cell_y - reach, 0), min(cell_y + reach + 1, rows)):
+                for neighbour_x in range(max(cell_x - reach, 0), min(cell_x + reach + 1, columns)):
+                    cell = neighbour_y * columns + neighbour_x
+
+                    for k in range(cell_starts[cell], cell_starts[cell + 1]):
+                        ball_index = cell_balls[k]
+
+                        if checked[ball_index] == i:
+                            continue
+
+                        checked[ball_index] = i
+                        ball_point = (ball_points[ball_index, 0], ball_points[ball_index, 1])
+
+                        if distance_from_point_to_segment(ball_point, segment_start, segment_finish) <= radius:
+                            blocked[i, ball_index] = True
+
+            if step == steps:
+                break
+
+            if (next_x < next_y and cell_x != finish_cell_x) or cell_y == finish_cell_y:
+                cell_x += step_x
+                next_x += delta_x
+            else:
+                cell_y += step_y
+                next_y += delta_y
+
+    return blocked
+
+
+class BallGrid:
+    """
+    Responsible for indexing the balls in a uniform grid, so a segment is only checked against the balls in the
+    cells along it instead of against every ball
+
+    Parameters:
+        ball_points (list[tuple[float, float]]|np.ndArray):
+            The position of each ball.
+        cell_size (float):
+            The size of the cells, e.g. the ball diameter.
+
+    Attributes:
+        cell_starts (np.ndArray):
+            The position of the first ball of each cell in cell_balls, and the ball count last.
+
+        cell_balls (np.ndArray):
+            The ball indices ordered by cell.
+
+        origin (np.ndArray):
+            The position of the corner of the first cell.
+    """
+
+    def __init__(self, ball_points, cell_size):
+        self.ball_points = np.asarray(ball_points, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = float(cell_size)
+
+        self.origin = self.ball_points.min(axis=0) if len(self.ball_points) else np.zeros(2)
+
+        ball_cells = np.floor((self.ball_points - self.origin) / self.cell_size).astype(np.int64)
+
+        self.columns = int(ball_cells[:, 0].max()) + 1 if len(ball_cells) else 0
+        self.rows = int(ball_cells[:, 1].max()) + 1 if len(ball_cells) else 0
+
+        cell_indices = ball_cells[:, 1] * self.columns + ball_cells[:, 0]
+
+        self.cell_balls = np.argsort(cell_indices, kind='stable').astype(np.int64)
+        self.cell_starts = np.searchsorted(cell_indices[self.cell_balls],
+                                           np.arange(self.columns * self.rows + 1)).astype(np.int64)
+
+    def get_blocking_balls(self, segment_starts, segment_finishes, radius):
+        """
+        Responsible for finding the balls within a radius of each segment
+
+        Args:
+            segment_starts (list[tuple[float, float]]|np.ndArray): The first point of each segment
+            segment_finishes (list[tuple[float, float]]|np.ndArray): The second point of each segment
+            radius (float): The largest distance from a segment of a blocking ball
+        Returns:
+            np.ndArray: The segments by balls boolean matrix, True where the ball blocks the segment
+        """
+
+        segment_starts = np.asarray(segment_starts, dtype=np.float64).reshape(-1, 2)
+        segment_finishes = np.asarray(segment_finishes, dtype=np.float64).reshape(-1, 2)
+
+        return get_blocking_balls(self.cell_starts, self.cell_balls, self.origin, self.columns, self.rows,
+                                  self.cell_size, self.ball_points, segment_starts, segment_finishes, float(radius))
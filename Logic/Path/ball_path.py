@@ -1,12 +1,14 @@
 """Ball Path Finding Handling Module"""
 
-import math
+import time
 import numpy as np
 
+from Logic.Path.ball_grid import BallGrid
 from Logic.Path.vectors import Vectors
 from Logic.Detection.ball_colour import BallColour
 from Logic.Path.dijkstra_graph import DijkstraGraph
-from numba import jit
+from Logic.Path.table_geometry import TableGeometry
+
 
 class BallPath:
     """
@@ -19,6 +21,8 @@ class BallPath:
             List of tuples representing the positions of the pockets (holes) on the billiard table.
         options (Options):
             Instance of the options class.
+        table_geometry (TableGeometry|None):
+            The geometry of the table of the holes, built when not given.
 
     Attributes:
         graph (DijkstraGraph):
@@ -51,13 +55,22 @@ class BallPath:
         all_objects (list[tuple[float, float]]):
             List of tuples representing the positions of all billiard objects (balls and target holes).
 
-        shrink_borders (bool):
-            Flag indicating whether borders should shrink based on options.
+        shrink_borders (list[tuple[float, float]]):
+            The end points of the cushion segments.
+
+        ball_grid (BallGrid):
+            Uniform grid of the balls, sized to the ball diameter, that the shot segments are checked against.
+
+        is_search_complete (bool):
+            Flag indicating whether every shot was evaluated, False when the search was cut off by its deadline.
     """
 
+    CUSHION_TOLERANCE = 0.5
+    CANDIDATE_BATCH = 16
+
     vectors = Vectors()
 
-    def __init__(self, balls, holes, options):
+    def __init__(self, balls, holes, options, table_geometry=None):
         self.graph = DijkstraGraph()
 
         self.ball_colour = options.target_ball_colour
@@ -71,24 +84,34 @@ class BallPath:
         if self.white_index is not None:
             self.white = balls[self.white_index]
 
-        self.sorted_holes = sorted(holes, key=lambda tup: (-tup[1], tup[0]))
-        self.sorted_holes[3::] = sorted(self.sorted_holes[3::], key=lambda tup: (-tup[0], tup[1]))
+        self.table_geometry = table_geometry or TableGeometry(holes, options)
 
-        self.target_holes = self.get_target_holes(options)
+        self.sorted_holes = self.table_geometry.sorted_holes
+        self.target_holes = self.table_geometry.target_holes
         self.all_objects = self.balls + self.target_holes
 
-        self.shrink_borders = self.get_shrink_borders(options)
+        self.shrink_borders = self.table_geometry.shrink_borders
+
+        self.ball_points = np.array([(ball[0], ball[1]) for ball in self.balls], dtype=np.float64).reshape(-1, 2)
+        self.ball_grid = BallGrid(self.ball_points, options.ball_diameter)
+
+        self.is_search_complete = True
 
-    def find_path(self, options):
+    def find_path(self, options, deadline=None):
         """
         Responsible for calculating an optimal path for one hit
 
         Args:
             options (Options): The options to be used
+            deadline (float|None): The time.perf_counter() time by which the most promising shots evaluated so far
+                are used, None to evaluate every shot
         """
 
-        if self.white_index and self.target_indices:
-            self.add_graph_edges(options)
+        if self.white_index is not None and self.target_indices:
+            if deadline is None:
+                self.add_graph_edges(options)
+            else:
+                self.add_graph_edges_until(deadline, options)
 
             hole_optimal_path = self.graph.find_any_goal_path(self.white, self.target_holes)
 
@@ -107,93 +130,199 @@ class BallPath:
             options (Options): The options to be used
         """
 
-        for target_hole_index, target_hole in enumerate(self.target_holes):
-            for target_index in self.target_indices:
-                target_ball_position = self.balls[target_index]
-                target_hit_position = self.get_target_hit_position(target_index, target_hole_index, options)
-
-                if target_hit_position is not None:
-                    if self.is_path_valid(self.white, target_hit_position, [self.white_index, target_index], options):
-                        if self.is_possible_shot(self.white, target_ball_position, target_hole, options):
-                            distance = self.vectors.distance_from_two_points(self.white, target_hit_position)
-                            self.graph.add_edge(self.white, target_hit_position, distance)
-
-                            self.graph.add_edge(target_hit_position, target_ball_position, 0)
-                            distance = self.vectors.distance_from_two_points(target_ball_position, target_hole)
-                            self.graph.add_edge(target_ball_position, target_hole, distance)
-                        else:
-                            # When the shot is not possible the shortest distance between the white ball and the
-                            # target ball is considered instead which adds a constant distance to make such paths
-                            # less favourable than those that reach a hole
-
-                            distance = self.vectors.distance_from_two_points(self.white, target_ball_position)
-                            self.graph.add_edge(self.white, target_ball_position, distance + 10000)
-
-    def get_target_hit_position(self, ball_index, hole_index, options):
+        candidates = [(target_hole_index, k) for target_hole_index, _ in enumerate(self.target_holes)
+                      for k, _ in enumerate(self.target_indices)]
+
+        self.add_candidate_edges(candidates, options)
+
+    def add_graph_edges_until(self, deadline, options):
         """
-        Responsible for calculating the target hit position
+        Populating the graph with the valid edges of the most promising shots first, a batch at a time, until the
+        deadline has passed
 
         Args:
-            ball_index (int): The index of the ball
-            hole_index (int): The index of the hole
+            deadline (float): The time.perf_counter() time after which no other batch is evaluated
             options (Options): The options to be used
-        Returns:
-            tuple[float, float] | None: The target hit position
         """
 
-        ball = self.balls[ball_index]
-        hole = self.target_holes[hole_index]
+        candidates = self.get_sorted_candidates(options)
 
-        line = self.vectors.line_from_two_points(ball, hole)
+        for batch_start in range(0, len(candidates), self.CANDIDATE_BATCH):
+            # The first batch is always evaluated so a shot can be suggested however late planning started
+            if batch_start and time.perf_counter() >= deadline:
+                self.is_search_complete = False
+                return
 
-        for i, a_ball in enumerate(self.balls):
-            # Line defines the path between two balls it is assumed to be blocked if
-            # the distance less than two ball radii
+            self.add_candidate_edges(candidates[batch_start:batch_start + self.CANDIDATE_BATCH], options)
 
-            is_intercepted = self.vectors.line_intercept_circle(line, a_ball, options.ball_diameter)
+    def get_sorted_candidates(self, options):
+        """
+        Responsible for returning every target hole and target ball pair, the shortest shots first and, among shots
+        of about the same length, those with the fewest balls in the way
 
-            if i is not ball_index and is_intercepted:
-                return None
+        Args:
+            options (Options): The options to be used
+        Returns:
+            list[tuple[int, int]]: The target hole index and target ball position in target_indices of each shot
+        """
 
-        for i, _ in enumerate(self.sorted_holes):
-            border_start = self.shrink_borders[((2 * i) + 1) % len(self.shrink_borders)]
-            border_finish = self.shrink_borders[((2 * i) + 2) % len(self.shrink_borders)]
+        target_points = self.ball_points[self.target_indices]
+        white_point = self.ball_points[self.white_index]
+        target_hole_points = self.table_geometry.target_hole_points
 
-            if self.vectors.segment_intercept_from_four_points(ball, hole, border_start, border_finish):
-                return None
+        ball_count = len(self.target_indices)
+        hole_count = len(target_hole_points)
+
+        white_distances = np.hypot(*(target_points - white_point).T)
+        hole_distances = np.hypot(*(target_points[None, :, :] - target_hole_points[:, None, :]).transpose(2, 0, 1))
 
-        target_position = self.vectors.move_from_two_points(ball, hole, options.ball_radius * 2)
+        shot_distances = (hole_distances + white_distances[None, :]).ravel()
 
-        if target_position is None:
-            return None
+        # The balls blocking the white ball to target ball and target ball to hole segments of each shot
+        white_blocked = self.ball_grid.get_blocking_balls([white_point] * ball_count, target_points,
+                                                          options.ball_diameter)
+        white_blocked[:, self.white_index] = False
+        white_blocked[np.arange(ball_count), self.target_indices] = False
 
-        return target_position
+        hole_blocked = self.ball_grid.get_blocking_balls(np.tile(target_points, (hole_count, 1)),
+                                                         np.repeat(target_hole_points, ball_count, axis=0),
+                                                         options.ball_diameter)
+        hole_blocked[np.arange(hole_count * ball_count), np.tile(self.target_indices, hole_count)] = False
 
-    @jit
-    def is_path_valid(self, white_position, target_hit_position, exclude_indices, options):
+        blocker_counts = (hole_blocked.sum(axis=1).reshape(hole_count, ball_count) +
+                          white_blocked.sum(axis=1)[None, :]).ravel()
+
+        # Shots are ordered by their length in whole ball diameters first, so the blocker count decides between
+        # shots of about the same length and the exact length between the remaining ones
+        shot_lengths = np.floor(shot_distances / options.ball_diameter)
+
+        return [(int(candidate) // ball_count, int(candidate) % ball_count)
+                for candidate in np.lexsort((shot_distances, blocker_counts, shot_lengths))]
+
+    def add_candidate_edges(self, candidates, options):
         """
-        Responsible for checking if a path is valid
+        Populating the graph with the valid edges of some target hole and target ball pairs
+
         Args:
-            white_position (tuple[float, float]):
-            target_hit_position (tuple[float, float]):
-            exclude_indices (list[int]):
+            candidates (list[tuple[int, int]]): The target hole index and target ball position in target_indices of
+                each shot
             options (Options): The options to be used
+        """
 
+        target_hit_positions = self.get_target_hit_positions(candidates, options)
+        valid_paths = self.get_valid_paths(candidates, target_hit_positions, options)
+
+        for (target_hole_index, k), target_hit_position, is_valid_path in zip(candidates, target_hit_positions,
+                                                                               valid_paths):
+            target_hole = self.target_holes[target_hole_index]
+            target_ball_position = self.balls[self.target_indices[k]]
+
+            if target_hit_position is not None:
+                if is_valid_path:
+                    if self.is_possible_shot(self.white, target_ball_position, target_hole, options):
+                        distance = self.vectors.distance_from_two_points(self.white, target_hit_position)
+                        self.graph.add_edge(self.white, target_hit_position, distance)
+
+                        self.graph.add_edge(target_hit_position, target_ball_position, 0)
+                        distance = self.vectors.distance_from_two_points(target_ball_position, target_hole)
+                        self.graph.add_edge(target_ball_position, target_hole, distance)
+                    else:
+                        # When the shot is not possible the shortest distance between the white ball and the
+                        # target ball is considered instead which adds a constant distance to make such paths
+                        # less favourable than those that reach a hole
+
+                        distance = self.vectors.distance_from_two_points(self.white, target_ball_position)
+                        self.graph.add_edge(self.white, target_ball_position, distance + 10000)
+
+    def get_target_hit_positions(self, candidates, options):
+        """
+        Responsible for calculating the target hit position of the target ball and target hole of every shot,
+        checking every ball to hole segment against the balls along it and against the cushions in one batch each
+
+        Args:
+            candidates (list[tuple[int, int]]): The target hole index and target ball position in target_indices of
+                each shot
+            options (Options): The options to be used
         Returns:
+            list[tuple[float, float] | None]: The target hit position of each shot
+        """
+
+        line_count = len(candidates)
 
+        ball_indices = [self.target_indices[k] for _, k in candidates]
+
+        line_starts = self.ball_points[ball_indices]
+        line_ends = self.table_geometry.target_hole_points[[target_hole_index for target_hole_index, _ in candidates]]
+
+        # Segment defines the path between two balls it is assumed to be blocked if
+        # the distance less than two ball radii
+        blocked = self.ball_grid.get_blocking_balls(line_starts, line_ends, options.ball_diameter)
+        blocked[np.arange(line_count), ball_indices] = False
+        is_blocked = blocked.any(axis=1) | self.get_cushion_crossings(line_starts, line_ends)
+
+        target_hit_positions = []
+
+        for line_index, (target_hole_index, k) in enumerate(candidates):
+            if is_blocked[line_index]:
+                target_hit_positions.append(None)
+            else:
+                target_hit_positions.append(self.vectors.move_from_two_points(
+                    self.balls[self.target_indices[k]][0:2], self.target_holes[target_hole_index][0:2],
+                    options.ball_radius * 2))
+
+        return target_hit_positions
+
+    def get_valid_paths(self, candidates, target_hit_positions, options):
+        """
+        Responsible for checking the path from the white ball to the target hit position of every shot, checking
+        every segment against the balls along it in one batch
+
+        Args:
+            candidates (list[tuple[int, int]]): The target hole index and target ball position in target_indices of
+                each shot
+            target_hit_positions (list[tuple[float, float] | None]): The target hit position of each shot
+            options (Options): The options to be used
+        Returns:
+            list[bool]: Whether the path of each shot is valid, False where there is no target hit position
         """
-        line = self.vectors.line_from_two_points(white_position, target_hit_position)
 
-        for i, a_ball in enumerate(self.balls):
-            # Line defines the path between two balls it is assumed to be blocked if
-            # the distance less than two ball radii
+        line_indices = [line_index for line_index, target_hit_position in enumerate(target_hit_positions)
+                        if target_hit_position is not None]
+
+        valid_paths = [False] * len(candidates)
+
+        if not line_indices:
+            return valid_paths
+
+        line_ends = [target_hit_positions[line_index] for line_index in line_indices]
+
+        blocked = self.ball_grid.get_blocking_balls([self.white[0:2]] * len(line_indices), line_ends,
+                                                    int(options.ball_diameter))
+        blocked[:, self.white_index] = False
+        blocked[np.arange(len(line_indices)), [self.target_indices[candidates[line_index][1]]
+                                               for line_index in line_indices]] = False
+        is_blocked = blocked.any(axis=1)
+
+        for i, line_index in enumerate(line_indices):
+            valid_paths[line_index] = not is_blocked[i]
 
-            is_intercepted = self.vectors.line_intercept_circle(line, a_ball, int(options.ball_diameter))
+        return valid_paths
 
-            if i not in exclude_indices and is_intercepted:
-                return False
+    def get_cushion_crossings(self, segment_starts, segment_finishes):
+        """
+        Responsible for checking every segment against every cushion in one batch
+
+        Args:
+            segment_starts (list[tuple[float, float]]|np.ndArray): The first point of each segment
+            segment_finishes (list[tuple[float, float]]|np.ndArray): The second point of each segment
+        Returns:
+            np.ndArray: Whether each segment crosses a cushion
+        """
 
-        return True
+        return self.vectors.segments_intercept_segments(segment_starts, segment_finishes,
+                                                        self.table_geometry.border_starts,
+                                                        self.table_geometry.border_finishes,
+                                                        self.CUSHION_TOLERANCE).any(axis=1)
 
     @staticmethod
     def is_possible_shot(white, target_ball, target_hole, options):
@@ -244,77 +373,3 @@ class BallPath:
                 return None
 
         return ball_colour_indices
-
-    @jit
-
-    def get_target_holes(self, options):
-        """
-        Responsible for returning the target holes
-
-        Args:
-            options (Options):
-
-        Returns:
-
-        """
-
-        target_holes = []
-
-        start_angle = 3 * math.pi / 16
-        finish_angle = 5 * math.pi / 16
-
-        frequency = 5
-        angle_step = np.linspace(start_angle, finish_angle, frequency, True)
-
-        for i, angle in enumerate(angle_step):
-            minor_cos_angle = int(options.middle_hole_radius * math.cos(angle + (math.pi / 4)))
-            minor_sin_angle = int(options.middle_hole_radius * math.sin(angle + (math.pi / 4)))
-
-            major_cos_angle = int(options.corner_hole_radius * math.cos(angle))
-            major_sin_angle = int(options.corner_hole_radius * math.sin(angle))
-
-            target_holes.append((self.sorted_holes[0][0] + major_cos_angle, self.sorted_holes[0][1] - major_sin_angle))
-            target_holes.append((self.sorted_holes[2][0] - major_cos_angle, self.sorted_holes[2][1] - major_sin_angle))
-            target_holes.append((self.sorted_holes[3][0] - major_cos_angle, self.sorted_holes[3][1] + major_sin_angle))
-            target_holes.append((self.sorted_holes[5][0] + major_cos_angle, self.sorted_holes[5][1] + major_sin_angle))
-
-            target_holes.append((self.sorted_holes[1][0] - minor_cos_angle, self.sorted_holes[1][1] - minor_sin_angle))
-            target_holes.append((self.sorted_holes[4][0] + minor_cos_angle, self.sorted_holes[4][1] + minor_sin_angle))
-
-        return target_holes
-
-    def get_shrink_borders(self, options):
-        """
-        Responsible for returning the shrink borders
-
-        Args:
-            options:
-
-        Returns:
-
-        """
-
-        minor_scale = options.middle_border_radius
-        major_scale = options.corner_border_radius
-
-        middle_scale = int(minor_scale * 2)
-
-        hole_00 = (self.sorted_holes[0][0] + minor_scale, self.sorted_holes[0][1] - major_scale)
-        hole_01 = (self.sorted_holes[0][0] + major_scale, self.sorted_holes[0][1] - minor_scale)
-
-        hole_10 = (self.sorted_holes[1][0] - middle_scale, self.sorted_holes[1][1] - minor_scale)
-        hole_11 = (self.sorted_holes[1][0] + middle_scale, self.sorted_holes[1][1] - minor_scale)
-
-        hole_20 = (self.sorted_holes[2][0] - major_scale, self.sorted_holes[2][1] - minor_scale)
-        hole_21 = (self.sorted_holes[2][0] - minor_scale, self.sorted_holes[2][1] - major_scale)
-
-        hole_30 = (self.sorted_holes[3][0] - minor_scale, self.sorted_holes[3][1] + major_scale)
-        hole_31 = (self.sorted_holes[3][0] - major_scale, self.sorted_holes[3][1] + minor_scale)
-
-        hole_40 = (self.sorted_holes[4][0] + middle_scale, self.sorted_holes[4][1] + minor_scale)
-        hole_41 = (self.sorted_holes[4][0] - middle_scale, self.sorted_holes[4][1] + minor_scale)
-
-        hole_50 = (self.sorted_holes[5][0] + major_scale, self.sorted_holes[5][1] + minor_scale)
-        hole_51 = (self.sorted_holes[5][0] + minor_scale, self.sorted_holes[5][1] + major_scale)
-
-        return [hole_00, hole_01, hole_10, hole_11, hole_20, hole_21, hole_30, hole_31, hole_40, hole_41, hole_50, hole_51]
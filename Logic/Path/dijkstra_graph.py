@@ -1,21 +1,83 @@
 """Dijkstra Graph"""
 
-from collections import defaultdict
-
+import heapq
 import math
-import numpy as np
-from numba import jit
 
 
 class DijkstraGraph:
     """
     Responsible for Dijkstra Graph
+
+    Every node is interned to an integer id, so the adjacency and the search state are held in lists indexed by
+    node id and the search keeps its frontier in a binary heap.
+
+    Attributes:
+        node_ids (dict[tuple[float, float], int]):
+            The id of each node.
+
+        nodes (list[tuple[float, float]]):
+            The node of each id.
+
+        neighbours (list[list[int]]):
+            The ids of the nodes connected to each node.
+
+        neighbour_weights (list[list[float]]):
+            The weight of each edge, in the order of neighbours.
+
+        edge_indices (dict[tuple[int, int], int]):
+            The position of each edge in the neighbours of its from node, so adding an edge again replaces its
+            weight.
     """
 
     def __init__(self):
 
-        self.edges = defaultdict(list)
-        self.weights = {}
+        self.node_ids = {}
+        self.nodes = []
+
+        self.neighbours = []
+        self.neighbour_weights = []
+        self.edge_indices = {}
+
+    def get_node_id(self, node):
+        """
+        Responsible for returning the id of a node, interning it when new
+        Args:
+            node (tuple[float, float]): The node
+
+        Returns:
+            int: The id of the node
+        """
+
+        _node = (node[0], node[1])
+        node_id = self.node_ids.get(_node)
+
+        if node_id is None:
+            node_id = len(self.nodes)
+
+            self.node_ids[_node] = node_id
+            self.nodes.append(_node)
+            self.neighbours.append([])
+            self.neighbour_weights.append([])
+
+        return node_id
+
+    def add_directed_edge(self, from_id, to_id, weight):
+        """
+        Responsible for adding an edge in one direction, replacing the weight of an existing edge
+        Args:
+            from_id (int): The id of the from node
+            to_id (int): The id of the to node
+            weight (float): The weight of the edge
+        """
+
+        edge_index = self.edge_indices.get((from_id, to_id))
+
+        if edge_index is None:
+            self.edge_indices[(from_id, to_id)] = len(self.neighbours[from_id])
+            self.neighbours[from_id].append(to_id)
+            self.neighbour_weights[from_id].append(weight)
+        else:
+            self.neighbour_weights[from_id][edge_index] = weight
 
     def add_edge(self, from_node, to_node, weight):
         """
@@ -28,42 +90,44 @@ class DijkstraGraph:
         Returns:
 
         """
-        _to_node = (to_node[0], to_node[1])
-        _from_node = (from_node[0], from_node[1])
 
-        self.edges[_from_node].append(_to_node)
-        self.edges[_to_node].append(_from_node)
-        self.weights[(_from_node, _to_node)] = weight
-        self.weights[(_to_node, _from_node)] = weight
+        from_id = self.get_node_id(from_node)
+        to_id = self.get_node_id(to_node)
+
+        self.add_directed_edge(from_id, to_id, weight)
+        self.add_directed_edge(to_id, from_id, weight)
 
     def find_any_goal_path(self, start, goals):
         """
-        Responsible for finding the optimal path for a goal
+        Responsible for finding the optimal path for a goal, searching the graph once for every goal
         Args:
             start (tuple[float, float]): The start node
             goals (list[tuple[int, int]]): The goals
 
         Returns:
-
+            list[tuple[float, float]]: The path with the lowest path weight, empty if no goal is reachable
         """
 
-        paths = []
-        distances = []
+        start_id = self.node_ids.get((start[0], start[1]))
+        goal_ids = [self.node_ids.get((goal[0], goal[1])) for goal in goals]
+        goal_ids = [goal_id for goal_id in goal_ids if goal_id is not None]
+
+        if start_id is None or not goal_ids:
+            return []
 
-        _start = (start[0], start[1])
-        _goals = [(goal[0], goal[1]) for goal in goals]
+        previous_ids, path_weights = self.search(start_id, goal_ids)
 
-        for goal in _goals:
-            path, distance = self.find_a_goal_path(_start, goal)
+        best_goal_id = None
 
-            if distance != math.inf:
-                paths.append(path)
-                distances.append(distance)
+        for goal_id in goal_ids:
+            if path_weights[goal_id] != math.inf and (best_goal_id is None or
+                                                       path_weights[goal_id] < path_weights[best_goal_id]):
+                best_goal_id = goal_id
 
-        if paths:
-            return paths[np.argmin(distances)]
+        if best_goal_id is None:
+            return []
 
-        return []
+        return self.get_path(previous_ids, best_goal_id)
 
     def find_a_goal_path(self, initial, end):
         """
@@ -73,47 +137,103 @@ class DijkstraGraph:
             end (tuple(float, float)): The end node
 
         Returns:
+            tuple[list[tuple[float, float]], float]: The path and its path weight, or an empty path and infinity
+        """
 
+        initial_id = self.node_ids.get((initial[0], initial[1]))
+        end_id = self.node_ids.get((end[0], end[1]))
+
+        if initial_id is None or end_id is None:
+            return [], math.inf
+
+        previous_ids, path_weights = self.search(initial_id, [end_id])
+
+        if path_weights[end_id] == math.inf:
+            return [], math.inf
+
+        return self.get_path(previous_ids, end_id), path_weights[end_id]
+
+    def search(self, start_id, goal_ids):
+        """
+        Responsible for running Dijkstra from the start node until every goal is settled or nothing is left to
+        visit
+
+        Nodes at the same distance are settled in the order they were first reached. The path weight of a node is
+        the sum of the distances of every node on its shortest path, which is what the goals are ranked by.
+
+        Args:
+            start_id (int): The id of the start node
+            goal_ids (list[int]): The ids of the goal nodes
+
+        Returns:
+            tuple[list[int], list[float]]: The previous node id of each node on its shortest path, -1 for the start
+                and unreached nodes, and the path weight of each settled goal, infinity for the others
         """
 
-        shortest_paths = {initial: (None, 0)}
-        current_node = initial
-        visited = set()
+        node_count = len(self.nodes)
 
-        while current_node != end:
-            visited.add(current_node)
-            destinations = self.edges[current_node]
-            weight_to_current_node = shortest_paths[current_node][1]
+        distances = [math.inf] * node_count
+        previous_ids = [-1] * node_count
+        reached_orders = [-1] * node_count
+        visited = [False] * node_count
+        path_weights = [math.inf] * node_count
 
-            for next_node in destinations:
-                weight = self.weights[(current_node, next_node)] + weight_to_current_node
-                if next_node not in shortest_paths:
-                    shortest_paths[next_node] = (current_node, weight)
-                else:
-                    current_shortest_weight = shortest_paths[next_node][1]
-                    if current_shortest_weight > weight:
-                        shortest_paths[next_node] = (current_node, weight)
+        remaining_goals = set(goal_ids)
 
-            next_destinations = {node: shortest_paths[node] for node in shortest_paths if node not in visited}
-            if not next_destinations:
-                return [], math.inf
+        distances[start_id] = 0
+        reached_orders[start_id] = 0
+        reached_count = 1
 
-            # Next node is the destination with the lowest weight
-            current_node = min(next_destinations, key=lambda k: next_destinations[k][1])
+        heap = [(0, 0, start_id)]
 
-        # Work back through destinations in the shortest path
-        path = []
-        path_weight = 0
+        while heap and remaining_goals:
+            distance, _, node_id = heapq.heappop(heap)
 
-        while current_node is not None:
-            path.append(current_node)
+            if visited[node_id] or distance > distances[node_id]:
+                continue
 
-            next_node = shortest_paths[current_node][0]
-            path_weight += shortest_paths[current_node][1]
+            visited[node_id] = True
 
-            current_node = next_node
+            previous_id = previous_ids[node_id]
+            path_weights[node_id] = distance + (path_weights[previous_id] if previous_id >= 0 else 0)
+            remaining_goals.discard(node_id)
 
-        # Reverse path
-        path = path[::-1]
+            for next_id, weight in zip(self.neighbours[node_id], self.neighbour_weights[node_id]):
+                if visited[next_id]:
+                    continue
+
+                next_distance = distance + weight
 
-        return path, path_weight
+                if reached_orders[next_id] < 0:
+                    reached_orders[next_id] = reached_count
+                    reached_count += 1
+                elif next_distance >= distances[next_id]:
+                    continue
+
+                distances[next_id] = next_distance
+                previous_ids[next_id] = node_id
+
+                heapq.heappush(heap, (next_distance, reached_orders[next_id], next_id))
+
+        return previous_ids, path_weights
+
+    def get_path(self, previous_ids, end_id):
+        """
+        Responsible for working back through the previous nodes from the end node
+        Args:
+            previous_ids (list[int]): The previous node id of each node on its shortest path
+            end_id (int): The id of the end node
+
+        Returns:
+            list[tuple[float, float]]: The path from the start node to the end node
+        """
+
+        path = []
+        node_id = end_id
+
+        while node_id >= 0:
+            path.append(self.nodes[node_id])
+            node_id = previous_ids[node_id]
+
+        # Reverse path
+        return path[::-1]
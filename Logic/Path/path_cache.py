@@ -0,0 +1,105 @@
+"""Path Cache Module"""
+
+from collections import OrderedDict
+
+
+class PathCache:
+    """
+    Responsible for memoizing optimal paths by ball layout, so layouts that only differ by detection jitter reuse
+    the same path
+
+    Parameters:
+        max_size (int):
+            Number of layouts kept, the least recently used layout being evicted first.
+        quantum (int):
+            Size in pixels of the grid the ball positions are quantized to.
+
+    Attributes:
+        paths (OrderedDict):
+            The cached optimal paths in least to most recently used order.
+
+        hits (int):
+            Number of lookups that returned a cached path.
+
+        misses (int):
+            Number of lookups that required planning.
+    """
+
+    def __init__(self, max_size, quantum):
+        self.max_size = max_size
+        self.quantum = max(quantum, 1)
+
+        self.paths = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, balls, holes, options):
+        """
+        Responsible for returning the key of a layout
+
+        Args:
+            balls (list[tuple[int, int, BallColour]]): The balls
+            holes (list[tuple[int, int]]): The holes
+            options (Options): The options to be used
+        Returns:
+            tuple: The quantized balls, the holes and the options used by the path finding
+        """
+
+        # The balls are sorted as the detection does not find them in the same order on every frame, and rounded to
+        # the nearest grid point so jitter around a position keeps its key, although a ball halfway between two grid
+        # points can still alternate between them
+        quantized_balls = tuple(sorted((int(round(ball[0] / self.quantum)), int(round(ball[1] / self.quantum)),
+                                        ball[2].value if ball[2] is not None else 0) for ball in balls))
+
+        table = tuple((int(hole[0]), int(hole[1])) for hole in holes)
+
+        path_options = (options.target_ball_colour, options.ball_radius, options.ball_diameter,
+                        options.middle_hole_radius, options.corner_hole_radius, options.middle_border_radius,
+                        options.corner_border_radius)
+
+        return quantized_balls, table, path_options
+
+    def lookup(self, key):
+        """
+        Responsible for returning the cached path of a layout key
+
+        Args:
+            key (tuple): The key of the layout
+        Returns:
+            list[tuple[int, int]] | None: The optimal path, None when the layout is not cached
+        """
+
+        if key in self.paths:
+            self.hits += 1
+            self.paths.move_to_end(key)
+
+            return self.paths[key]
+
+        self.misses += 1
+
+        return None
+
+    def store(self, key, optimal_path):
+        """
+        Responsible for caching the path of a layout key, evicting the least recently used layout when full
+
+        Args:
+            key (tuple): The key of the layout
+            optimal_path (list[tuple[int, int]]): The optimal path
+        """
+
+        self.paths[key] = optimal_path
+
+        if len(self.paths) > self.max_size:
+            self.paths.popitem(last=False)
+
+    def print_hits(self):
+        """
+        Responsible for outputting the hit and miss counts of the cache
+        """
+
+        lookups = self.hits + self.misses
+
+        if lookups:
+            print(f'Path cache: {self.hits} hits, {self.misses} misses ({100 * self.hits / lookups:.0f}% hit rate)')
@@ -0,0 +1,42 @@
+"""Path Warm-up Module"""
+
+import time
+
+from Logic.Detection.ball_colour import BallColour
+from Logic.Path.ball_path import BallPath
+
+
+class PathWarmup:
+    """
+    Responsible for compiling the path finding kernels ahead of a run, so their on-disk cache is built at deploy time
+    instead of by the first frame of the first video
+
+    The kernels are compiled for the argument types they are called with, so they are warmed up by planning a shot
+    on a synthetic table with the same ball and hole structures as a real run.
+    """
+
+    HOLES = [(100, 100), (500, 100), (900, 100), (100, 500), (500, 500), (900, 500)]
+
+    BALLS = [(700, 250, BallColour.Black), (300, 300, BallColour.White), (600, 420, BallColour.Solid),
+             (750, 250, BallColour.Solid), (400, 420, BallColour.Strip), (650, 330, BallColour.Strip)]
+
+    def warm_up(self, options):
+        """
+        Responsible for planning a shot on the synthetic table, compiling or loading every kernel it calls
+
+        Args:
+            options (Options): The options to be used
+        Returns:
+            tuple[float, float]: The seconds taken by the first plan, which compiles or loads the kernels, and by a
+                second plan that runs them compiled
+        """
+
+        start_time = time.perf_counter()
+        BallPath(list(self.BALLS), list(self.HOLES), options).find_path(options)
+        first_plan_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        BallPath(list(self.BALLS), list(self.HOLES), options).find_path(options)
+        second_plan_time = time.perf_counter() - start_time
+
+        return first_plan_time, second_plan_time
@@ -0,0 +1,165 @@
+"""Table Geometry Module"""
+
+import math
+import numpy as np
+from numba import njit
+
+from Logic.Detection.ball_detection import BallDetection
+
+
+@njit(cache=True)
+def get_target_hole_offsets(angles, middle_hole_radius, corner_hole_radius):
+    """
+    Responsible for returning the offsets of the target holes from their holes
+
+    Args:
+        angles (np.ndArray): The angles the target holes are sampled at
+        middle_hole_radius (int): The distance of the middle target holes from their holes
+        corner_hole_radius (int): The distance of the corner target holes from their holes
+
+    Returns:
+        np.ndArray: The minor cos, minor sin, major cos and major sin offsets of each angle
+    """
+
+    offsets = np.empty((angles.shape[0], 4), dtype=np.int64)
+
+    for i in range(angles.shape[0]):
+        offsets[i, 0] = int(middle_hole_radius * math.cos(angles[i] + (math.pi / 4)))
+        offsets[i, 1] = int(middle_hole_radius * math.sin(angles[i] + (math.pi / 4)))
+
+        offsets[i, 2] = int(corner_hole_radius * math.cos(angles[i]))
+        offsets[i, 3] = int(corner_hole_radius * math.sin(angles[i]))
+
+    return offsets
+
+
+class TableGeometry:
+    """
+    Responsible for holding the geometry of a table that only depends on its holes, so it is built once while the
+    holes do not change instead of for every frame
+
+    Parameters:
+        holes (list[tuple[int, int]]):
+            The positions of the holes.
+        options (Options):
+            The options to be used.
+
+    Attributes:
+        board_positions (list[int]):
+            The boundary of the board as the minimum x, minimum y, maximum x and maximum y.
+
+        sorted_holes (list[tuple[int, int]]):
+            The holes sorted in the order used by the path finding.
+
+        target_holes (list[tuple[int, int]]):
+            The points in front of the holes the balls are aimed at.
+
+        target_hole_points (np.ndArray):
+            The target holes as a float array.
+
+        shrink_borders (list[tuple[int, int]]):
+            The end points of the cushion segments.
+
+        border_starts (np.ndArray):
+            The first point of each cushion segment.
+
+        border_finishes (np.ndArray):
+            The second point of each cushion segment.
+    """
+
+    def __init__(self, holes, options):
+        self.holes = list(holes)
+        self.board_positions = BallDetection.board_boundary(self.holes)
+
+        self.sorted_holes = sorted(self.holes, key=lambda tup: (-tup[1], tup[0]))
+        self.sorted_holes[3::] = sorted(self.sorted_holes[3::], key=lambda tup: (-tup[0], tup[1]))
+
+        self.target_holes = self.get_target_holes(options)
+        self.target_hole_points = np.array(self.target_holes, dtype=np.float64).reshape(-1, 2)
+
+        self.shrink_borders = self.get_shrink_borders(options)
+
+        self.border_starts = np.array([self.shrink_borders[((2 * i) + 1) % len(self.shrink_borders)]
+                                       for i, _ in enumerate(self.sorted_holes)], dtype=np.float64)
+        self.border_finishes = np.array([self.shrink_borders[((2 * i) + 2) % len(self.shrink_borders)]
+                                         for i, _ in enumerate(self.sorted_holes)], dtype=np.float64)
+
+    def is_table_of(self, holes):
+        """
+        Responsible for checking whether the geometry was built from the holes
+
+        Args:
+            holes (list[tuple[int, int]]): The holes
+        Returns:
+            bool: Whether the holes are unchanged
+        """
+
+        return self.holes == list(holes)
+
+    def get_target_holes(self, options):
+        """
+        Responsible for returning the target holes
+
+        Args:
+            options (Options): The options to be used
+
+        Returns:
+            list[tuple[int, int]]: The points in front of the holes the balls are aimed at
+        """
+
+        target_holes = []
+
+        start_angle = 3 * math.pi / 16
+        finish_angle = 5 * math.pi / 16
+
+        frequency = 5
+        angle_step = np.linspace(start_angle, finish_angle, frequency, True)
+
+        offsets = get_target_hole_offsets(angle_step, options.middle_hole_radius, options.corner_hole_radius)
+
+        for minor_cos_angle, minor_sin_angle, major_cos_angle, major_sin_angle in offsets.tolist():
+            target_holes.append((self.sorted_holes[0][0] + major_cos_angle, self.sorted_holes[0][1] - major_sin_angle))
+            target_holes.append((self.sorted_holes[2][0] - major_cos_angle, self.sorted_holes[2][1] - major_sin_angle))
+            target_holes.append((self.sorted_holes[3][0] - major_cos_angle, self.sorted_holes[3][1] + major_sin_angle))
+            target_holes.append((self.sorted_holes[5][0] + major_cos_angle, self.sorted_holes[5][1] + major_sin_angle))
+
+            target_holes.append((self.sorted_holes[1][0] - minor_cos_angle, self.sorted_holes[1][1] - minor_sin_angle))
+            target_holes.append((self.sorted_holes[4][0] + minor_cos_angle, self.sorted_holes[4][1] + minor_sin_angle))
+
+        return target_holes
+
+    def get_shrink_borders(self, options):
+        """
+        Responsible for returning the shrink borders
+
+        Args:
+            options (Options): The options to be used
+
+        Returns:
+            list[tuple[int, int]]: The end points of the cushion segments
+        """
+
+        minor_scale = options.middle_border_radius
+        major_scale = options.corner_border_radius
+
+        middle_scale = int(minor_scale * 2)
+
+        hole_00 = (self.sorted_holes[0][0] + minor_scale, self.sorted_holes[0][1] - major_scale)
+        hole_01 = (self.sorted_holes[0][0] + major_scale, self.sorted_holes[0][1] - minor_scale)
+
+        hole_10 = (self.sorted_holes[1][0] - middle_scale, self.sorted_holes[1][1] - minor_scale)
+        hole_11 = (self.sorted_holes[1][0] + middle_scale, self.sorted_holes[1][1] - minor_scale)
+
+        hole_20 = (self.sorted_holes[2][0] - major_scale, self.sorted_holes[2][1] - minor_scale)
+        hole_21 = (self.sorted_holes[2][0] - minor_scale, self.sorted_holes[2][1] - major_scale)
+
+        hole_30 = (self.sorted_holes[3][0] - minor_scale, self.sorted_holes[3][1] + major_scale)
+        hole_31 = (self.sorted_holes[3][0] - major_scale, self.sorted_holes[3][1] + minor_scale)
+
+        hole_40 = (self.sorted_holes[4][0] + middle_scale, self.sorted_holes[4][1] + minor_scale)
+        hole_41 = (self.sorted_holes[4][0] - middle_scale, self.sorted_holes[4][1] + minor_scale)
+
+        hole_50 = (self.sorted_holes[5][0] + major_scale, self.sorted_holes[5][1] + minor_scale)
+        hole_51 = (self.sorted_holes[5][0] + minor_scale, self.sorted_holes[5][1] + major_scale)
+
+        return [hole_00, hole_01, hole_10, hole_11, hole_20, hole_21, hole_30, hole_31, hole_40, hole_41, hole_50, hole_51]
@@ -3,136 +3,148 @@
 import sys
 import math
 import numpy as np
-from numba import jit
+from numba import njit
 
+EPSILON = sys.float_info.epsilon
 
-class Vectors:
+
+@njit(cache=True)
+def distance_from_two_points(point_one, point_two):
     """
-    Responsible for handling vectors
+    Responsible for calculating the distance between two points
+    Args:
+        point_one (tuple[float, float]): The first point
+        point_two (tuple[float, float]): The second point
+
+    Returns:
 
     """
 
-    @staticmethod
-    @jit
-    def distance_from_two_points(point_one, point_two):
-        """
-        Responsible for calculating the distance between two points
-        Args:
-            point_one (tuple[float, float]): The first point
-            point_two (tuple[float, float]): The second point
+    return math.sqrt(((point_one[0] - point_two[0]) ** 2) + ((point_one[1] - point_two[1]) ** 2))
 
-        Returns:
 
-        """
+@njit(cache=True)
+def move_from_two_points(point_one, point_two, distance):
+    """
+    Responsible for moving a point from another point by a distance
+    Args:
+        point_one (tuple[float, float]): The first point
+        point_two (tuple[float, float]): The second point
+        distance (int): The distance to move
+
+    Returns:
+        tuple[int, int]: The new point
+    """
 
-        return math.sqrt(((point_one[0] - point_two[0]) ** 2) + ((point_one[1] - point_two[1]) ** 2))
+    point_a = np.array([float(point_one[0]), float(point_one[1])])
+    point_b = np.array([float(point_two[0]), float(point_two[1])])
 
-    @staticmethod
-    @jit
-    def move_from_two_points(point_one, point_two, distance):
-        """
-        Responsible for moving a point from another point by a distance
-        Args:
-            point_one (tuple[float, float]): The first point
-            point_two (tuple[float, float]): The second point
-            distance (int): The distance to move
+    np_v = point_b - point_a
+    np_mod_v = math.sqrt(np_v[0] ** 2 + np_v[1] ** 2)
 
-        Returns:
-            tuple[int, int]: The new point
-        """
+    unit_vector = np_v / np_mod_v
+    target_point = point_a - (distance * unit_vector)
 
-        point_a = np.array([point_one[0], point_one[1]])
-        point_b = np.array([point_two[0], point_two[1]])
+    return int(target_point[0]), int(target_point[1])
 
-        np_v = point_b - point_a
-        np_mod_v = math.sqrt(np_v[0] ** 2 + np_v[1] ** 2)
 
-        unit_vector = np_v / np_mod_v
-        target_point = point_a - (distance * unit_vector)
+@njit(cache=True)
+def distance_from_point_to_segment(point, segment_start, segment_finish):
+    """
+    Responsible for calculating the distance between a point and the closest point of a segment
+    Args:
+        point (tuple[float, float]): The point
+        segment_start (tuple[float, float]): The first point of the segment
+        segment_finish (tuple[float, float]): The second point of the segment
+
+    Returns:
+        float: The distance
+    """
 
-        return int(target_point[0]), int(target_point[1])
+    segment_x = float(segment_finish[0] - segment_start[0])
+    segment_y = float(segment_finish[1] - segment_start[1])
+    squared_length = segment_x * segment_x + segment_y * segment_y
 
-    @staticmethod
-    @jit
-    def line_from_two_points(point_one, point_two):
-        """
-        Responsible for calculating the line from two points
-        Args:
-            point_one (list[float]|np.ndArray): The first point
-            point_two (list[float]|np.ndArray): The second point
+    position = 0.0
 
-        Returns:
+    if squared_length > 0:
+        position = (((point[0] - segment_start[0]) * segment_x + (point[1] - segment_start[1]) * segment_y) /
+                    squared_length)
+        position = min(max(position, 0.0), 1.0)
+
+    closest_x = segment_start[0] + position * segment_x
+    closest_y = segment_start[1] + position * segment_y
+
+    return math.sqrt((closest_x - point[0]) ** 2 + (closest_y - point[1]) ** 2)
 
-        """
 
-        line_a = point_one[1] - point_two[1]
-        line_b = point_two[0] - point_one[0]
-        line_c = (point_two[1] * point_one[0]) - (point_one[1] * point_two[0])
+class Vectors:
+    """
+    Responsible for handling vectors
+
+    The geometry kernels are compiled in nopython mode over plain numbers and float arrays, and cached on disk so
+    only the first run pays for their compilation.
+    """
 
-        if line_b == 0:
-            return line_a, 0, line_c
-        else:
-            return (line_a / -line_b), -1, (line_c / -line_b)
+    distance_from_two_points = staticmethod(distance_from_two_points)
+    move_from_two_points = staticmethod(move_from_two_points)
+    distance_from_point_to_segment = staticmethod(distance_from_point_to_segment)
 
-    @jit
-    def segment_intercept_from_four_points(self, point_a_one, point_a_two, point_b_one, point_b_two):
+    @staticmethod
+    def segments_intercept_segments(segment_starts, segment_finishes, other_starts, other_finishes, tolerance):
         """
-        Responsible for calculating the intercept of two segments
+        Responsible for calculating the intercept of every segment with every other segment in one broadcast
         Args:
-            point_a_one:
-            point_a_two:
-            point_b_one:
-            point_b_two:
+            segment_starts (list[tuple[float, float]]|np.ndArray): The first point of each segment
+            segment_finishes (list[tuple[float, float]]|np.ndArray): The second point of each segment
+            other_starts (list[tuple[float, float]]|np.ndArray): The first point of each other segment
+            other_finishes (list[tuple[float, float]]|np.ndArray): The second point of each other segment
+            tolerance (float): The distance in pixels by which segments that only miss each other still intercept
 
         Returns:
-
+            np.ndArray: The segments by other segments boolean matrix, True where they intercept
         """
 
-        np_point_a_one = np.array(point_a_one[0:2])
-        np_point_a_two = np.array(point_a_two[0:2])
-        np_point_b_one = np.array(point_b_one[0:2])
-        np_point_b_two = np.array(point_b_two[0:2])
-
-        da = np_point_a_two[0:2] - np_point_a_one[0:2]
-        db = np_point_b_two[0:2] - np_point_b_one[0:2]
-        dp = np_point_a_one[0:2] - np_point_b_one[0:2]
-
-        dap = np.array([- da[1], da[0]])
-        denom = np.dot(dap, db) + sys.float_info.epsilon
-        num = np.dot(dap, dp)
-
-        intercept = (num / denom.astype(float)) * db + np_point_b_one
+        segment_starts = np.asarray(segment_starts, dtype=np.float64).reshape(-1, 1, 2)
+        segment_finishes = np.asarray(segment_finishes, dtype=np.float64).reshape(-1, 1, 2)
+        other_starts = np.asarray(other_starts, dtype=np.float64).reshape(1, -1, 2)
+        other_finishes = np.asarray(other_finishes, dtype=np.float64).reshape(1, -1, 2)
 
-        point_a_gradient = self.line_from_two_points(np_point_a_one, np_point_a_two)[0]
-        is_on_line_a = (intercept[1] - np_point_a_one[1]) == point_a_gradient * (intercept[0] - np_point_a_one[0])
+        direction = segment_finishes - segment_starts
+        other_direction = other_finishes - other_starts
+        offset = other_starts - segment_starts
 
-        is_x_occluded = np.min([np_point_a_one[0], np_point_a_two[0]]) <= intercept[0] <= np.max([np_point_a_one[0], np_point_a_two[0]])
-        is_y_occluded = np.min([np_point_a_one[1], np_point_a_two[1]]) <= intercept[1] <= np.max([np_point_a_one[1], np_point_a_two[1]])
-        is_between_line_a = is_x_occluded and is_y_occluded
+        cross = direction[..., 0] * other_direction[..., 1] - direction[..., 1] * other_direction[..., 0]
+        offset_cross = offset[..., 0] * other_direction[..., 1] - offset[..., 1] * other_direction[..., 0]
+        offset_other_cross = offset[..., 0] * direction[..., 1] - offset[..., 1] * direction[..., 0]
 
-        return is_on_line_a and is_between_line_a
+        length = np.maximum(np.hypot(direction[..., 0], direction[..., 1]), EPSILON)
+        other_length = np.maximum(np.hypot(other_direction[..., 0], other_direction[..., 1]), EPSILON)
 
-    @staticmethod
-    @jit
-    def line_intercept_circle(line_terms, circle_point, circle_radius):
-        """
-        Responsible for calculating the intercept of a line and a circle
-        Args:
-            line_terms:
-            circle_point:
-            circle_radius:
+        # The tolerance is converted into a share of the length of each segment
+        position_tolerance = tolerance / length
+        other_position_tolerance = tolerance / other_length
 
-        Returns:
+        is_parallel = np.abs(cross) <= EPSILON * length * other_length
 
-        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            position = np.where(is_parallel, 0.0, offset_cross / cross)
+            other_position = np.where(is_parallel, 0.0, offset_other_cross / cross)
 
-        line_a = line_terms[0]
-        line_b = line_terms[1]
-        line_c = line_terms[2]
+            # Parallel segments only intercept when they are on the same line and their ranges overlap
+            other_start_position = (offset[..., 0] * direction[..., 0] + offset[..., 1] * direction[..., 1]) / (
+                length * length)
+            other_finish_position = other_start_position + (
+                other_direction[..., 0] * direction[..., 0] + other_direction[..., 1] * direction[..., 1]) / (
+                length * length)
 
-        centre_x = circle_point[0]
-        centre_y = circle_point[1]
+        is_crossing = (~is_parallel &
+                       (position >= -position_tolerance) & (position <= 1 + position_tolerance) &
+                       (other_position >= -other_position_tolerance) &
+                       (other_position <= 1 + other_position_tolerance))
 
-        distance = abs(line_a * centre_x + line_b * centre_y + line_c) / math.sqrt(line_a * line_a + line_b * line_b)
+        is_overlapping = (is_parallel & (np.abs(offset_other_cross) / length <= tolerance) &
+                          (np.maximum(other_start_position, other_finish_position) >= -position_tolerance) &
+                          (np.minimum(other_start_position, other_finish_position) <= 1 + position_tolerance))
 
-        return distance <= circle_radius
+        return is_crossing | is_overlapping
@@ -0,0 +1,258 @@
+"""Batch Analysis Module"""
+
+import contextlib
+import io
+import json
+import os
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Logic.options import Options
+
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mkv', '.mov')
+
+
+def analyse_clip(video, args):
+    """
+    Responsible for analysing one video in a worker process, the process and its compiled functions are reused for
+    the following videos
+
+    Args:
+        video (str): The file path of the video
+        args (argparse.Namespace): The parsed start.py arguments of the video
+    Returns:
+        dict: The manifest entry of the video
+    """
+
+    # Only the worker processes analyse, so the batch process itself never imports OpenCV or Numba
+    from Logic.video_analysis import VideoAnalysis
+
+    entry = {'video': video, 'output_video': args.output_video[0], 'results_file': args.results_file[0]}
+    start_time = time.perf_counter()
+
+    try:
+        if not os.path.isfile(video):
+            raise FileNotFoundError(f'Video not found: {video}')
+
+        options = Options(args)
+
+        video_analysis = VideoAnalysis()
+        frames = video_analysis.analyse_video(options)
+
+        entry['status'] = 'ok'
+        entry['frames'] = frames
+    except Exception:
+        entry['status'] = 'failed'
+        entry['frames'] = 0
+        entry['error'] = traceback.format_exc()
+
+    entry['wall_time'] = time.perf_counter() - start_time
+    entry['fps'] = entry['frames'] / entry['wall_time'] if entry['wall_time'] > 0 else 0.0
+
+    return entry
+
+
+class BatchAnalysis:
+    """
+    Responsible for analysing many videos across a pool of worker processes and writing a results manifest
+
+    Parameters:
+        parser (argparse.ArgumentParser):
+            The start.py parser used to build the options of each video.
+        base_args (list[str]):
+            The start.py arguments shared by every video.
+        overrides (dict[str, list[str]]):
+            The start.py arguments of specific videos, keyed by file path or file name.
+        check_arguments (Callable[[argparse.ArgumentParser, argparse.Namespace], None]|None):
+            Rejects the start.py argument combinations that cannot be analysed, exiting through the parser.
+    """
+
+    def __init__(self, parser, base_args, overrides=None, check_arguments=None):
+        self.parser = parser
+        self.base_args = list(base_args)
+        self.overrides = overrides or {}
+        self.check_arguments = check_arguments
+
+    @staticmethod
+    def find_videos(paths):
+        """
+        Responsible for expanding the given files and directories into a sorted list of videos, each video listed
+        once
+
+        Args:
+            paths (list[str]): The video files and directories containing videos
+        Returns:
+            list[str]: The video file paths
+        """
+
+        videos = []
+        found_videos = set()
+
+        for path in paths:
+            if os.path.isdir(path):
+                paths_found = [os.path.join(path, file_name) for file_name in sorted(os.listdir(path))
+                               if file_name.lower().endswith(VIDEO_EXTENSIONS)]
+            else:
+                paths_found = [path]
+
+            for video in paths_found:
+                # The same video can be listed directly and through its directory, or through different paths
+                video_key = os.path.normcase(os.path.abspath(video))
+
+                if video_key not in found_videos:
+                    found_videos.add(video_key)
+                    videos.append(video)
+
+        return videos
+
+    @staticmethod
+    def get_output_names(videos):
+        """
+        Responsible for naming the output of each video after its file, numbering the videos that share a file name
+
+        Args:
+            videos (list[str]): The video file paths
+        Returns:
+            dict[str, str]: The output name of each video, without an extension
+        """
+
+        output_names = {}
+        used_names = set()
+
+        for video in videos:
+            name = os.path.splitext(os.path.basename(video))[0]
+            output_name = name
+            number = 1
+
+            # Videos with the same name in different directories would otherwise overwrite each other's output
+            while output_name.lower() in used_names:
+                number += 1
+                output_name = f'{name}_{number}'
+
+            used_names.add(output_name.lower())
+            output_names[video] = output_name
+
+        return output_names
+
+    def get_video_args(self, video, output_name, output_folder, save_results):
+        """
+        Responsible for parsing the start.py arguments of a video, applying its overrides after the shared ones
+
+        Args:
+            video (str): The file path of the video
+            output_name (str): The file name of the output video and results, without an extension
+            output_folder (str): The folder to save the output video and results in
+            save_results (bool): Flag indicating whether to save the per frame results
+        Returns:
+            argparse.Namespace: The parsed arguments
+        Raises:
+            ValueError: When the arguments of the video are invalid, e.g. a malformed override or a combination
+                start.py rejects
+        """
+
+        video_args = self.base_args + self.overrides.get(video, self.overrides.get(os.path.basename(video), []))
+        video_args += ['-ip', video, '-op', os.path.join(output_folder, output_name + '.mp4')]
+
+        if save_results:
+            video_args += ['-rf', os.path.join(output_folder, output_name + '.jsonl')]
+
+        # The parser exits on invalid arguments, which would end the entire batch
+        parser_errors = io.StringIO()
+
+        try:
+            with contextlib.redirect_stderr(parser_errors):
+                args = self.parser.parse_args(video_args)
+
+                if self.check_arguments:
+                    self.check_arguments(self.parser, args)
+
+                # Each video is analysed by a single worker process, the batch runs videos in parallel instead
+                if args.workers[0] > 1:
+                    self.parser.error('--workers cannot be used in a batch, use --jobs instead')
+        except SystemExit as error:
+            raise ValueError(parser_errors.getvalue().strip().splitlines()[-1] if parser_errors.getvalue()
+                             else f'Invalid arguments: {video_args}') from error
+
+        args.show_video = False
+
+        return args
+
+    def analyse_videos(self, videos, output_folder, manifest_path, jobs, save_results=False):
+        """
+        Responsible for scheduling the videos across the worker pool, updating the manifest as each one finishes
+
+        Args:
+            videos (list[str]): The file paths of the videos
+            output_folder (str): The folder to save the output videos and results in
+            manifest_path (str): The file path of the manifest
+            jobs (int): The number of worker processes
+            save_results (bool): Flag indicating whether to save the per frame results
+        Returns:
+            list[dict]: The manifest entries in the order of the videos
+        """
+
+        os.makedirs(output_folder, exist_ok=True)
+
+        # The entries are keyed by video, so a video listed twice is analysed once
+        videos = list(dict.fromkeys(videos))
+
+        entries = {}
+        start_time = time.perf_counter()
+
+        # Every video is validated up front, a video with invalid arguments fails without stopping the others
+        video_args = {}
+        output_names = self.get_output_names(videos)
+
+        for video in videos:
+            try:
+                video_args[video] = self.get_video_args(video, output_names[video], output_folder, save_results)
+            except ValueError as error:
+                entries[video] = {'video': video, 'output_video': None, 'results_file': None, 'status': 'failed',
+                                  'frames': 0, 'error': str(error), 'wall_time': 0.0, 'fps': 0.0}
+
+                print(f"failed: {video} ({error})")
+
+        if entries:
+            self.write_manifest(manifest_path, [entries[video] for video in videos if video in entries],
+                                time.perf_counter() - start_time)
+
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(analyse_clip, video, args): video for video, args in video_args.items()}
+
+            for future in as_completed(futures):
+                entry = future.result()
+                entries[futures[future]] = entry
+
+                print(f"{entry['status']}: {entry['video']} ({entry['frames']} frames, {entry['fps']:.1f} fps)")
+
+                self.write_manifest(manifest_path, [entries[video] for video in videos if video in entries],
+                                    time.perf_counter() - start_time)
+
+        return [entries[video] for video in videos]
+
+    @staticmethod
+    def write_manifest(manifest_path, entries, wall_time):
+        """
+        Responsible for writing the manifest of the videos analysed so far
+
+        Args:
+            manifest_path (str): The file path of the manifest
+            entries (list[dict]): The manifest entries
+            wall_time (float): The wall time of the batch so far
+        """
+
+        frames = sum(entry['frames'] for entry in entries)
+
+        manifest = {
+            'videos': len(entries),
+            'failed': sum(entry['status'] != 'ok' for entry in entries),
+            'frames': frames,
+            'wall_time': wall_time,
+            'fps': frames / wall_time if wall_time > 0 else 0.0,
+            'entries': entries,
+        }
+
+        with open(manifest_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
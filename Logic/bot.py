@@ -1,13 +1,20 @@
 """Bot Handling Module"""
 
-import cv2
-import numpy as np
+import logging
+import time
 
 from Logic.Detection.ball_classification import BallClassification
 from Logic.Detection.ball_colour import BallColour
 from Logic.Detection.ball_detection import BallDetection
+from Logic.Detection.ball_tracker import BallTracker
+from Logic.frame_analysis import FrameAnalysis
 from Logic.Path.ball_path import BallPath
+from Logic.Path.path_cache import PathCache
+from Logic.Path.table_geometry import TableGeometry
 from Logic.Path.vectors import Vectors
+from Logic.stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
 
 
 class Bot:
@@ -23,18 +30,35 @@ class Bot:
     ball_detection = BallDetection()
     ball_classification = BallClassification()
 
-    def find_holes(self, frame):
+    def __init__(self):
+        self.ball_tracker = BallTracker()
+        self.path_cache = None
+        self.table_geometry = None
+        self.stage_timer = StageTimer()
+
+    def find_holes(self, frame, options=None, table_cache=None):
         """
         Responsible for finding the holes if not set
 
         Args:
             frame (np.ndArray): The frame to find the holes in
+            options (Options|None): The options to be used, selecting the hole detection
+            table_cache (TableCache|None): The cache of previously found tables to look the holes up in first
         Returns:
             None
         """
 
         if not self.holes:
-            corner_holes = self.ball_detection.find_corner_holes(frame)
+            corner_holes = table_cache.find_holes(frame) if table_cache else None
+
+            if corner_holes is None:
+                if options is not None and options.hole_detection == 'coarse':
+                    corner_holes = self.ball_detection.find_corner_holes_coarse(frame)
+                else:
+                    corner_holes = self.ball_detection.find_corner_holes(frame)
+
+                if table_cache and len(corner_holes) == 4:
+                    table_cache.store_holes(frame, corner_holes)
 
             if len(corner_holes) == 4:
                 self.holes = corner_holes
@@ -49,6 +73,37 @@ class Bot:
             # Debug only
             return corner_holes
 
+    def check_holes(self, frame):
+        """
+        Responsible for checking that the corner holes are still where they were found, clearing them otherwise so
+        they are detected again
+
+        Args:
+            frame (np.ndArray): The frame to check the holes in
+        Returns:
+            bool: Whether the holes are still valid
+        """
+
+        if self.holes and not self.ball_detection.are_holes_valid(frame, self.holes[:4]):
+            self.holes = []
+
+        return bool(self.holes)
+
+    def get_table_geometry(self, options):
+        """
+        Responsible for returning the geometry of the table of the holes, built once while the holes do not change
+
+        Args:
+            options (Options): The options to be used
+        Returns:
+            TableGeometry: The table geometry
+        """
+
+        if self.table_geometry is None or not self.table_geometry.is_table_of(self.holes):
+            self.table_geometry = TableGeometry(self.holes, options)
+
+        return self.table_geometry
+
     def find_balls(self, frame, options):
         """
         Responsible for finding the balls
@@ -58,24 +113,45 @@ class Bot:
             options (Options): The options to be used
         """
 
-        board_positions = self.ball_detection.board_boundary(self.holes)
+        board_positions = self.get_table_geometry(options).board_positions
 
-        board_frame = frame[board_positions[1]:board_positions[3], board_positions[0]:board_positions[2]]
-        # board_frame_edges = cv2.Canny(board_frame, 200, 300)
-        # Sharpening the image to increase ball detect accuracy
-        blur = cv2.GaussianBlur(board_frame, (0, 0), 3)
+        with self.stage_timer.measure('preprocessing'):
+            board_frame = frame[board_positions[1]:board_positions[3], board_positions[0]:board_positions[2]]
+            board_frame_edges = self.ball_detection.get_ball_edges(board_frame)
 
-        sharp_foreground = cv2.addWeighted(board_frame, 2, blur, -1, 0)
-        sharp_foreground = np.maximum(sharp_foreground, 10)
+        with self.stage_timer.measure('hough'):
+            detected_balls = self.ball_detection.find_balls(board_frame_edges)
 
-        board_frame_edges = cv2.Canny(sharp_foreground, 200, 300)
+        if len(detected_balls) < 18:
+            colour_integrals = None
 
-        detected_balls = self.ball_detection.find_balls(board_frame_edges)
+            if options.classification_mode == 'integral':
+                with self.stage_timer.measure('classification'):
+                    colour_integrals = self.ball_classification.get_colour_integrals(frame, board_positions,
+                                                                                     options)
 
-        if len(detected_balls) < 18:
-            self.update_ball_structure(frame, board_positions, detected_balls, options)
+            self.update_ball_structure(frame, board_positions, detected_balls, options, colour_integrals)
 
-    def update_ball_structure(self, frame, board_positions, detected_balls, options):
+    def track_balls(self, frame, options):
+        """
+        Responsible for finding the balls by confirming the tracked balls, searching the entire board only when a
+        ball is lost or the board moved
+
+        Args:
+            frame (np.ndArray): The frame to find the balls in
+            options (Options): The options to be used
+        """
+
+        board_positions = self.get_table_geometry(options).board_positions
+
+        if self.ball_tracker.confirm_balls(frame, board_positions):
+            self.balls = self.ball_tracker.get_balls()
+            return
+
+        self.find_balls(frame, options)
+        self.ball_tracker.update_tracks(frame, board_positions, self.balls)
+
+    def update_ball_structure(self, frame, board_positions, detected_balls, options, colour_integrals=None):
         """
         Responsible for handling updating the ball structure to assist the bot
         Args:
@@ -83,18 +159,23 @@ class Bot:
             board_positions (tuple): The board positions
             detected_balls (list): The detected balls
             options (Options): The options to be used
+            colour_integrals (tuple|None): The colour integral images of the board, if classifying from them
 
         """
 
         self.balls = []
 
-        for ball in detected_balls:
-            if ball is not None:
-                new_ball_position = self.update_ball_positions(board_positions, ball)
-                ball_colour = self.classify_ball_colours(frame, new_ball_position, options)
+        ball_positions = [self.update_ball_positions(board_positions, ball) for ball in detected_balls
+                          if ball is not None]
+
+        with self.stage_timer.measure('classification'):
+            ball_colours = self.classify_balls_colours(frame, ball_positions, options, colour_integrals)
+
+        for new_ball_position, ball_colour in zip(ball_positions, ball_colours):
+            self.balls.append((int(new_ball_position[0]), int(new_ball_position[1]), ball_colour))
+
+        logger.debug('Balls: %s', self.balls)
 
-                self.balls.append((int(new_ball_position[0]), int(new_ball_position[1]), ball_colour))
-        print(self.balls)
     @staticmethod
     def update_ball_positions(board_positions, detected_ball):
         """
@@ -117,14 +198,89 @@ class Bot:
             options (Options): The options to be used
         """
 
-        ball_colour = None
-
         ball_pixels = self.ball_classification.get_ball_pixels(frame, detected_ball, options)
 
         white_count = self.ball_classification.get_white_count(ball_pixels)
-        black_count = self.ball_classification.get_black_count(ball_pixels) + 1  # avoid division by zero
-        color_count = len(ball_pixels) - white_count - black_count
-        total = len(ball_pixels)
+        black_count = self.ball_classification.get_black_count(ball_pixels)
+
+        return self.get_ball_colour(white_count, black_count, len(ball_pixels))
+
+    def classify_balls_colours(self, frame, detected_balls, options, colour_integrals=None):
+        """
+        Responsible for classifying every detected ball in one batched pass over the stacked ball patches
+
+        Args:
+            frame (numpy): The frame to find the balls in
+            detected_balls (list[tuple]): The detected balls in frame coordinates
+            options (Options): The options to be used
+            colour_integrals (tuple|None): The colour integral images of the board, if classifying from them
+        Returns:
+            list[BallColour|None]: The colour of each ball
+        """
+
+        if colour_integrals is not None:
+            return self.classify_balls_colours_from_integrals(frame, detected_balls, options, colour_integrals)
+
+        patches, clipped_indices = self.ball_classification.get_ball_patches(frame, detected_balls, options)
+        white_counts, black_counts, total = self.ball_classification.get_colour_counts(patches, options)
+
+        ball_colours = []
+        patch_index = 0
+
+        for i, detected_ball in enumerate(detected_balls):
+            if i in clipped_indices:
+                # Balls cut off by the edge of the frame do not fit the stack and are classified on their own
+                ball_colours.append(self.classify_ball_colours(frame, detected_ball, options))
+            else:
+                ball_colours.append(
+                    self.get_ball_colour(int(white_counts[patch_index]), int(black_counts[patch_index]), total))
+                patch_index += 1
+
+        return ball_colours
+
+    def classify_balls_colours_from_integrals(self, frame, detected_balls, options, colour_integrals):
+        """
+        Responsible for classifying every detected ball from the colour integral images of the board
+
+        Args:
+            frame (numpy): The frame to find the balls in
+            detected_balls (list[tuple]): The detected balls in frame coordinates
+            options (Options): The options to be used
+            colour_integrals (tuple): The colour integral images of the board
+        Returns:
+            list[BallColour|None]: The colour of each ball
+        """
+
+        white_counts, black_counts, total, is_valid = self.ball_classification.get_integral_colour_counts(
+            colour_integrals, detected_balls, options)
+
+        ball_colours = []
+
+        for i, detected_ball in enumerate(detected_balls):
+            if is_valid[i]:
+                ball_colours.append(self.get_ball_colour(int(white_counts[i]), int(black_counts[i]), total))
+            else:
+                # Balls outside the integral images are classified from their own pixels
+                ball_colours.append(self.classify_ball_colours(frame, detected_ball, options))
+
+        return ball_colours
+
+    def get_ball_colour(self, white_count, black_count, total):
+        """
+        Responsible for deciding the ball colour from its pixel counts
+
+        Args:
+            white_count (int): The white pixel count
+            black_count (int): The black pixel count
+            total (int): The total pixel count
+        Returns:
+            BallColour|None: The colour of the ball
+        """
+
+        ball_colour = None
+
+        black_count += 1  # avoid division by zero
+        color_count = total - white_count - black_count
 
         if self.ball_classification.is_white_ball(white_count, total):
             ball_colour = BallColour.White
@@ -135,21 +291,72 @@ class Bot:
         elif self.ball_classification.is_striped_ball(color_count, total):
             ball_colour = BallColour.Strip
 
-        # print(f"{ball_colour=}, {total=} {white_count=} {black_count=} {detected_ball=}")
         return ball_colour
 
-    def find_optimal_path(self, options):
+    def find_optimal_path(self, options, deadline=None):
         """
         Responsible for initiating the find optimal path method
 
         Args:
             options (Options): The options to be used
+            deadline (float|None): The time.perf_counter() time by which the best shot found so far is used, None
+                to evaluate every shot
+        Returns:
+            tuple[list[tuple[int, int]], bool]: The optimal path and whether every shot was evaluated
         """
 
         # optimal_path = []
         # all_objects = self.balls + self.holes
 
-        ball_path = BallPath(self.balls, self.holes, options)
-        optimal_path = ball_path.find_path(options)
+        key = None
+
+        if options.path_cache_size > 0:
+            if self.path_cache is None:
+                self.path_cache = PathCache(options.path_cache_size, options.path_quantum)
+
+            # The layout is looked up first, so a cached layout does not build the ball grid and the shot candidates
+            key = self.path_cache.get_key(self.balls, self.holes, options)
+            optimal_path = self.path_cache.lookup(key)
+
+            if optimal_path is not None:
+                return optimal_path, True
+
+        ball_path = BallPath(self.balls, self.holes, options, self.get_table_geometry(options))
+        optimal_path = ball_path.find_path(options, deadline)
+
+        # A path cut off by its deadline is not cached, so the layout is planned in full when there is time
+        if key is not None and ball_path.is_search_complete:
+            self.path_cache.store(key, optimal_path)
+
+        return optimal_path, ball_path.is_search_complete
+
+    def analyse_frame(self, frame, options):
+        """
+        Responsible for finding the balls and the optimal path of a frame, computing every result once
+
+        Args:
+            frame (np.ndArray): The frame to be analysed
+            options (Options): The options to be used
+        Returns:
+            FrameAnalysis: The analysis of the frame, empty while the holes are not found
+        """
+
+        if not self.holes:
+            return FrameAnalysis()
+
+        # The budget covers the entire frame, so planning gets whatever time finding the balls left
+        deadline = time.perf_counter() + options.plan_budget / 1000 if options.plan_budget > 0 else None
+
+        if options.ball_tracking:
+            self.track_balls(frame, options)
+        else:
+            self.find_balls(frame, options)
+
+        with self.stage_timer.measure('planning'):
+            optimal_path, is_plan_complete = self.find_optimal_path(options, deadline)
+
+        # The drawn table comes from its geometry, which is the same whether the path was planned or cached
+        table_geometry = self.get_table_geometry(options)
 
-        return optimal_path
+        return FrameAnalysis(list(self.balls), list(self.holes), table_geometry.sorted_holes,
+                             table_geometry.target_holes, table_geometry.shrink_borders, optimal_path, is_plan_complete)
@@ -3,4 +3,6 @@ DOT_RADIUS = 3
 CIRCLE_SHIFT = 5
 HOLE_RADIUS = 48
 BALL_RADIUS = 24
-BORDER_THICKNESS=3
\ No newline at end of file
+BORDER_THICKNESS=3
+COARSE_HOLE_RADIUS = 12
+COARSE_HOLE_THRESHOLD = 12
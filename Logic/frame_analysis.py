@@ -0,0 +1,33 @@
+"""Frame Analysis Module"""
+
+
+class FrameAnalysis:
+    """
+    Responsible for holding the analysis of a frame, computed once and read by the drawing and any other consumer
+
+    Parameters:
+        balls (list[tuple[int, int, BallColour]]):
+            The balls found in the frame.
+        holes (list[tuple[int, int]]):
+            The holes of the table.
+        sorted_holes (list[tuple[int, int]]):
+            The holes sorted in the order used by the path finding.
+        target_holes (list[tuple[int, int]]):
+            The points in front of the holes the balls are aimed at.
+        shrink_borders (list[tuple[int, int]]):
+            The end points of the cushion segments.
+        optimal_path (list[tuple[int, int]]):
+            The optimal path from the white ball, empty if there is none.
+        is_plan_complete (bool):
+            Flag indicating whether every shot was evaluated, False when planning was cut off by its deadline.
+    """
+
+    def __init__(self, balls=None, holes=None, sorted_holes=None, target_holes=None, shrink_borders=None,
+                 optimal_path=None, is_plan_complete=True):
+        self.balls = balls or []
+        self.holes = holes or []
+        self.sorted_holes = sorted_holes or []
+        self.target_holes = target_holes or []
+        self.shrink_borders = shrink_borders or []
+        self.optimal_path = optimal_path or []
+        self.is_plan_complete = is_plan_complete
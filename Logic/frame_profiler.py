@@ -0,0 +1,222 @@
+"""Frame Profiler Module"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+import cv2
+
+
+class FrameProfiler:
+    """
+    Responsible for profiling a window of analysed frames, writing collapsed stacks for flamegraph tools and a report
+    of the top functions that splits the time spent in OpenCV from the time spent in the geometry code
+
+    The collapsed stacks are sampled from a background thread, while the top functions and the split come from
+    cProfile, which also times the OpenCV calls the samples only see as the Python function calling them.
+
+    Parameters:
+        profile_path (str):
+            Path of the profile without an extension, the stacks are saved as .folded and the report as .txt.
+        start_frame (int):
+            Number of analysed frames before the profiled window.
+        frame_window (int):
+            Number of profiled frames.
+
+    Attributes:
+        samples (Counter[str]):
+            The number of samples of each collapsed stack.
+    """
+
+    SAMPLE_INTERVAL = 0.001
+    TOP_FUNCTIONS = 40
+
+    # The geometry code, by the file it is in
+    GEOMETRY_MODULES = {
+        'vectors.py': 'Vectors',
+        'ball_path.py': 'BallPath',
+        'ball_grid.py': 'BallGrid',
+        'dijkstra_graph.py': 'DijkstraGraph',
+        'ball_classification.py': 'BallClassification',
+    }
+
+    opencv_names = set(dir(cv2))
+
+    def __init__(self, profile_path, start_frame, frame_window):
+        self.profile_path = profile_path
+        self.start_frame = start_frame
+        self.frame_window = frame_window
+
+        self.profile = cProfile.Profile()
+        self.samples = Counter()
+
+        self.thread_id = None
+        self.sampler = None
+        self.stop_event = threading.Event()
+
+        self.is_profiling = False
+        self.is_finished = False
+
+        self.profile_time = 0.0
+
+    def update(self, analysed_frames):
+        """
+        Responsible for starting and stopping the profile at the edges of the window, called before each frame
+
+        Args:
+            analysed_frames (int): The number of frames analysed so far
+        """
+
+        if not self.is_profiling and not self.is_finished and analysed_frames >= self.start_frame:
+            self.start()
+        elif self.is_profiling and analysed_frames >= self.start_frame + self.frame_window:
+            self.stop()
+
+    def start(self):
+        """
+        Responsible for starting the profile and the stack sampling of the calling thread
+        """
+
+        self.thread_id = threading.get_ident()
+        self.stop_event.clear()
+
+        self.sampler = threading.Thread(target=self.sample_stacks, daemon=True)
+        self.sampler.start()
+
+        self.is_profiling = True
+        self.profile_time = time.perf_counter()
+        self.profile.enable()
+
+    def stop(self):
+        """
+        Responsible for stopping the profile and saving its stacks and report
+        """
+
+        if not self.is_profiling:
+            return
+
+        self.profile.disable()
+        self.profile_time = time.perf_counter() - self.profile_time
+
+        self.stop_event.set()
+        self.sampler.join()
+
+        self.is_profiling = False
+        self.is_finished = True
+
+        self.save_stacks()
+        self.save_report()
+
+    def sample_stacks(self):
+        """
+        Responsible for counting the stacks of the profiled thread every sample interval until stopped
+        """
+
+        while not self.stop_event.wait(self.SAMPLE_INTERVAL):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+
+            while frame is not None:
+                code = frame.f_code
+                # The qualified name is only available from Python 3.11
+                stack.append(f'{getattr(code, "co_qualname", code.co_name)} ({os.path.basename(code.co_filename)})')
+                frame = frame.f_back
+
+            if stack:
+                self.samples[';'.join(reversed(stack))] += 1
+
+    def get_category(self, function):
+        """
+        Responsible for returning the category of a profiled function
+
+        Args:
+            function (tuple[str, int, str]): The file, line and name of the function, as keyed by pstats
+        Returns:
+            str: 'OpenCV', the geometry class of the file it is in or 'Other'
+        """
+
+        file_name, _, function_name = function
+
+        if file_name == '~' and ("'cv2." in function_name or function_name.strip('<>') in self.opencv_names):
+            return 'OpenCV'
+
+        return self.GEOMETRY_MODULES.get(os.path.basename(file_name), 'Other')
+
+    def get_category_times(self, stats):
+        """
+        Responsible for summing the time spent in each category, excluding the functions it calls
+
+        Args:
+            stats (pstats.Stats): The profile statistics
+        Returns:
+            dict[str, float]: The seconds spent in each category, longest first
+        """
+
+        category_times = Counter()
+
+        for function, (_, _, total_time, _, _) in stats.stats.items():
+            category_times[self.get_category(function)] += total_time
+
+        return dict(category_times.most_common())
+
+    def save_stacks(self):
+        """
+        Responsible for saving the sampled stacks in the collapsed format, one stack and its sample count per line
+        """
+
+        with open(self.profile_path + '.folded', 'w', encoding='utf-8') as stacks_file:
+            for stack, count in self.samples.most_common():
+                stacks_file.write(f'{stack} {count}\n')
+
+    def save_report(self):
+        """
+        Responsible for saving the time spent in each category and the top functions by their own time and by their
+        cumulative time
+        """
+
+        stats = pstats.Stats(self.profile)
+        category_times = self.get_category_times(stats)
+        profiled_time = sum(category_times.values())
+
+        report = io.StringIO()
+        report.write(f'Profiled {self.frame_window} frames after {self.start_frame} analysed frames in '
+                     f'{self.profile_time:.2f} s\n\n')
+
+        if not profiled_time:
+            report.write('No samples\n')
+        else:
+            for category, category_time in category_times.items():
+                report.write(f'{category:<20} {category_time:9.3f} s {100 * category_time / profiled_time:6.1f}%\n')
+
+        for sort_key in ('tottime', 'cumulative'):
+            report.write(f'\nTop {self.TOP_FUNCTIONS} functions by {sort_key}\n')
+
+            stats.stream = report
+            stats.sort_stats(sort_key).print_stats(self.TOP_FUNCTIONS)
+
+        with open(self.profile_path + '.txt', 'w', encoding='utf-8') as report_file:
+            report_file.write(report.getvalue())
+
+    def print_profile(self):
+        """
+        Responsible for outputting the share of the profiled time spent in each category
+        """
+
+        if not self.is_finished:
+            return
+
+        category_times = self.get_category_times(pstats.Stats(self.profile))
+        profiled_time = sum(category_times.values())
+
+        if profiled_time:
+            category_shares = ', '.join(f'{category} {100 * category_time / profiled_time:.0f}%'
+                                        for category, category_time in category_times.items())
+        else:
+            category_shares = 'no samples'
+
+        print(f'Profile: {category_shares} (saved to {self.profile_path}.folded and {self.profile_path}.txt)')
@@ -0,0 +1,293 @@
+"""Frame Reader Module"""
+
+import queue
+import threading
+import time
+
+import cv2
+
+
+class FrameReader:
+    """
+    Responsible for reading the sampled frames of a video capture, either directly or decoded ahead by a
+    background thread
+
+    Parameters:
+        cap (cv2.VideoCapture):
+            The opened video capture to read from, positioned at the first frame to be read.
+        options (Options):
+            Instance of the options class.
+        frame_count (int):
+            The frame count of the capture position.
+
+    Attributes:
+        frame_queue (queue.Queue|None):
+            Bounded queue of (frame_count, ret, frame, timestamp) tuples filled by the reader thread.
+
+        occupancy_samples (int):
+            Number of times the queue occupancy was sampled.
+
+        occupancy_total (int):
+            Sum of the sampled queue occupancies.
+
+        empty_count (int):
+            Number of reads that found the queue empty, i.e. the analysis waited on decoding.
+
+        full_count (int):
+            Number of reads that found the queue full, i.e. decoding waited on the analysis.
+
+        reader_error (Exception|None):
+            The exception that stopped the reader thread, raised again by the read that reaches the end of the queue.
+    """
+
+    def __init__(self, cap, options, frame_count=0):
+        self.cap = cap
+        self.frame_count = frame_count
+
+        self.skip_frame = options.skip_frame
+        self.sampling_mode = options.sampling_mode
+        self.seek_stride = options.seek_stride
+        self.queue_depth = options.prefetch_frames
+
+        self.sample_interval = options.sample_interval
+
+        if self.sampling_mode == 'time' and self.sample_interval <= 0:
+            # Without an explicit interval the frame stride is converted using the nominal frame rate
+            frame_rate = cap.get(cv2.CAP_PROP_FPS) or 30
+            self.sample_interval = 1000 * self.skip_frame / frame_rate
+
+        self.next_timestamp = None
+
+        self.frame_queue = None
+        self.reader_thread = None
+        self.stop_event = threading.Event()
+
+        self.occupancy_samples = 0
+        self.occupancy_total = 0
+        self.empty_count = 0
+        self.full_count = 0
+
+        self.read_wait = 0.0
+        self.decode_wait = 0.0
+
+        self.reader_error = None
+
+    def start(self):
+        """
+        Responsible for starting the reader thread when frames are prefetched
+
+        Returns:
+            FrameReader: The frame reader itself
+        """
+
+        if self.queue_depth > 0 and self.reader_thread is None:
+            self.frame_queue = queue.Queue(maxsize=self.queue_depth)
+            self.reader_thread = threading.Thread(target=self.decode_frames, name='FrameReader', daemon=True)
+            self.reader_thread.start()
+
+        return self
+
+    def sample_frame(self):
+        """
+        Responsible for advancing the capture to the next sampled frame, decoding it and reading its timestamp
+
+        The timestamp is read from the capture rather than derived from the frame count, so it stays correct on
+        variable frame rate recordings and after seeking.
+
+        Returns:
+            tuple[int, bool, np.ndarray|None, float]: The frame count, whether a frame was read, the frame and its
+                timestamp in milliseconds
+        """
+
+        frame_count, ret, frame = self.advance_frame()
+
+        return frame_count, ret, frame, self.cap.get(cv2.CAP_PROP_POS_MSEC) if ret else 0.0
+
+    def advance_frame(self):
+        """
+        Responsible for advancing the capture to the next sampled frame according to the sampling mode and decoding it
+
+        Returns:
+            tuple[int, bool, np.ndarray|None]: The frame count, whether a frame was read and the frame
+        """
+
+        if self.sampling_mode == 'grab':
+            return self.grab_frame()
+
+        if self.sampling_mode == 'time':
+            return self.grab_timestamp()
+
+        while True:
+            self.frame_count += 1
+            ret, frame = self.cap.read()
+
+            if self.frame_count % self.skip_frame == 0 or not ret:
+                return self.frame_count, ret, frame
+
+    def grab_frame(self):
+        """
+        Responsible for skipping to the next frame count that is a multiple of the skip frame without decoding the
+        skipped frames, seeking instead of grabbing when the stride is large
+
+        Returns:
+            tuple[int, bool, np.ndarray|None]: The frame count, whether a frame was read and the frame
+        """
+
+        target_count = (self.frame_count // self.skip_frame + 1) * self.skip_frame
+        skipped_frames = target_count - self.frame_count - 1
+
+        if 0 < self.seek_stride <= skipped_frames:
+            # The frame count is one ahead of the zero based frame index
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, target_count - 1)
+        else:
+            for _ in range(skipped_frames):
+                if not self.cap.grab():
+                    self.frame_count = target_count
+                    return self.frame_count, False, None
+
+        self.frame_count = target_count
+        ret, frame = self.cap.read()
+
+        return self.frame_count, ret, frame
+
+    def grab_timestamp(self):
+        """
+        Responsible for skipping to the next frame whose timestamp reaches the sample interval, which keeps the
+        sampling regular on variable frame rate recordings
+
+        Returns:
+            tuple[int, bool, np.ndarray|None]: The frame count, whether a frame was read and the frame
+        """
+
+        while True:
+            self.frame_count += 1
+
+            if not self.cap.grab():
+                return self.frame_count, False, None
+
+            timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC)
+
+            if self.next_timestamp is None:
+                self.next_timestamp = timestamp
+
+            if timestamp >= self.next_timestamp:
+                while self.next_timestamp <= timestamp:
+                    self.next_timestamp += self.sample_interval
+
+                ret, frame = self.cap.retrieve()
+
+                return self.frame_count, ret, frame
+
+    def decode_frames(self):
+        """
+        Responsible for decoding the sampled frames into the queue until the video ends or the reader is stopped
+        """
+
+        is_ended = False
+
+        try:
+            while not self.stop_event.is_set():
+                sampled_frame = self.sample_frame()
+
+                if not self.put_frame(sampled_frame):
+                    break
+
+                if not sampled_frame[1]:
+                    is_ended = True
+                    break
+        except Exception as error:
+            self.reader_error = error
+        finally:
+            # The end of the video is always queued, so the analysis never waits for frames that will not come
+            if not is_ended:
+                self.put_frame((self.frame_count, False, None, 0.0))
+
+    def put_frame(self, item):
+        """
+        Responsible for putting a decoded frame into the queue, waiting while the queue is full
+
+        Args:
+            item (tuple[int, bool, np.ndarray, float]): The sampled frame
+        Returns:
+            bool: Whether the frame was queued before the reader was stopped
+        """
+
+        start_time = time.perf_counter()
+
+        while not self.stop_event.is_set():
+            try:
+                self.frame_queue.put(item, timeout=0.1)
+                self.decode_wait += time.perf_counter() - start_time
+
+                return True
+            except queue.Full:
+                continue
+
+        return False
+
+    def read(self):
+        """
+        Responsible for returning the next sampled frame in video order
+
+        Returns:
+            tuple[int, bool, np.ndarray|None, float]: The frame count, whether a frame was read, the frame and its
+                timestamp in milliseconds
+        """
+
+        if self.frame_queue is None:
+            return self.sample_frame()
+
+        if self.reader_thread is None:
+            return self.frame_count, False, None, 0.0
+
+        occupancy = self.frame_queue.qsize()
+
+        self.occupancy_samples += 1
+        self.occupancy_total += occupancy
+
+        if occupancy == 0:
+            self.empty_count += 1
+        elif occupancy >= self.queue_depth:
+            self.full_count += 1
+
+        start_time = time.perf_counter()
+        frame_count, ret, frame, timestamp = self.frame_queue.get()
+        self.read_wait += time.perf_counter() - start_time
+
+        if not ret:
+            self.reader_thread.join()
+            self.reader_thread = None
+
+            if self.reader_error is not None:
+                raise self.reader_error
+
+        return frame_count, ret, frame, timestamp
+
+    def release(self):
+        """
+        Responsible for stopping the reader thread and releasing the video capture
+        """
+
+        self.stop_event.set()
+
+        if self.reader_thread is not None:
+            self.reader_thread.join()
+            self.reader_thread = None
+
+        self.cap.release()
+
+    def print_occupancy(self):
+        """
+        Responsible for outputting the queue occupancy, showing whether the analysis is decode or analysis bound
+        """
+
+        if self.frame_queue is None or not self.occupancy_samples:
+            return
+
+        mean_occupancy = self.occupancy_total / self.occupancy_samples
+        empty_share = 100 * self.empty_count / self.occupancy_samples
+        full_share = 100 * self.full_count / self.occupancy_samples
+
+        print(f'Prefetch queue: mean occupancy {mean_occupancy:.1f}/{self.queue_depth}, '
+              f'empty {empty_share:.0f}% (decode bound, waited {self.read_wait:.2f}s), '
+              f'full {full_share:.0f}% (analysis bound, waited {self.decode_wait:.2f}s)')
@@ -19,12 +19,56 @@ class Options:
             Distance between the table border and the playing area.
         - target_balls: List[str]
             Type of target balls, either 'solid' or 'stripe'.
+        - hole_detection: List[str]
+            Hole detection, either 'full' (entire frame) or 'coarse' (downscaled frame refined at full resolution).
+        - table_cache: List[str|None]
+            Path to the cache of the tables found in previous videos, None to always detect the holes.
+        - table_check: List[int]
+            Number of processed frames between checks that the holes found through the cache are still valid.
+        - path_cache: List[int]
+            Number of ball layouts whose optimal path is cached, 0 to always plan the path.
+        - path_quantum: List[int]
+            Size in pixels of the grid the ball positions are quantized to when looking up cached paths.
+        - plan_budget: List[float]
+            Milliseconds to analyse each frame in, after which the best shot found so far is used, 0 to plan every shot.
         - input_video: str
             Path to the input video file.
         - output_video: str
             Path to save the output video file.
+        - results_file: List[str|None]
+            Path to save the per frame results as JSON lines, None to not save them.
+        - latency_file: List[str|None]
+            Path to save the per frame stage timings as CSV or JSON lines, None to not save them.
+        - metrics_port: List[int]
+            Local port serving the rolling stage latency percentiles in the Prometheus text format, 0 to not serve them.
+        - log_level: List[str]
+            Level of the per frame log messages, either 'debug', 'info' or 'warning'.
+        - profile: List[str|None]
+            Path, without an extension, to save the profile of a window of frames to, None to not profile.
+        - profile_start: List[int]
+            Number of analysed frames before the profiled window.
+        - profile_window: List[int]
+            Number of profiled frames.
         - skip_frame: List[int]
             Number of frames to skip in the input video processing.
+        - sampling_mode: List[str]
+            How skipped frames are passed over, 'decode' (read every frame), 'grab' (grab without decoding, seeking
+            for large strides) or 'time' (sample by timestamp).
+        - seek_stride: List[int]
+            Smallest number of skipped frames for which the 'grab' sampling seeks instead, 0 to never seek.
+        - sample_interval: List[float]
+            Milliseconds between sampled frames in the 'time' sampling mode, 0 to derive it from skip_frame.
+        - prefetch_frames: List[int]
+            Number of frames decoded ahead on a background thread, 0 to decode serially.
+        - static_threshold: List[float]
+            Largest difference of any block of the downscaled board for a frame to reuse the previous analysis, 0 to
+            disable.
+        - ball_tracking: bool
+            Flag indicating whether to track the balls across frames instead of searching the entire board every frame.
+        - classification_mode: List[str]
+            Ball colour classification, either 'mask' (per ball patches) or 'integral' (colour class integral images).
+        - workers: List[int]
+            Number of processes analysing ranges of the input video in parallel.
         - show_video: bool
             Flag indicating whether to display the processed video.
         - save_video: bool
@@ -47,10 +91,36 @@ class Options:
 
         self.target_ball_colour = BallColour.Solid if args.target_balls[0] == 'solid' else BallColour.Strip
 
+        self.hole_detection = args.hole_detection[0]
+        self.table_cache = args.table_cache[0]
+        self.table_check = args.table_check[0]
+
+        self.path_cache_size = args.path_cache[0]
+        self.path_quantum = args.path_quantum[0]
+        self.plan_budget = args.plan_budget[0]
+
         self.input_video = args.input_video
         self.output_video = args.output_video
+        self.results_file = args.results_file[0]
+        self.latency_file = args.latency_file[0]
+        self.metrics_port = args.metrics_port[0]
+        self.log_level = args.log_level[0]
+
+        self.profile = args.profile[0]
+        self.profile_start = args.profile_start[0]
+        self.profile_window = args.profile_window[0]
 
         self.skip_frame = args.skip_frame[0]
+        self.sampling_mode = args.sampling_mode[0]
+        self.seek_stride = args.seek_stride[0]
+        self.sample_interval = args.sample_interval[0]
+        self.prefetch_frames = args.prefetch_frames[0]
+
+        self.static_threshold = args.static_threshold[0]
+        self.ball_tracking = args.ball_tracking
+        self.classification_mode = args.classification_mode[0]
+
+        self.workers = args.workers[0]
 
         self.show_video = args.show_video
         self.save_video = args.save_video
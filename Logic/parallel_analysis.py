@@ -0,0 +1,202 @@
+"""Parallel Analysis Module"""
+
+import copy
+import math
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from Logic.bot import Bot
+from Logic.Detection.table_cache import TableCache
+from Logic.frame_reader import FrameReader
+from Logic.video_analysis import VideoAnalysis
+
+
+def analyse_chunk(options, frame_range, holes, segment_video, segment_results):
+    """
+    Responsible for analysing one frame range of a video in a worker process
+
+    Args:
+        options (Options): The options to be used
+        frame_range (tuple[int, int, int]): The frame range as expected by VideoAnalysis.analyse_video
+        holes (list[tuple[int, int]]|None): The holes found by the shared table detection, None to find them
+        segment_video (str): The file path of the lossless video segment
+        segment_results (str|None): The file path of the results segment
+    """
+
+    # Each process analyses its own range so OpenCV threading would only oversubscribe the cores
+    cv2.setNumThreads(1)
+
+    chunk_options = copy.copy(options)
+    chunk_options.output_video = [segment_video]
+    chunk_options.results_file = segment_results
+    chunk_options.show_video = False
+
+    bot = Bot()
+
+    if holes:
+        bot.holes = list(holes)
+
+    video_analysis = VideoAnalysis()
+    video_analysis.VIDEO_FOURCC = cv2.VideoWriter_fourcc(*'FFV1')  # Lossless so merging does not degrade frames
+
+    video_analysis.analyse_video(chunk_options, bot, frame_range)
+
+
+class ParallelAnalysis:
+    """
+    Responsible for analysing a single video across several processes, each analysing a range of frames
+
+    """
+
+    FIRST_FRAME = 30
+
+    def analyse_video(self, options):
+        """
+        Responsible for finding the table once, analysing the frame ranges in parallel and merging their output
+
+        Args:
+            options (Options): The options to be used
+        """
+
+        cap = cv2.VideoCapture(options.input_video[0])
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        cap.release()
+
+        holes, holes_frame = self.find_table(options)
+        boundaries = self.split_frames(self.FIRST_FRAME, total_frames, options.skip_frame, options.workers)
+
+        segment_folder = tempfile.mkdtemp(prefix='chunks_')
+
+        try:
+            segments = []
+
+            with ProcessPoolExecutor(max_workers=options.workers) as executor:
+                futures = []
+
+                for i, (chunk_start, chunk_end) in enumerate(zip(boundaries[:-1], boundaries[1:])):
+                    if i == 0:
+                        frame_range = (self.FIRST_FRAME, 0, chunk_end)
+                    else:
+                        # The last frame of the previous range is analysed again to carry over the bot state
+                        frame_range = (chunk_start - 1, chunk_start + 1, chunk_end)
+
+                    chunk_holes = holes if holes_frame is not None and holes_frame <= chunk_start else None
+
+                    segment_video = os.path.join(segment_folder, f'{i}.avi')
+                    segment_results = os.path.join(segment_folder, f'{i}.jsonl') if options.results_file else None
+                    segments.append((segment_video, segment_results))
+
+                    futures.append(executor.submit(analyse_chunk, options, frame_range, chunk_holes, segment_video,
+                                                   segment_results))
+
+                for future in futures:
+                    future.result()
+
+            self.merge_segments(options, segments)
+        finally:
+            shutil.rmtree(segment_folder, ignore_errors=True)
+
+    @staticmethod
+    def find_table(options):
+        """
+        Responsible for finding the holes once, on the same frames the analysis would search them
+
+        Args:
+            options (Options): The options to be used
+        Returns:
+            tuple[list[tuple[int, int]]|None, int|None]: The holes and the frame count they were found at
+        """
+
+        bot = Bot()
+        table_cache = TableCache(options.table_cache) if options.table_cache else None
+
+        cap = cv2.VideoCapture(options.input_video[0])
+        cap.set(cv2.CAP_PROP_POS_FRAMES, ParallelAnalysis.FIRST_FRAME)
+
+        frame_reader = FrameReader(cap, options, ParallelAnalysis.FIRST_FRAME)
+
+        try:
+            while True:
+                frame_count, ret, frame, _ = frame_reader.read()
+
+                if not ret:
+                    return None, None
+
+                bot.find_holes(frame, options, table_cache)
+
+                if bot.holes:
+                    return bot.holes, frame_count
+        finally:
+            frame_reader.release()
+
+    @staticmethod
+    def split_frames(first_frame, total_frames, skip_frame, workers):
+        """
+        Responsible for splitting the frame counts into ranges whose boundaries are processed frames
+
+        Args:
+            first_frame (int): The frame count the analysis starts from
+            total_frames (int): The number of frames in the video
+            skip_frame (int): The frame stride of the analysis
+            workers (int): The number of ranges to split into
+        Returns:
+            list[int|float]: The range boundaries, range i covering the frame counts after boundary i up to and
+            including boundary i + 1
+        """
+
+        span = max(total_frames - first_frame, 0)
+        boundaries = [first_frame]
+
+        for i in range(1, workers):
+            boundary = (first_frame + (span * i) // workers) // skip_frame * skip_frame
+
+            if boundary > boundaries[-1]:
+                boundaries.append(boundary)
+
+        boundaries.append(math.inf)
+
+        return boundaries
+
+    @staticmethod
+    def merge_segments(options, segments):
+        """
+        Responsible for merging the segments of each range in order into the output video and results file
+
+        Args:
+            options (Options): The options to be used
+            segments (list[tuple[str, str|None]]): The video and results segments of each range
+        """
+
+        if options.save_video:
+            out = None
+
+            for segment_video, _ in segments:
+                cap = cv2.VideoCapture(segment_video)
+
+                while True:
+                    ret, frame = cap.read()
+
+                    if not ret:
+                        break
+
+                    if out is None:
+                        out = cv2.VideoWriter(options.output_video[0], VideoAnalysis.VIDEO_FOURCC, 30,
+                                              (frame.shape[1], frame.shape[0]))
+
+                    out.write(frame)
+
+                cap.release()
+
+            if out is not None:
+                out.release()
+
+        if options.results_file:
+            with open(options.results_file, 'w', encoding='utf-8') as results_file:
+                for _, segment_results in segments:
+                    if os.path.exists(segment_results):
+                        with open(segment_results, encoding='utf-8') as segment_file:
+                            shutil.copyfileobj(segment_file, results_file)
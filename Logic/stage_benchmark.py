@@ -0,0 +1,190 @@
+"""Stage Benchmark Module"""
+
+import statistics
+import time
+
+from Logic.bot import Bot
+from Logic.frame_analysis import FrameAnalysis
+from Logic.table_renderer import TableRenderer
+from Logic.video_analysis import VideoAnalysis
+from Logic.Path.ball_path import BallPath
+
+
+class StageBenchmark:
+    """
+    Responsible for timing each stage of the analysis separately on a fixed rendered frame and ball layout, so a
+    slower run can be traced back to the stage that slowed down
+
+    The path finding stages run on the known layout of the rendered frame rather than on the detected balls, so their
+    timings do not change with the detection.
+
+    Parameters:
+        width (int):
+            Width of the frame in pixels.
+        height (int):
+            Height of the frame in pixels.
+        ball_count (int):
+            Number of balls on the table.
+        seed (int):
+            Seed of the ball layout.
+
+    Attributes:
+        frame (np.ndArray):
+            The rendered frame.
+
+        balls (list[tuple[int, int, BallColour]]):
+            The known balls of the frame.
+    """
+
+    STAGES = ['find_corner_holes', 'find_balls', 'classify_balls_colours', 'add_graph_edges', 'find_any_goal_path',
+              'draw_analysis']
+
+    def __init__(self, width, height, ball_count, seed=0):
+        # The rendered radii are the detection constants, so the holes and balls are found at any resolution
+        self.table_renderer = TableRenderer(width, height, seed=seed)
+
+        layout = self.table_renderer.get_layout(ball_count)
+
+        self.frame = self.table_renderer.render_frame(layout)
+        self.balls = [(ball[0], ball[1], ball[2]) for ball in layout]
+
+        self.bot = Bot()
+
+    def run(self, options, repeats):
+        """
+        Responsible for timing every stage
+
+        Args:
+            options (Options): The options to be used, with the ball and hole radii of the rendered frame
+            repeats (int): The number of timed runs of each stage, after one untimed run
+        Returns:
+            dict[str, list[float]]: The seconds taken by each run of each stage
+        Raises:
+            ValueError: If the four corner holes are not found on the rendered frame
+        """
+
+        ball_detection = self.bot.ball_detection
+
+        corner_holes = self.bot.find_holes(self.frame, options)
+
+        # The board and every later stage are derived from the holes, so the stages cannot be timed without them
+        if not self.bot.holes:
+            raise ValueError(f'{len(corner_holes)} of the 4 corner holes were found on the rendered frame, try '
+                             f'another frame size or seed')
+
+        board_positions = self.bot.get_table_geometry(options).board_positions
+
+        board_frame = self.frame[board_positions[1]:board_positions[3], board_positions[0]:board_positions[2]]
+        detected_balls = ball_detection.find_balls(ball_detection.get_ball_edges(board_frame))
+        ball_positions = [self.bot.update_ball_positions(board_positions, ball) for ball in detected_balls]
+
+        ball_path = self.get_ball_path(options)
+        ball_path.add_graph_edges(options)
+
+        optimal_path = ball_path.graph.find_any_goal_path(ball_path.white, ball_path.target_holes)
+
+        frame_analysis = FrameAnalysis(self.balls, list(self.bot.holes), ball_path.sorted_holes,
+                                       ball_path.target_holes, ball_path.shrink_borders, optimal_path)
+
+        return {
+            'find_corner_holes': self.time_stage(lambda _: ball_detection.find_corner_holes(self.frame), repeats),
+            'find_balls': self.time_stage(
+                lambda _: ball_detection.find_balls(ball_detection.get_ball_edges(board_frame)), repeats),
+            'classify_balls_colours': self.time_stage(
+                lambda _: self.bot.classify_balls_colours(self.frame, ball_positions, options), repeats),
+            'add_graph_edges': self.time_stage(lambda path: path.add_graph_edges(options), repeats,
+                                               lambda: self.get_ball_path(options)),
+            'find_any_goal_path': self.time_stage(
+                lambda _: ball_path.graph.find_any_goal_path(ball_path.white, ball_path.target_holes), repeats),
+            'draw_analysis': self.time_stage(
+                lambda frame: VideoAnalysis.draw_analysis(frame, frame_analysis, options), repeats,
+                self.frame.copy),
+        }
+
+    def get_ball_path(self, options):
+        """
+        Responsible for returning a ball path of the known layout with an empty graph
+
+        Args:
+            options (Options): The options to be used
+        Returns:
+            BallPath: The ball path
+        """
+
+        return BallPath(list(self.balls), list(self.bot.holes), options, self.bot.get_table_geometry(options))
+
+    @staticmethod
+    def time_stage(stage, repeats, setup=None):
+        """
+        Responsible for timing a stage, preparing its argument outside of the timing
+
+        Args:
+            stage (callable): The stage, called with the argument returned by setup
+            repeats (int): The number of timed runs, after one untimed run
+            setup (callable|None): Returns a fresh argument for each run, e.g. an empty graph, None by default
+        Returns:
+            list[float]: The seconds taken by each timed run
+        """
+
+        timings = []
+
+        for i in range(repeats + 1):
+            argument = setup() if setup else None
+
+            start_time = time.perf_counter()
+            stage(argument)
+
+            if i > 0:
+                timings.append(time.perf_counter() - start_time)
+
+        return timings
+
+    @staticmethod
+    def get_summary(timings):
+        """
+        Responsible for summarising the timings of each stage in milliseconds
+
+        Args:
+            timings (dict[str, list[float]]): The seconds taken by each run of each stage
+        Returns:
+            dict[str, dict[str, float]]: The median, minimum and mean milliseconds of each stage
+        """
+
+        return {stage: {'median_ms': statistics.median(stage_timings) * 1000,
+                        'min_ms': min(stage_timings) * 1000,
+                        'mean_ms': statistics.mean(stage_timings) * 1000}
+                for stage, stage_timings in timings.items()}
+
+    @staticmethod
+    def compare(stages, baseline_stages, threshold):
+        """
+        Responsible for comparing the median timings of each stage with a baseline
+
+        Args:
+            stages (dict[str, dict[str, float]]): The summary of each stage
+            baseline_stages (dict[str, dict[str, float]]): The summary of each stage in the baseline
+            threshold (float): The percentage by which a stage has to be slower than its baseline to regress
+        Returns:
+            list[tuple[str, float|None, float|None, float|None, bool]]: The stage, its baseline and current median
+                milliseconds, the percentage change and whether it regressed, for each stage in either summary. The
+                medians and change are None for a stage missing from a summary, and a stage missing from the current
+                summary regresses
+        """
+
+        comparisons = []
+
+        for stage, summary in stages.items():
+            if stage not in baseline_stages:
+                comparisons.append((stage, None, summary['median_ms'], None, False))
+                continue
+
+            baseline_median = baseline_stages[stage]['median_ms']
+            change = (summary['median_ms'] - baseline_median) / baseline_median * 100 if baseline_median else 0
+
+            comparisons.append((stage, baseline_median, summary['median_ms'], change, change > threshold))
+
+        for stage, baseline_summary in baseline_stages.items():
+            if stage not in stages:
+                comparisons.append((stage, baseline_summary['median_ms'], None, None, True))
+
+        return comparisons
@@ -0,0 +1,230 @@
+"""Stage Timer Module"""
+
+import csv
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class StageTimer:
+    """
+    Responsible for recording how long each stage of the analysis takes on every frame, saving the timings of each
+    frame and summarising the most recent frames as rolling percentiles
+
+    Parameters:
+        latency_file (str|None):
+            Path to save the stage timings of each frame, as CSV when it ends in .csv and as JSON lines otherwise.
+        metrics_port (int):
+            Local port serving the rolling percentiles in the Prometheus text format, 0 to not serve them.
+
+    Attributes:
+        durations (dict[str, float]):
+            The seconds taken by each stage of the current frame.
+
+        windows (dict[str, deque[float]]):
+            The seconds taken by each stage, and in total, on the most recent frames.
+
+        totals (dict[str, float]):
+            The seconds taken by each stage, and in total, on every recorded frame.
+    """
+
+    STAGES = ['decode', 'holes', 'preprocessing', 'hough', 'classification', 'planning', 'drawing', 'encode']
+
+    WINDOW = 300
+    QUANTILES = [50, 95, 99]
+
+    def __init__(self, latency_file=None, metrics_port=0):
+        self.durations = dict.fromkeys(self.STAGES, 0.0)
+
+        self.windows = {stage: deque(maxlen=self.WINDOW) for stage in self.STAGES + ['total']}
+        self.totals = dict.fromkeys(self.STAGES + ['total'], 0.0)
+        self.frame_total = 0
+
+        self.lock = threading.Lock()
+
+        self.latency_file = None
+        self.csv_writer = None
+
+        if latency_file:
+            self.latency_file = open(latency_file, 'w', encoding='utf-8', newline='')
+
+            if latency_file.lower().endswith('.csv'):
+                self.csv_writer = csv.DictWriter(self.latency_file, ['frame'] + self.get_fields())
+                self.csv_writer.writeheader()
+
+        self.metrics_server = self.serve_metrics(metrics_port) if metrics_port else None
+
+    def start_frame(self):
+        """
+        Responsible for clearing the stage timings for the next frame
+        """
+
+        for stage in self.STAGES:
+            self.durations[stage] = 0.0
+
+    @contextmanager
+    def measure(self, stage):
+        """
+        Responsible for adding the time taken by the enclosed code to a stage of the current frame
+
+        Args:
+            stage (str): The stage
+        """
+
+        start_time = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self.durations[stage] += time.perf_counter() - start_time
+
+    def finish_frame(self, frame_count):
+        """
+        Responsible for recording the stage timings of the current frame, saving them and logging the rolling
+        percentiles every window of frames
+
+        Args:
+            frame_count (int): The frame count
+        """
+
+        total = sum(self.durations.values())
+
+        with self.lock:
+            for stage, duration in list(self.durations.items()) + [('total', total)]:
+                self.windows[stage].append(duration)
+                self.totals[stage] += duration
+
+            self.frame_total += 1
+
+        if self.latency_file:
+            frame_timings = {'frame': int(frame_count)}
+            frame_timings.update(zip(self.get_fields(), [round(duration * 1000, 3) for duration in
+                                                         list(self.durations.values()) + [total]]))
+
+            if self.csv_writer:
+                self.csv_writer.writerow(frame_timings)
+            else:
+                self.latency_file.write(json.dumps(frame_timings) + '\n')
+
+        if self.frame_total % self.WINDOW == 0:
+            logger.info('Latency: %s', self.get_summary_text())
+
+    def get_fields(self):
+        """
+        Responsible for returning the names of the saved timings of each frame
+
+        Returns:
+            list[str]: The millisecond field of each stage and of the total
+        """
+
+        return [f'{stage}_ms' for stage in self.STAGES + ['total']]
+
+    def get_percentiles(self):
+        """
+        Responsible for returning the rolling percentiles of each stage and of the total
+
+        Returns:
+            dict[str, list[float]]: The seconds at each quantile over the most recent frames
+        """
+
+        with self.lock:
+            return {stage: np.percentile(window, self.QUANTILES).tolist() if window else [0.0] * len(self.QUANTILES)
+                    for stage, window in self.windows.items()}
+
+    def get_summary_text(self):
+        """
+        Responsible for returning the rolling percentiles of each stage and of the total in milliseconds
+
+        Returns:
+            str: The summary
+        """
+
+        return ', '.join(f'{stage} ' + '/'.join(f'{percentile * 1000:.1f}' for percentile in percentiles)
+                         for stage, percentiles in self.get_percentiles().items()) + \
+            ' ms (' + '/'.join(f'p{quantile}' for quantile in self.QUANTILES) + ')'
+
+    def get_metrics_text(self):
+        """
+        Responsible for returning the rolling percentiles, counts and sums of each stage in the Prometheus text format
+
+        Returns:
+            str: The metrics
+        """
+
+        lines = ['# HELP pool_analysis_stage_seconds Time taken by each stage of the analysis of a frame.',
+                 '# TYPE pool_analysis_stage_seconds summary']
+
+        percentiles = self.get_percentiles()
+
+        with self.lock:
+            for stage in self.STAGES + ['total']:
+                for quantile, percentile in zip(self.QUANTILES, percentiles[stage]):
+                    lines.append(f'pool_analysis_stage_seconds{{stage="{stage}",quantile="{quantile / 100}"}} '
+                                 f'{percentile:.6f}')
+
+                lines.append(f'pool_analysis_stage_seconds_sum{{stage="{stage}"}} {self.totals[stage]:.6f}')
+                lines.append(f'pool_analysis_stage_seconds_count{{stage="{stage}"}} {self.frame_total}')
+
+        return '\n'.join(lines) + '\n'
+
+    def serve_metrics(self, metrics_port):
+        """
+        Responsible for serving the metrics on a local port from a background thread
+
+        Args:
+            metrics_port (int): The port
+        Returns:
+            ThreadingHTTPServer: The server
+        """
+
+        stage_timer = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            """Responsible for answering every request with the metrics"""
+
+            def do_GET(self):
+                metrics = stage_timer.get_metrics_text().encode('utf-8')
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(metrics)))
+                self.end_headers()
+                self.wfile.write(metrics)
+
+            def log_message(self, format, *args):
+                logger.debug(format, *args)
+
+        metrics_server = ThreadingHTTPServer(('127.0.0.1', metrics_port), MetricsHandler)
+        threading.Thread(target=metrics_server.serve_forever, daemon=True).start()
+
+        logger.info('Serving metrics on http://127.0.0.1:%d/metrics', metrics_port)
+
+        return metrics_server
+
+    def print_latency(self):
+        """
+        Responsible for outputting the rolling percentiles of the most recent frames
+        """
+
+        if self.frame_total:
+            print(f'Latency: {self.get_summary_text()}')
+
+    def release(self):
+        """
+        Responsible for closing the latency file and stopping the metrics server
+        """
+
+        if self.latency_file:
+            self.latency_file.close()
+
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
@@ -0,0 +1,226 @@
+"""Table Renderer Module"""
+
+import math
+import random
+
+import numpy as np
+import cv2
+
+from Logic import constants
+from Logic.Detection.ball_colour import BallColour
+
+
+class TableRenderer:
+    """
+    Responsible for rendering synthetic table frames with known ball positions and colours, at any resolution and
+    ball count, to measure how detection and path finding scale
+
+    The holes follow the conventions of the bot: the four corner holes are the corners of the board returned by
+    BallDetection.board_boundary, and the middle holes are halfway along its top and bottom edges.
+
+    Parameters:
+        width (int):
+            Width of the frames in pixels.
+        height (int):
+            Height of the frames in pixels.
+        ball_radius (int|None):
+            Radius of the balls, BALL_RADIUS in constants by default, which it has to match for the balls to be
+            detected.
+        hole_radius (int|None):
+            Radius of the corner holes, HOLE_RADIUS in constants by default, which it has to match for the holes to be
+            detected.
+        seed (int):
+            Seed of the ball layouts and movements.
+
+    Attributes:
+        holes (list[tuple[int, int]]):
+            The corner holes followed by the top and bottom middle holes.
+    """
+
+    BACKGROUND_COLOUR = (35, 30, 30)
+    RAIL_COLOUR = (30, 60, 110)
+    CLOTH_COLOUR = (90, 120, 20)
+    HOLE_COLOUR = (10, 10, 10)
+
+    MIDDLE_HOLE_SCALE = 0.85
+
+    WHITE_COLOUR = (250, 250, 250)
+    BLACK_COLOUR = (20, 20, 20)
+
+    # Yellow, blue, red, purple, orange and maroon, none of them white, black or close to the cloth
+    BALL_COLOURS = [(0, 215, 255), (200, 70, 20), (40, 30, 210), (130, 30, 110), (0, 130, 255), (40, 40, 130)]
+
+    def __init__(self, width, height, ball_radius=None, hole_radius=None, seed=0):
+        self.width = width
+        self.height = height
+
+        # The detection reads the radii from the constants, so the renders are detectable at any size by default
+        self.ball_radius = ball_radius or constants.BALL_RADIUS
+        self.hole_radius = hole_radius or constants.HOLE_RADIUS
+
+        self.random = random.Random(seed)
+
+        # The board keeps the 2:1 aspect ratio of a pool table and leaves room for the rails around it
+        board_width = min(width - 8 * self.hole_radius, 2 * (height - 8 * self.hole_radius))
+        board_height = board_width // 2
+
+        if board_height <= 2 * self.hole_radius:
+            raise ValueError(f'A {width}x{height} frame leaves no room for a board with a hole radius of '
+                             f'{self.hole_radius}')
+
+        min_x = (width - board_width) // 2
+        min_y = (height - board_height) // 2
+
+        self.board_positions = [min_x, min_y, min_x + board_width, min_y + board_height]
+
+        self.holes = [(min_x, min_y), (min_x + board_width, min_y), (min_x, min_y + board_height),
+                      (min_x + board_width, min_y + board_height),
+                      (min_x + board_width // 2, min_y), (min_x + board_width // 2, min_y + board_height)]
+
+    def get_layout(self, ball_count):
+        """
+        Responsible for placing a white ball, a black ball and solid and striped balls on the board without any of
+        them touching each other or the holes
+
+        Args:
+            ball_count (int): The number of balls, at least 2
+        Returns:
+            list[list]: The balls as [x position, y position, ball colour, colour]
+        """
+
+        ball_colours = [BallColour.White, BallColour.Black] + [
+            BallColour.Solid if i % 2 == 0 else BallColour.Strip for i in range(max(ball_count - 2, 0))]
+
+        margin = self.hole_radius + self.ball_radius
+        min_distance = 2.2 * self.ball_radius
+
+        balls = []
+
+        for ball_colour in ball_colours[:ball_count]:
+            for _ in range(1000):
+                x_position = self.random.randint(self.board_positions[0] + margin, self.board_positions[2] - margin)
+                y_position = self.random.randint(self.board_positions[1] + margin, self.board_positions[3] - margin)
+
+                if all(math.dist((x_position, y_position), (ball[0], ball[1])) >= min_distance for ball in balls):
+                    break
+            else:
+                raise ValueError(f'{ball_count} balls do not fit on the board')
+
+            if ball_colour == BallColour.White:
+                colour = self.WHITE_COLOUR
+            elif ball_colour == BallColour.Black:
+                colour = self.BLACK_COLOUR
+            else:
+                colour = self.random.choice(self.BALL_COLOURS)
+
+            balls.append([x_position, y_position, ball_colour, colour])
+
+        return balls
+
+    def move_balls(self, balls, velocities):
+        """
+        Responsible for moving the balls by their velocities, bouncing them off the cushions
+
+        Args:
+            balls (list[list]): The balls as [x position, y position, ball colour, colour]
+            velocities (list[list[float]]): The velocity of each ball in pixels per frame, reversed on a bounce
+        """
+
+        margin = self.hole_radius + self.ball_radius
+
+        for ball, velocity in zip(balls, velocities):
+            for axis in range(2):
+                position = ball[axis] + velocity[axis]
+
+                low = self.board_positions[axis] + margin
+                high = self.board_positions[axis + 2] - margin
+
+                if position < low or position > high:
+                    velocity[axis] = -velocity[axis]
+                    position = min(max(position, low), high)
+
+                ball[axis] = int(round(position))
+
+    def get_velocities(self, balls, speed, moving_balls):
+        """
+        Responsible for returning the velocity of each ball, the first balls rolling in a random direction
+
+        Args:
+            balls (list[list]): The balls as [x position, y position, ball colour, colour]
+            speed (float): The speed of the rolling balls in pixels per frame
+            moving_balls (int): The number of rolling balls, starting with the white ball
+        Returns:
+            list[list[float]]: The velocity of each ball
+        """
+
+        velocities = []
+
+        for i, _ in enumerate(balls):
+            angle = self.random.uniform(0, 2 * math.pi)
+            ball_speed = speed if i < moving_balls else 0
+
+            velocities.append([ball_speed * math.cos(angle), ball_speed * math.sin(angle)])
+
+        return velocities
+
+    def render_frame(self, balls):
+        """
+        Responsible for rendering the table and its balls
+
+        Args:
+            balls (list[list]): The balls as [x position, y position, ball colour, colour]
+        Returns:
+            np.ndarray: The BGR frame
+        """
+
+        frame = np.full((self.height, self.width, 3), self.BACKGROUND_COLOUR, dtype=np.uint8)
+
+        min_x, min_y, max_x, max_y = self.board_positions
+
+        rail = 3 * self.hole_radius
+        cloth = 2 * self.hole_radius
+
+        cv2.rectangle(frame, (min_x - rail, min_y - rail), (max_x + rail, max_y + rail), self.RAIL_COLOUR, -1)
+        cv2.rectangle(frame, (min_x - cloth, min_y - cloth), (max_x + cloth, max_y + cloth), self.CLOTH_COLOUR, -1)
+
+        # The middle holes are drawn smaller than the corner holes, which are the only holes the bot detects
+        for i, hole in enumerate(self.holes):
+            hole_radius = self.hole_radius if i < 4 else int(self.hole_radius * self.MIDDLE_HOLE_SCALE)
+            cv2.circle(frame, hole, hole_radius, self.HOLE_COLOUR, -1, cv2.LINE_AA)
+
+        for x_position, y_position, ball_colour, colour in balls:
+            if ball_colour == BallColour.Strip:
+                cv2.circle(frame, (x_position, y_position), self.ball_radius, self.WHITE_COLOUR, -1, cv2.LINE_AA)
+
+                # The stripe is the middle half of the ball
+                stripe = np.zeros((2 * self.ball_radius + 1, 2 * self.ball_radius + 1), dtype=np.uint8)
+                cv2.circle(stripe, (self.ball_radius, self.ball_radius), self.ball_radius, 255, -1)
+                stripe[:self.ball_radius // 2 + 1] = 0
+                stripe[-(self.ball_radius // 2 + 1):] = 0
+
+                region = frame[y_position - self.ball_radius:y_position + self.ball_radius + 1,
+                               x_position - self.ball_radius:x_position + self.ball_radius + 1]
+                region[stripe > 0] = colour
+            else:
+                cv2.circle(frame, (x_position, y_position), self.ball_radius, colour, -1, cv2.LINE_AA)
+
+        return frame
+
+    @staticmethod
+    def get_frame_truth(frame_count, balls, holes):
+        """
+        Responsible for returning the known balls and holes of a frame, in the form of the analysis results
+
+        Args:
+            frame_count (int): The frame count
+            balls (list[list]): The balls as [x position, y position, ball colour, colour]
+            holes (list[tuple[int, int]]): The holes
+        Returns:
+            dict: The frame count, balls and holes
+        """
+
+        return {
+            'frame': int(frame_count),
+            'balls': [[int(ball[0]), int(ball[1]), ball[2].name] for ball in balls],
+            'holes': [[int(hole[0]), int(hole[1])] for hole in holes],
+        }
@@ -1,14 +1,25 @@
 """Video Analysis Module"""
 
 import os
+import json
+import logging
+import math
+import time
 import numpy as np
 import cv2
 
 from Logic import constants
 from Logic.bot import Bot
-from Logic.Path.ball_path import BallPath
+from Logic.frame_analysis import FrameAnalysis
+from Logic.frame_profiler import FrameProfiler
+from Logic.frame_reader import FrameReader
 from Logic.Detection.ball_colour import BallColour
 from Logic.Detection.ball_detection import BallDetection
+from Logic.Detection.static_scene import StaticSceneDetector
+from Logic.Detection.table_cache import TableCache
+from Logic.stage_timer import StageTimer
+
+logger = logging.getLogger(__name__)
 
 
 class VideoAnalysis:
@@ -22,6 +33,10 @@ class VideoAnalysis:
     BALL_TRAINING_PATH = 'Paramaters\\Balls\\'
     HOLE_TRAINING_PATH = 'Parameters\\Hoels\\'
 
+    VIDEO_FOURCC = 0x7634706d  # mp4v
+
+    RESULTS_BUFFER = 1 << 16
+
     ball_detection = BallDetection()
 
     def identify_parameters(self, identify_for_holes, identify_for_balls, options):
@@ -117,91 +132,120 @@ class VideoAnalysis:
 
                 cv2.imwrite(self.BALL_TRAINING_PATH + str(param2) + '_' + str(param1) + '.jpg', rgb_image)
 
-    def analyse_video(self, options):
+    def analyse_video(self, options, bot=None, frame_range=None):
         """
         Responsible for modelling the implemented features on a given video which can be displayed or saved
 
         Args:
             options (Options): The options to be used
+            bot (Bot|None): The bot to analyse with, e.g. with the holes already found
+            frame_range (tuple[int, int, int]|None): The frame count to start reading from, the first frame count to
+                output and the last frame count to analyse, frames before the first output only warm up the bot
+        Returns:
+            int: The number of frames analysed and output
         """
 
-        bot = Bot()
-        frame_count = 30 # Skip the first 30 frames
+        start_time = time.perf_counter()
+
+        bot = bot or Bot()
+        frame_count, first_output, last_frame = frame_range or (30, 0, math.inf)  # Skip the first 30 frames
 
         cap = cv2.VideoCapture(options.input_video[0])
         cap.set(cv2.CAP_PROP_POS_FRAMES, frame_count)  # Start clip from a particular frame
 
+        # The frame size is read once up front as the capture cannot be queried while it is being prefetched
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+
+        # Skipped frames are dropped by the frame reader according to the sampling mode
+        frame_reader = FrameReader(cap, options, frame_count).start()
+
+        table_cache = TableCache(options.table_cache) if options.table_cache else None
+
+        static_scene = StaticSceneDetector(options.static_threshold) if options.static_threshold > 0 else None
+        frame_analysis = FrameAnalysis()
+
+        stage_timer = StageTimer(options.latency_file, options.metrics_port)
+        bot.stage_timer = stage_timer
+
+        frame_profiler = FrameProfiler(options.profile, options.profile_start,
+                                       options.profile_window) if options.profile else None
+
         out = None
+        analysed_frames = 0
+        processed_frames = 0
+        planned_frames = 0
+        cut_off_frames = 0
+        results_file = open(options.results_file, 'w', encoding='utf-8',
+                            buffering=self.RESULTS_BUFFER) if options.results_file else None
+
+        # Only a saved or shown video needs the analysis drawn, so results alone skip the drawing and encoding
+        is_drawn = options.save_video or options.show_video
 
         while cap.isOpened():
-            frame_count += 1
-            ret, frame = cap.read()
+            if frame_profiler:
+                frame_profiler.update(analysed_frames)
 
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            stage_timer.start_frame()
 
-            if not out and options.save_video:
-                out = cv2.VideoWriter(options.output_video[0], 0x7634706d, 30, (width, height))
+            with stage_timer.measure('decode'):
+                frame_count, ret, frame, timestamp = frame_reader.read()
 
-            if frame_count % options.skip_frame != 0:
-                continue
+            if frame_count > last_frame:
+                break
 
-            if not bot.holes:
-                outer_conner = bot.find_holes(frame)
+            is_output = frame_count >= first_output
 
-            if ret:
-                modified_frame = frame.copy()
+            if not out and options.save_video:
+                out = cv2.VideoWriter(options.output_video[0], self.VIDEO_FOURCC, 30, (width, height))
 
-                self.print_timestamp(frame_count)
+            with stage_timer.measure('holes'):
+                if ret and table_cache and options.table_check and processed_frames % options.table_check == 0:
+                    # A moved camera or window invalidates the holes, which are then detected again
+                    if not bot.check_holes(frame) and static_scene:
+                        static_scene.reset()
 
-                if bot.holes:
-                    bot.find_balls(frame, options)
+                if ret and not bot.holes:
+                    outer_conner = bot.find_holes(frame, options, table_cache)
 
-                    for hole in bot.holes:
-                        cv2.circle(modified_frame, (hole[0], hole[1]), constants.DOT_RADIUS, (255, 255, 255),
-                                   constants.CIRCLE_SHIFT)
-                        cv2.circle(modified_frame, (hole[0], hole[1]), options.hole_radius, (255, 255, 255),
-                                   constants.CIRCLE_SHIFT)
+            processed_frames += 1
 
-                    for ball in bot.balls:
-                        rgb_colour = None
+            if ret:
+                if is_output:
+                    self.print_timestamp(frame_count)
 
-                        if ball[2] == BallColour.Solid:
-                            rgb_colour = (255, 0, 0)  # Blue
-                        elif ball[2] == BallColour.Strip:
-                            rgb_colour = (0, 255, 0)  # Green
-                        elif ball[2] == BallColour.Black:
-                            rgb_colour = (255, 255, 0)  # Yellow
-                        elif ball[2] == BallColour.White:
-                            rgb_colour = (0, 255, 255)  # Cyan
+                if not bot.holes:
+                    frame_analysis = FrameAnalysis()
+                elif static_scene is None or not static_scene.is_static(
+                        frame, bot.get_table_geometry(options).board_positions):
+                    frame_analysis = bot.analyse_frame(frame, options)
 
-                        if rgb_colour is not None:
-                            cv2.circle(modified_frame, (ball[0], ball[1]), constants.DOT_RADIUS, (0, 0, 0),
-                                       constants.CIRCLE_SHIFT)
-                            cv2.circle(modified_frame, (ball[0], ball[1]), constants.BALL_RADIUS, rgb_colour,
-                                       constants.CIRCLE_SHIFT)
+                    planned_frames += 1
+                    cut_off_frames += not frame_analysis.is_plan_complete
 
-                    # Find the optimal path
-                    optimal_path = bot.find_optimal_path(options)
-                    ball_path = BallPath(bot.balls, bot.holes, options)
-                    shrink_border = ball_path.get_shrink_borders(options)
+                if is_drawn:
+                    with stage_timer.measure('drawing'):
+                        modified_frame = frame.copy()
+                        self.draw_analysis(modified_frame, frame_analysis, options)
 
-                    for i, _ in enumerate(shrink_border):
-                        if i % 2 != 0:
-                            cv2.line(modified_frame, shrink_border[i], shrink_border[(i + 1) % len(shrink_border)], (150, 150, 255), constants.BORDER_THICKNESS)
-                    if len(optimal_path) > 1:
-                        for i, _ in enumerate(optimal_path[:-1]):
-                            cv2.line(modified_frame, optimal_path[i], optimal_path[i + 1], (0, 0, 0), 3)
+                if not is_output:
+                    continue
 
-                        ball_path = BallPath(bot.balls, bot.holes, options)
+                analysed_frames += 1
 
-                        target_holes = ball_path.get_target_holes(options)
+                if analysed_frames == 1:
+                    # Includes opening the video, finding the holes and loading or compiling the kernels
+                    first_frame_time = time.perf_counter() - start_time
 
-                        for a_target in target_holes:
-                            cv2.circle(modified_frame, (a_target[0], a_target[1]), 2, (0, 0, 0), 10)
+                if results_file:
+                    frame_result = self.get_frame_result(frame_count, timestamp, frame_analysis)
+                    results_file.write(json.dumps(frame_result) + '\n')
 
                 if options.save_video:
-                    out.write(modified_frame)
+                    with stage_timer.measure('encode'):
+                        out.write(modified_frame)
+
+                stage_timer.finish_frame(frame_count)
 
                 if options.show_video:
                     cv2.imwrite(f"Output/Original/{frame_count}.jpg", frame)
@@ -212,9 +256,114 @@ class VideoAnalysis:
             else:
                 break
 
+        frame_reader.release()
+
+        if frame_profiler:
+            # The video can end before the window does
+            frame_profiler.stop()
+            frame_profiler.print_profile()
+
+        if analysed_frames:
+            print(f'Startup: first frame analysed after {first_frame_time:.2f} s')
+
+        frame_reader.print_occupancy()
+
+        if options.ball_tracking:
+            bot.ball_tracker.print_tracking()
+
+        if static_scene:
+            static_scene.print_static(analysed_frames)
+
+        if bot.path_cache:
+            bot.path_cache.print_hits()
+
+        if options.plan_budget > 0:
+            print(f'Plan budget: {cut_off_frames} of {planned_frames} planned frames were cut off at the deadline')
+
+        if options.latency_file or options.metrics_port:
+            stage_timer.print_latency()
+
+        stage_timer.release()
+
+        if results_file:
+            results_file.close()
+
         if options.save_video:
             out.release()
 
+        return analysed_frames
+
+    @staticmethod
+    def draw_analysis(modified_frame, frame_analysis, options):
+        """
+        Responsible for drawing the holes, balls, borders and optimal path of the analysis onto a frame
+
+        Args:
+            modified_frame (np.ndarray): The frame to draw onto
+            frame_analysis (FrameAnalysis): The analysis of the frame
+            options (Options): The options to be used
+        """
+
+        for hole in frame_analysis.holes:
+            cv2.circle(modified_frame, (hole[0], hole[1]), constants.DOT_RADIUS, (255, 255, 255),
+                       constants.CIRCLE_SHIFT)
+            cv2.circle(modified_frame, (hole[0], hole[1]), options.hole_radius, (255, 255, 255),
+                       constants.CIRCLE_SHIFT)
+
+        for ball in frame_analysis.balls:
+            rgb_colour = None
+
+            if ball[2] == BallColour.Solid:
+                rgb_colour = (255, 0, 0)  # Blue
+            elif ball[2] == BallColour.Strip:
+                rgb_colour = (0, 255, 0)  # Green
+            elif ball[2] == BallColour.Black:
+                rgb_colour = (255, 255, 0)  # Yellow
+            elif ball[2] == BallColour.White:
+                rgb_colour = (0, 255, 255)  # Cyan
+
+            if rgb_colour is not None:
+                cv2.circle(modified_frame, (ball[0], ball[1]), constants.DOT_RADIUS, (0, 0, 0),
+                           constants.CIRCLE_SHIFT)
+                cv2.circle(modified_frame, (ball[0], ball[1]), constants.BALL_RADIUS, rgb_colour,
+                           constants.CIRCLE_SHIFT)
+
+        shrink_border = frame_analysis.shrink_borders
+        optimal_path = frame_analysis.optimal_path
+
+        for i, _ in enumerate(shrink_border):
+            if i % 2 != 0:
+                cv2.line(modified_frame, shrink_border[i], shrink_border[(i + 1) % len(shrink_border)], (150, 150, 255), constants.BORDER_THICKNESS)
+        if len(optimal_path) > 1:
+            for i, _ in enumerate(optimal_path[:-1]):
+                cv2.line(modified_frame, optimal_path[i], optimal_path[i + 1], (0, 0, 0), 3)
+
+            for a_target in frame_analysis.target_holes:
+                cv2.circle(modified_frame, (a_target[0], a_target[1]), 2, (0, 0, 0), 10)
+
+    @staticmethod
+    def get_frame_result(frame_count, timestamp, frame_analysis):
+        """
+        Responsible for returning the analysis result of a frame in a JSON serialisable form
+
+        Args:
+            frame_count (int): The frame count
+            timestamp (float): The timestamp of the frame in milliseconds, as read from the capture
+            frame_analysis (FrameAnalysis): The analysis of the frame
+        Returns:
+            dict: The frame count, timestamp in seconds, balls, holes, optimal path and whether planning finished
+        """
+
+        return {
+            'frame': int(frame_count),
+            'timestamp': round(timestamp / 1000, 3),
+            'balls': [[int(ball[0]), int(ball[1]), ball[2].name if ball[2] is not None else None]
+                      for ball in frame_analysis.balls],
+            'holes': [[int(hole[0]), int(hole[1])] for hole in frame_analysis.holes],
+            'path': [[int(node[0]), int(node[1])] for node in frame_analysis.optimal_path],
+            'plan_complete': frame_analysis.is_plan_complete,
+        }
+
     @staticmethod
     def print_timestamp(frame_count):
         """
@@ -229,4 +378,4 @@ class VideoAnalysis:
             time_minutes = int(frame_count / 1800) % 60
             time_seconds = int((frame_count % 1800) / 30)
 
-            print('Timestamp: ' + str(time_hours) + ':' + str(time_minutes) + ':' + str(time_seconds))
+            logger.info('Timestamp: %d:%d:%d', time_hours, time_minutes, time_seconds)
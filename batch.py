@@ -0,0 +1,55 @@
+"""Batch Module"""
+
+import argparse
+import json
+
+from Logic.batch_analysis import BatchAnalysis
+from start import check_arguments, create_parser as create_start_parser
+
+
+def create_parser():
+    """Responsible for creating a parser that handles the batch arguments, other arguments are passed to start.py"""
+
+    formatter = lambda prog: argparse.HelpFormatter(prog, width=140, max_help_position=50)
+
+    parser = argparse.ArgumentParser(
+        description='Analyses many videos across a pool of worker processes. Arguments that are not listed below are '
+                    'passed to start.py for every video.',
+        formatter_class=formatter,
+        add_help=False
+    )
+
+    parser.add_argument('-v', '--videos', metavar='path', type=str, nargs='+', required=True,
+                        help='Video files, or directories containing the videos, to be analysed.')
+    parser.add_argument('-of', '--output_folder', metavar='folder', type=str, nargs=1, default=['Output'],
+                        help='Folder for the output videos and results.')
+    parser.add_argument('-ov', '--overrides', metavar='file', type=str, nargs=1, default=[None],
+                        help='JSON file mapping video paths or names to their own start.py arguments.')
+    parser.add_argument('-m', '--manifest', metavar='file', type=str, nargs=1, default=['manifest.json'],
+                        help='File path for the manifest of each video status, wall time and frame rate.')
+    parser.add_argument('-j', '--jobs', metavar='N', type=int, nargs=1, default=[1],
+                        help='Number of worker processes, each analysing one video at a time.')
+    parser.add_argument('-res', '--save_results', action='store_true',
+                        help='Save the per frame results of each video next to its output video.')
+
+    parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS,
+                        help='Show this help message and exit.')
+
+    return parser
+
+
+if __name__ == '__main__':
+    parser = create_parser()
+    args, start_args = parser.parse_known_args()
+
+    overrides = {}
+
+    if args.overrides[0]:
+        with open(args.overrides[0], encoding='utf-8') as overrides_file:
+            overrides = json.load(overrides_file)
+
+    batch_analysis = BatchAnalysis(create_start_parser(), start_args, overrides, check_arguments)
+
+    videos = batch_analysis.find_videos(args.videos)
+    batch_analysis.analyse_videos(videos, args.output_folder[0], args.manifest[0], args.jobs[0],
+                                  args.save_results)
@@ -0,0 +1,97 @@
+"""Bench Module"""
+
+import argparse
+import json
+
+from Logic.options import Options
+from Logic.stage_benchmark import StageBenchmark
+from start import create_parser as create_start_parser
+
+
+def create_parser():
+    """Responsible for creating a parser that handles the benchmark arguments"""
+
+    formatter = lambda prog: argparse.HelpFormatter(prog, width=140, max_help_position=50)
+
+    parser = argparse.ArgumentParser(
+        description='Times each stage of the analysis on a fixed rendered frame and ball layout, and compares the '
+                    'timings with a baseline.',
+        formatter_class=formatter,
+        add_help=False
+    )
+
+    parser.add_argument('-fw', '--frame_width', metavar='N', type=int, nargs=1, default=[1920],
+                        help='Width of the rendered frame in pixels.')
+    parser.add_argument('-fh', '--frame_height', metavar='N', type=int, nargs=1, default=[1080],
+                        help='Height of the rendered frame in pixels.')
+    parser.add_argument('-bc', '--ball_count', metavar='N', type=int, nargs=1, default=[16],
+                        help='Number of balls on the table, including the white and black balls.')
+    parser.add_argument('-s', '--seed', metavar='N', type=int, nargs=1, default=[0],
+                        help='Seed of the ball layout.')
+    parser.add_argument('-r', '--repeats', metavar='N', type=int, nargs=1, default=[50],
+                        help='Number of timed runs of each stage.')
+
+    parser.add_argument('-o', '--output', metavar='file', type=str, nargs=1, default=['benchmark.json'],
+                        help='File path for the stage timings (*.JSON).')
+    parser.add_argument('-c', '--compare', metavar='file', type=str, nargs=1, default=[None],
+                        help='File path of the baseline stage timings to compare with (*.JSON).')
+    parser.add_argument('-t', '--threshold', metavar='pct', type=float, nargs=1, default=[10],
+                        help='Fail when the median of a stage is more than pct percent slower than its baseline.')
+
+    parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS,
+                        help='Show this help message and exit.')
+
+    return parser
+
+
+if __name__ == '__main__':
+    parser = create_parser()
+    args = parser.parse_args()
+
+    settings = {
+        'frame_width': args.frame_width[0],
+        'frame_height': args.frame_height[0],
+        'ball_count': args.ball_count[0],
+        'seed': args.seed[0],
+        'repeats': args.repeats[0],
+    }
+
+    try:
+        stage_benchmark = StageBenchmark(args.frame_width[0], args.frame_height[0], args.ball_count[0], args.seed[0])
+
+        options = Options(create_start_parser().parse_args(
+            ['-br', str(stage_benchmark.table_renderer.ball_radius),
+             '-hr', str(stage_benchmark.table_renderer.hole_radius)]))
+
+        stages = StageBenchmark.get_summary(stage_benchmark.run(options, args.repeats[0]))
+    except ValueError as error:
+        parser.error(str(error))
+
+    for stage, summary in stages.items():
+        print(f'{stage:<24} median {summary["median_ms"]:9.3f} ms   min {summary["min_ms"]:9.3f} ms')
+
+    with open(args.output[0], 'w', encoding='utf-8') as output_file:
+        json.dump({'settings': settings, 'stages': stages}, output_file, indent=2)
+
+    if args.compare[0]:
+        with open(args.compare[0], encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+        if baseline.get('settings') != settings:
+            print(f'Warning: the baseline was run with {baseline.get("settings")}')
+
+        comparisons = StageBenchmark.compare(stages, baseline['stages'], args.threshold[0])
+        regressions = [comparison[0] for comparison in comparisons if comparison[4]]
+
+        for stage, baseline_median, median, change, is_regression in comparisons:
+            if baseline_median is None:
+                print(f'{stage:<24} missing from the baseline, {median:9.3f} ms')
+            elif median is None:
+                print(f'{stage:<24} {baseline_median:9.3f} ms -> missing from this run   REGRESSION')
+            else:
+                print(f'{stage:<24} {baseline_median:9.3f} ms -> {median:9.3f} ms   {change:+7.1f} %'
+                      f'{"   REGRESSION" if is_regression else ""}')
+
+        if regressions:
+            parser.exit(1, f'{len(regressions)} stages regressed by more than {args.threshold[0]} % or are missing '
+                           f'from this run: {", ".join(regressions)}\n')
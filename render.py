@@ -0,0 +1,84 @@
+"""Render Module"""
+
+import argparse
+import json
+
+import cv2
+
+from Logic.table_renderer import TableRenderer
+
+
+def create_parser():
+    """Responsible for creating a parser that handles the render arguments"""
+
+    formatter = lambda prog: argparse.HelpFormatter(prog, width=140, max_help_position=50)
+
+    parser = argparse.ArgumentParser(
+        description='Renders a synthetic table video with known ball positions and colours, together with the ground '
+                    'truth of every frame.',
+        formatter_class=formatter,
+        add_help=False
+    )
+
+    parser.add_argument('-fw', '--frame_width', metavar='N', type=int, nargs=1, default=[1920],
+                        help='Width of the frames in pixels.')
+    parser.add_argument('-fh', '--frame_height', metavar='N', type=int, nargs=1, default=[1080],
+                        help='Height of the frames in pixels.')
+    parser.add_argument('-bc', '--ball_count', metavar='N', type=int, nargs=1, default=[16],
+                        help='Number of balls on the table, including the white and black balls.')
+    parser.add_argument('-br', '--ball_radius', metavar='N', type=int, nargs=1, default=[None],
+                        help='Radius of the pool balls (the detection constant by default).')
+    parser.add_argument('-hr', '--hole_radius', metavar='N', type=int, nargs=1, default=[None],
+                        help='Radius of the corner holes (the detection constant by default).')
+
+    parser.add_argument('-f', '--frames', metavar='N', type=int, nargs=1, default=[90],
+                        help='Number of frames in the video.')
+    parser.add_argument('-fps', '--frame_rate', metavar='N', type=int, nargs=1, default=[30],
+                        help='Frame rate of the video.')
+    parser.add_argument('-mb', '--moving_balls', metavar='N', type=int, nargs=1, default=[1],
+                        help='Number of rolling balls, starting with the white ball.')
+    parser.add_argument('-sp', '--speed', metavar='N', type=float, nargs=1, default=[8],
+                        help='Speed of the rolling balls in pixels per frame.')
+    parser.add_argument('-s', '--seed', metavar='N', type=int, nargs=1, default=[0],
+                        help='Seed of the ball layout and movements.')
+
+    parser.add_argument('-op', '--output_video', metavar='file', type=str, nargs=1, default=['Footage\\Synthetic.mp4'],
+                        help='File path for the rendered video (*.MP4).')
+    parser.add_argument('-gt', '--truth_file', metavar='file', type=str, nargs=1, default=['Footage\\Synthetic.jsonl'],
+                        help='File path for the per frame ground truth (*.JSONL).')
+
+    parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS,
+                        help='Show this help message and exit.')
+
+    return parser
+
+
+if __name__ == '__main__':
+    parser = create_parser()
+    args = parser.parse_args()
+
+    table_renderer = TableRenderer(args.frame_width[0], args.frame_height[0], args.ball_radius[0],
+                                   args.hole_radius[0], args.seed[0])
+
+    balls = table_renderer.get_layout(args.ball_count[0])
+    velocities = table_renderer.get_velocities(balls, args.speed[0], args.moving_balls[0])
+
+    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+    video_writer = cv2.VideoWriter(args.output_video[0], fourcc, args.frame_rate[0],
+                                   (args.frame_width[0], args.frame_height[0]))
+
+    with open(args.truth_file[0], 'w', encoding='utf-8') as truth_file:
+        for frame_index in range(args.frames[0]):
+            video_writer.write(table_renderer.render_frame(balls))
+
+            frame_truth = table_renderer.get_frame_truth(frame_index + 1, balls, table_renderer.holes)
+            truth_file.write(json.dumps(frame_truth) + '\n')
+
+            table_renderer.move_balls(balls, velocities)
+
+    video_writer.release()
+
+    print(f'Rendered {args.frames[0]} frames of {args.ball_count[0]} balls at {args.frame_width[0]}x'
+          f'{args.frame_height[0]}, ball radius {table_renderer.ball_radius} and hole radius '
+          f'{table_renderer.hole_radius}, analyse it with -br {table_renderer.ball_radius} -hr '
+          f'{table_renderer.hole_radius}')
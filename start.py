@@ -1,9 +1,10 @@
 """Start Module"""
 
 import argparse
+import logging
+import time
 
 from Logic.options import Options
-from Logic.video_analysis import VideoAnalysis
 
 
 def create_parser():
@@ -28,13 +29,63 @@ def create_parser():
     parser.add_argument('-tb', '--target_balls', metavar='type', type=str, nargs=1, choices=['solid', 'striped'],
                         default=['solid'], help='Choose ball type for path calculation.')
 
+    parser.add_argument('-hd', '--hole_detection', metavar='mode', type=str, nargs=1, choices=['full', 'coarse'],
+                        default=['full'], help='Find the holes on the entire frame or coarse to fine from a downscaled one.')
+    parser.add_argument('-tc', '--table_cache', metavar='file', type=str, nargs=1, default=[None],
+                        help='File path of the cache of tables found in previous videos (*.JSON).')
+    parser.add_argument('-tch', '--table_check', metavar='N', type=int, nargs=1, default=[30],
+                        help='Check the cached table holes every N processed frames (0 never checks).')
+
+    parser.add_argument('-pc', '--path_cache', metavar='N', type=int, nargs=1, default=[0],
+                        help='Cache the optimal paths of the N most recent ball layouts (0 disables).')
+    parser.add_argument('-pq', '--path_quantum', metavar='N', type=int, nargs=1, default=[4],
+                        help='Quantize the ball positions to N pixels when looking up cached paths.')
+    parser.add_argument('-pb', '--plan_budget', metavar='ms', type=float, nargs=1, default=[0],
+                        help='Analyse each frame within ms milliseconds, suggesting the best shot found by then (0 disables).')
+
     parser.add_argument('-ip', '--input_video', metavar='file', type=str, nargs=1, default='Footage\\Example_01.mp4',
                         help='File path containing the game footage to be analysed (*.MP4).')
     parser.add_argument('-op', '--output_video', metavar='file', type=str, nargs=1, default='Footage\\Output.mp4',
                         help='File path for the output video (*.MP4).')
+    parser.add_argument('-rf', '--results_file', metavar='file', type=str, nargs=1, default=[None],
+                        help='File path for the per frame results (*.JSONL).')
+    parser.add_argument('-lf', '--latency_file', metavar='file', type=str, nargs=1, default=[None],
+                        help='File path for the per frame stage timings (*.JSONL or *.CSV).')
+    parser.add_argument('-mp', '--metrics_port', metavar='N', type=int, nargs=1, default=[0],
+                        help='Serve the rolling stage latency percentiles for Prometheus on local port N (0 disables).')
+    parser.add_argument('-ll', '--log_level', metavar='level', type=str, nargs=1,
+                        choices=['debug', 'info', 'warning'], default=['info'],
+                        help='Log per frame timestamps at info and the found balls at debug.')
+
+    parser.add_argument('-pr', '--profile', metavar='file', type=str, nargs=1, default=[None],
+                        help='Profile a window of frames, saving collapsed stacks (*.folded) and a report (*.txt).')
+    parser.add_argument('-prs', '--profile_start', metavar='N', type=int, nargs=1, default=[0],
+                        help='Start profiling after N analysed frames.')
+    parser.add_argument('-prw', '--profile_window', metavar='N', type=int, nargs=1, default=[100],
+                        help='Number of frames to profile.')
 
     parser.add_argument('-sf', '--skip_frame', metavar='N', type=int, nargs=1, default=[10],
                         help='Process a frame every N frame when analysing the video.')
+    parser.add_argument('-sm', '--sampling_mode', metavar='mode', type=str, nargs=1,
+                        choices=['decode', 'grab', 'time'], default=['decode'],
+                        help='Decode every frame, grab skipped frames without decoding them or sample by timestamp.')
+    parser.add_argument('-ss', '--seek_stride', metavar='N', type=int, nargs=1, default=[120],
+                        help='Seek instead of grabbing when at least N frames are skipped (0 never seeks).')
+    parser.add_argument('-si', '--sample_interval', metavar='ms', type=float, nargs=1, default=[0],
+                        help='Milliseconds between frames when sampling by timestamp (0 derives it from -sf).')
+    parser.add_argument('-pf', '--prefetch_frames', metavar='N', type=int, nargs=1, default=[0],
+                        help='Decode up to N frames ahead on a background thread (0 decodes serially).')
+
+    parser.add_argument('-st', '--static_threshold', metavar='T', type=float, nargs=1, default=[0],
+                        help='Reuse the previous analysis while no part of the board differs by more than T grey levels (0 disables).')
+    parser.add_argument('-bt', '--ball_tracking', action='store_true',
+                        help='Track the balls across frames, searching the entire board only when they are lost.')
+    parser.add_argument('-cm', '--classification_mode', metavar='mode', type=str, nargs=1,
+                        choices=['mask', 'integral'], default=['mask'],
+                        help='Classify ball colours from per ball patches or from colour class integral images.')
+
+    parser.add_argument('-w', '--workers', metavar='N', type=int, nargs=1, default=[1],
+                        help='Number of processes analysing ranges of the video in parallel.')
 
     parser.add_argument('-show', '--show_video', action='store_true',
                         help='Show the video while processing is being done.')
@@ -44,14 +95,91 @@ def create_parser():
     parser.add_argument('-h', '--help', action='help', default=argparse.SUPPRESS,
                         help='Show this help message and exit.')
 
+    subparsers = parser.add_subparsers(dest='command', metavar='command',
+                                       help='Run a command instead of analysing the video.')
+    subparsers.add_parser('warmup', help='Compile the path finding kernels into their on-disk cache and exit.')
+
     return parser
 
 
+def check_arguments(parser, args):
+    """
+    Responsible for rejecting argument combinations that cannot be analysed, exiting through the parser
+
+    Args:
+        parser (argparse.ArgumentParser): The parser the arguments were parsed by
+        args (argparse.Namespace): The parsed arguments
+    """
+
+    if args.workers[0] > 1 and args.sampling_mode[0] == 'time':
+        parser.error('--workers cannot be combined with --sampling_mode time')
+
+    if args.workers[0] > 1 and args.show_video:
+        parser.error('--workers cannot be combined with --show_video')
+
+    if args.workers[0] > 1 and (args.latency_file[0] or args.metrics_port[0]):
+        parser.error('--workers cannot be combined with --latency_file or --metrics_port')
+
+    # Each range only carries over the state of one frame, so state kept across frames would differ from a single
+    # process run
+    if args.workers[0] > 1 and args.static_threshold[0] > 0:
+        parser.error('--workers cannot be combined with --static_threshold')
+
+    if args.workers[0] > 1 and args.ball_tracking:
+        parser.error('--workers cannot be combined with --ball_tracking')
+
+    if args.workers[0] > 1 and args.path_cache[0] > 0:
+        parser.error('--workers cannot be combined with --path_cache')
+
+    if args.workers[0] > 1 and args.table_cache[0] and args.table_check[0] > 0:
+        parser.error('--workers cannot be combined with --table_check, use --table_check 0 with --table_cache')
+
+    if args.workers[0] > 1 and args.profile[0]:
+        parser.error('--workers cannot be combined with --profile')
+
+
+def warm_up(options):
+    """Responsible for compiling the path finding kernels into their on-disk cache, e.g. at deploy time"""
+
+    import_start = time.perf_counter()
+    from Logic.Path.path_warmup import PathWarmup
+    import_time = time.perf_counter() - import_start
+
+    first_plan_time, second_plan_time = PathWarmup().warm_up(options)
+
+    print(f'Warm-up: imports took {import_time:.2f} s, the first plan took {first_plan_time:.2f} s and a compiled '
+          f'plan takes {second_plan_time:.3f} s')
+
+
 if __name__ == '__main__':
     parser = create_parser()
     args = parser.parse_args()
 
+    check_arguments(parser, args)
+
     options = Options(args)
 
-    video_analysis = VideoAnalysis()
-    video_analysis.analyse_video(options)
+    logging.basicConfig(level=options.log_level.upper(), format='%(message)s')
+
+    if args.command == 'warmup':
+        warm_up(options)
+        parser.exit()
+
+    # The analysis modules import OpenCV and compile or load the Numba kernels, so they are only imported once the
+    # arguments are valid and a video is going to be analysed
+    import_start = time.perf_counter()
+
+    if options.workers > 1:
+        from Logic.parallel_analysis import ParallelAnalysis
+
+        print(f'Startup: imports took {time.perf_counter() - import_start:.2f} s')
+
+        parallel_analysis = ParallelAnalysis()
+        parallel_analysis.analyse_video(options)
+    else:
+        from Logic.video_analysis import VideoAnalysis
+
+        print(f'Startup: imports took {time.perf_counter() - import_start:.2f} s')
+
+        video_analysis = VideoAnalysis()
+        video_analysis.analyse_video(options)
@@ -0,0 +1,80 @@
+"""Ball Classification Tests"""
+
+import math
+
+import numpy as np
+
+from Logic.bot import Bot
+from Logic.options import Options
+from Logic.table_renderer import TableRenderer
+from start import create_parser
+
+
+def get_reference_counts(frame, position, ball_radius):
+    """Responsible for counting the white, black and total ball pixels pixel by pixel, as the original loops did"""
+
+    ball_pixels = []
+
+    ball_frame = frame[int(position[1] - ball_radius):int(position[1] + ball_radius),
+                       int(position[0] - ball_radius):int(position[0] + ball_radius)]
+
+    for x_position, _ in enumerate(ball_frame[0:-1]):
+        for y_position, _ in enumerate(ball_frame[0:-1]):
+            if math.sqrt((ball_radius - x_position) ** 2 + (ball_radius - y_position) ** 2) < ball_radius:
+                ball_pixels.append(ball_frame[x_position][y_position])
+
+    white_count = sum(all(192 <= channel <= 255 for channel in pixel) for pixel in ball_pixels)
+    black_count = sum(all(0 <= channel <= 64 for channel in pixel) for pixel in ball_pixels)
+
+    return white_count, black_count, len(ball_pixels)
+
+
+def get_noisy_table():
+    """Responsible for rendering a table with noise that moves pixels across the colour thresholds"""
+
+    table_renderer = TableRenderer(1920, 1080, seed=0)
+    layout = table_renderer.get_layout(16)
+
+    frame = table_renderer.render_frame(layout).astype(int)
+    frame += np.random.default_rng(0).integers(-40, 41, frame.shape)
+
+    # The last ball is cut off by the edge of the frame
+    positions = [(ball[0], ball[1]) for ball in layout] + [(960, 1075)]
+
+    return table_renderer, np.clip(frame, 0, 255).astype(np.uint8), positions
+
+
+def test_batched_classification_matches_the_pixel_loops():
+    options = Options(create_parser().parse_args(['-br', '24']))
+    _, frame, positions = get_noisy_table()
+    bot = Bot()
+
+    reference_counts = [get_reference_counts(frame, position, options.ball_radius) for position in positions]
+
+    patches, clipped_indices = bot.ball_classification.get_ball_patches(frame, positions, options)
+    white_counts, black_counts, total = bot.ball_classification.get_colour_counts(patches, options)
+
+    assert clipped_indices == [len(positions) - 1]
+    assert list(zip(white_counts.tolist(), black_counts.tolist(), [total] * len(patches))) == reference_counts[:-1]
+
+    assert bot.classify_balls_colours(frame, positions, options) == [
+        bot.get_ball_colour(*counts) for counts in reference_counts]
+
+
+def test_integral_classification_matches_the_pixel_loops():
+    options = Options(create_parser().parse_args(['-br', '24']))
+    table_renderer, frame, positions = get_noisy_table()
+    bot = Bot()
+
+    reference_counts = [get_reference_counts(frame, position, options.ball_radius) for position in positions]
+
+    colour_integrals = bot.ball_classification.get_colour_integrals(frame, table_renderer.board_positions, options)
+    white_counts, black_counts, total, is_valid = bot.ball_classification.get_integral_colour_counts(
+        colour_integrals, positions, options)
+
+    assert is_valid.tolist() == [True] * (len(positions) - 1) + [False]
+    assert list(zip(white_counts.tolist(), black_counts.tolist(), [total] * len(positions)))[:-1] == \
+        reference_counts[:-1]
+
+    assert bot.classify_balls_colours(frame, positions, options, colour_integrals) == [
+        bot.get_ball_colour(*counts) for counts in reference_counts]
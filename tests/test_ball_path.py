@@ -0,0 +1,15 @@
+"""Ball Path Tests"""
+
+from Logic.Detection.ball_colour import BallColour
+from Logic.options import Options
+from Logic.Path.ball_path import BallPath
+from Logic.Path.path_warmup import PathWarmup
+from start import create_parser
+
+
+def test_path_is_found_when_the_white_ball_is_detected_first():
+    options = Options(create_parser().parse_args([]))
+
+    balls = sorted(PathWarmup.BALLS, key=lambda ball: ball[2] != BallColour.White)
+
+    assert BallPath(balls, list(PathWarmup.HOLES), options).find_path(options)
@@ -0,0 +1,52 @@
+"""Ball Tracker Tests"""
+
+from Logic.Detection.ball_tracker import BallTracker
+from Logic.table_renderer import TableRenderer
+
+
+def get_tracked_table():
+    """Responsible for rendering a table and tracking every ball but the white ball, as if it was hidden"""
+
+    table_renderer = TableRenderer(1920, 1080, seed=0)
+    balls = table_renderer.get_layout(16)
+
+    ball_tracker = BallTracker()
+    ball_tracker.update_tracks(table_renderer.render_frame(balls[1:]), table_renderer.board_positions,
+                               [(ball[0], ball[1], ball[2]) for ball in balls[1:]])
+
+    return table_renderer, balls, ball_tracker
+
+
+def test_unchanged_board_is_confirmed():
+    table_renderer, balls, ball_tracker = get_tracked_table()
+
+    assert ball_tracker.confirm_balls(table_renderer.render_frame(balls[1:]), table_renderer.board_positions)
+
+
+def test_untracked_ball_needs_a_full_detection():
+    table_renderer, balls, ball_tracker = get_tracked_table()
+
+    assert not ball_tracker.confirm_balls(table_renderer.render_frame(balls), table_renderer.board_positions)
+
+
+def test_track_ids_follow_the_balls_across_detections():
+    table_renderer = TableRenderer(1920, 1080, seed=0)
+    layout = table_renderer.get_layout(16)
+
+    frame = table_renderer.render_frame(layout)
+    balls = [(ball[0], ball[1], ball[2]) for ball in layout]
+
+    ball_tracker = BallTracker()
+    ball_tracker.update_tracks(frame, table_renderer.board_positions, balls)
+    track_ids = dict(zip(balls, ball_tracker.get_ball_ids()))
+
+    # The next detection lists the balls in another order, each one moved slightly, without the last ball
+    moved_balls = [(ball[0] + 5, ball[1] - 3, ball[2]) for ball in reversed(balls[:-1])]
+    ball_tracker.update_tracks(frame, table_renderer.board_positions, moved_balls)
+
+    assert ball_tracker.get_ball_ids() == [track_ids[(ball[0] - 5, ball[1] + 3, ball[2])] for ball in moved_balls]
+
+    # The last ball reappears away from every track, so it gets a new identity
+    ball_tracker.update_tracks(frame, table_renderer.board_positions, moved_balls + [balls[-1]])
+
+    assert ball_tracker.get_ball_ids()[-1] == len(balls)
@@ -0,0 +1,31 @@
+"""Batch Analysis Tests"""
+
+import os
+
+import pytest
+
+from Logic.batch_analysis import BatchAnalysis
+from start import check_arguments, create_parser
+
+
+def test_videos_are_listed_once(tmp_path):
+    video = tmp_path / 'clip.mp4'
+    video.write_bytes(b'')
+
+    videos = BatchAnalysis.find_videos([str(tmp_path), str(video), os.path.join(str(tmp_path), '.', 'clip.mp4')])
+
+    assert videos == [str(video)]
+
+
+def test_videos_sharing_a_name_get_their_own_output():
+    videos = [os.path.join('first', 'clip.mp4'), os.path.join('second', 'clip.mp4'), 'clip_2.mp4']
+
+    assert list(BatchAnalysis.get_output_names(videos).values()) == ['clip', 'clip_2', 'clip_2_2']
+
+
+@pytest.mark.parametrize('overrides', [['-w', '2'], ['-sm', 'time', '-w', '2'], ['-br', 'wide']])
+def test_invalid_video_arguments_are_rejected(overrides):
+    batch_analysis = BatchAnalysis(create_parser(), [], {'clip.mp4': overrides}, check_arguments)
+
+    with pytest.raises(ValueError):
+        batch_analysis.get_video_args('clip.mp4', 'clip', 'Output', False)
@@ -0,0 +1,87 @@
+"""Dijkstra Graph Tests"""
+
+import math
+import random
+
+from Logic.Path.dijkstra_graph import DijkstraGraph
+
+
+def find_reference_path(edges, weights, start, goal):
+    """Responsible for searching a goal by taking the closest unvisited node on each step, as the original graph did"""
+
+    shortest_paths = {start: (None, 0)}
+    current_node = start
+    visited = set()
+
+    while current_node != goal:
+        visited.add(current_node)
+
+        for next_node in edges.get(current_node, []):
+            weight = weights[(current_node, next_node)] + shortest_paths[current_node][1]
+
+            if next_node not in shortest_paths or shortest_paths[next_node][1] > weight:
+                shortest_paths[next_node] = (current_node, weight)
+
+        next_destinations = {node: shortest_paths[node] for node in shortest_paths if node not in visited}
+
+        if not next_destinations:
+            return [], math.inf
+
+        current_node = min(next_destinations, key=lambda node: next_destinations[node][1])
+
+    path = []
+    path_weight = 0
+
+    while current_node is not None:
+        path.append(current_node)
+        path_weight += shortest_paths[current_node][1]
+        current_node = shortest_paths[current_node][0]
+
+    return path[::-1], path_weight
+
+
+def find_reference_any_goal_path(edges, weights, start, goals):
+    """Responsible for searching every goal on its own and returning the first path of the lowest path weight"""
+
+    best_path, best_weight = [], math.inf
+
+    for goal in goals:
+        path, path_weight = find_reference_path(edges, weights, start, goal)
+
+        if path_weight < best_weight:
+            best_path, best_weight = path, path_weight
+
+    return best_path
+
+
+def test_single_search_matches_a_search_per_goal():
+    random_generator = random.Random(0)
+
+    for _ in range(200):
+        nodes = [(random_generator.randint(0, 20), random_generator.randint(0, 20)) for _ in range(20)]
+        nodes = list(dict.fromkeys(nodes))
+
+        graph = DijkstraGraph()
+        edges = {}
+        weights = {}
+
+        # Small integer weights make ties between paths common, which both searches have to break the same way
+        for _ in range(random_generator.randint(15, 40)):
+            from_node, to_node = random_generator.sample(nodes, 2)
+            weight = random_generator.randint(1, 4)
+
+            graph.add_edge(from_node, to_node, weight)
+
+            # As in the original graph, an edge added again is listed again and both take the new weight
+            for node, other_node in ((from_node, to_node), (to_node, from_node)):
+                edges.setdefault(node, []).append(other_node)
+                weights[(node, other_node)] = weight
+
+        start = nodes[0]
+        goals = random_generator.sample(nodes, 4)
+
+        # A start without edges is not part of the graph, so it is not a path to itself
+        if start not in graph.node_ids:
+            continue
+
+        assert graph.find_any_goal_path(start, goals) == find_reference_any_goal_path(edges, weights, start, goals)
@@ -0,0 +1,50 @@
+"""Frame Reader Tests"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from Logic.frame_reader import FrameReader
+
+
+class FailingCapture:
+    """Responsible for returning a few frames and then failing to decode, as a corrupt video would"""
+
+    def __init__(self, frames):
+        self.frames = frames
+
+    def read(self):
+        if self.frames == 0:
+            raise RuntimeError('Corrupt frame')
+
+        self.frames -= 1
+
+        return True, np.zeros((4, 4, 3), dtype=np.uint8)
+
+    def get(self, _):
+        return 0.0
+
+    def release(self):
+        pass
+
+
+def get_options(prefetch_frames):
+    return SimpleNamespace(skip_frame=1, sampling_mode='decode', seek_stride=0, sample_interval=0,
+                           prefetch_frames=prefetch_frames)
+
+
+def test_decode_error_is_raised_by_the_prefetched_read():
+    frame_reader = FrameReader(FailingCapture(3), get_options(2)).start()
+
+    frame_counts = []
+
+    with pytest.raises(RuntimeError, match='Corrupt frame'):
+        while True:
+            frame_count, ret, _, _ = frame_reader.read()
+            frame_counts.append(frame_count)
+
+    frame_reader.release()
+
+    assert frame_counts == [1, 2, 3]
+
@@ -0,0 +1,72 @@
+"""Path Cache Tests"""
+
+from Logic.bot import Bot
+from Logic.options import Options
+from Logic.Path.path_cache import PathCache
+from Logic.table_renderer import TableRenderer
+from start import create_parser
+
+
+def get_options(*arguments):
+    """Responsible for returning the options of the rendered table with the given extra arguments"""
+
+    return Options(create_parser().parse_args(['-br', '24', '-hr', '48'] + list(arguments)))
+
+
+def get_table(ball_count=16):
+    """Responsible for returning the balls and holes of a rendered table"""
+
+    table_renderer = TableRenderer(1920, 1080, seed=0)
+    balls = [(ball[0], ball[1], ball[2]) for ball in table_renderer.get_layout(ball_count)]
+
+    return balls, list(table_renderer.holes)
+
+
+def test_key_ignores_the_ball_order_and_small_jitter():
+    options = get_options()
+    balls, holes = get_table()
+    path_cache = PathCache(4, 4)
+
+    # Jitter of less than half the quantum around a grid point keeps the key
+    balls = [(ball[0] // 4 * 4, ball[1] // 4 * 4, ball[2]) for ball in balls]
+    jittered_balls = [(ball[0] + 1, ball[1] - 1, ball[2]) for ball in reversed(balls)]
+
+    assert path_cache.get_key(balls, holes, options) == path_cache.get_key(jittered_balls, holes, options)
+
+
+def test_least_recently_used_layout_is_evicted():
+    path_cache = PathCache(2, 4)
+
+    path_cache.store('first', [(1, 1)])
+    path_cache.store('second', [(2, 2)])
+
+    assert path_cache.lookup('first') == [(1, 1)]
+
+    path_cache.store('third', [(3, 3)])
+
+    assert path_cache.lookup('second') is None
+    assert path_cache.lookup('first') == [(1, 1)]
+    assert path_cache.lookup('third') == [(3, 3)]
+    assert (path_cache.hits, path_cache.misses) == (3, 1)
+
+
+def test_cached_path_is_returned_on_a_hit():
+    options = get_options('-pc', '4')
+    bot = Bot()
+    bot.balls, bot.holes = get_table()
+
+    optimal_path, _ = bot.find_optimal_path(options)
+
+    assert bot.find_optimal_path(options) == (optimal_path, True)
+    assert (bot.path_cache.hits, bot.path_cache.misses) == (1, 1)
+
+
+def test_plan_cut_off_by_its_deadline_is_not_cached():
+    options = get_options('-pc', '4')
+    bot = Bot()
+    bot.balls, bot.holes = get_table()
+
+    _, is_plan_complete = bot.find_optimal_path(options, deadline=0)
+
+    assert not is_plan_complete
+    assert not bot.path_cache.paths
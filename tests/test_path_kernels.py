@@ -0,0 +1,56 @@
+"""Path Kernel Tests"""
+
+import math
+
+import numpy as np
+import pytest
+
+from Logic.Path.ball_grid import BallGrid, get_blocking_balls
+from Logic.Path.table_geometry import get_target_hole_offsets
+from Logic.Path.vectors import distance_from_point_to_segment, distance_from_two_points, move_from_two_points
+
+
+def get_points(count, seed):
+    """Responsible for returning random points on a 1080p frame, some of them repeated"""
+
+    points = np.random.default_rng(seed).uniform(0, 1080, (count, 2)).round(1)
+    points[::7] = points[0]
+
+    return [(float(point[0]), float(point[1])) for point in points]
+
+
+@pytest.mark.parametrize('kernel', [distance_from_two_points, distance_from_point_to_segment])
+def test_compiled_distances_match_the_python_functions(kernel):
+    points = get_points(60, 0)
+    arguments = [points[i:i + kernel.py_func.__code__.co_argcount] for i in range(len(points) - 2)]
+
+    for argument in arguments:
+        assert kernel(*argument) == pytest.approx(kernel.py_func(*argument), abs=1e-9)
+
+
+def test_compiled_move_matches_the_python_function():
+    points = get_points(60, 1)
+
+    for point_one, point_two in zip(points[:-1], points[1:]):
+        if point_one == point_two:
+            continue
+
+        assert move_from_two_points(point_one, point_two, 52.8) == move_from_two_points.py_func(point_one, point_two,
+                                                                                                   52.8)
+
+
+def test_compiled_target_hole_offsets_match_the_python_function():
+    angles = np.linspace(0, math.pi / 2, 30, True)
+
+    assert np.array_equal(get_target_hole_offsets(angles, 18, 39), get_target_hole_offsets.py_func(angles, 18, 39))
+
+
+def test_compiled_blocking_balls_match_the_python_function():
+    ball_grid = BallGrid(np.array(get_points(40, 2)), 52.8)
+    segment_starts = np.array(get_points(30, 3))
+    segment_finishes = np.array(get_points(30, 4))
+
+    arguments = (ball_grid.cell_starts, ball_grid.cell_balls, ball_grid.origin, ball_grid.columns, ball_grid.rows,
+                 ball_grid.cell_size, ball_grid.ball_points, segment_starts, segment_finishes, 52.8)
+
+    assert np.array_equal(get_blocking_balls(*arguments), get_blocking_balls.py_func(*arguments))
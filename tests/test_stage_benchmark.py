@@ -0,0 +1,28 @@
+"""Stage Benchmark Tests"""
+
+import pytest
+
+from Logic.options import Options
+from Logic.stage_benchmark import StageBenchmark
+from start import create_parser
+
+
+def test_missing_stages_are_reported_and_a_missing_current_stage_regresses():
+    stages = {'find_balls': {'median_ms': 2.0}, 'draw_analysis': {'median_ms': 1.0}}
+    baseline_stages = {'find_balls': {'median_ms': 1.0}, 'find_corner_holes': {'median_ms': 3.0}}
+
+    comparisons = StageBenchmark.compare(stages, baseline_stages, 10)
+
+    assert comparisons == [('find_balls', 1.0, 2.0, 100.0, True), ('draw_analysis', None, 1.0, None, False),
+                           ('find_corner_holes', 3.0, None, None, True)]
+
+
+def test_run_fails_clearly_without_the_corner_holes():
+    stage_benchmark = StageBenchmark(1280, 720, 4)
+    stage_benchmark.frame[:] = 0
+
+    options = Options(create_parser().parse_args(['-br', str(stage_benchmark.table_renderer.ball_radius),
+                                                  '-hr', str(stage_benchmark.table_renderer.hole_radius)]))
+
+    with pytest.raises(ValueError, match='of the 4 corner holes were found'):
+        stage_benchmark.run(options, 1)
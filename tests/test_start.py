@@ -0,0 +1,19 @@
+"""Start Tests"""
+
+import pytest
+
+from start import check_arguments, create_parser
+
+
+@pytest.mark.parametrize('arguments', [['-bt'], ['-pc', '8'], ['-tc', 'tables.json'], ['-st', '2']])
+def test_workers_reject_state_kept_across_frames(arguments):
+    parser = create_parser()
+
+    with pytest.raises(SystemExit):
+        check_arguments(parser, parser.parse_args(['-w', '2'] + arguments))
+
+
+def test_workers_accept_an_unchecked_table_cache():
+    parser = create_parser()
+
+    check_arguments(parser, parser.parse_args(['-w', '2', '-tc', 'tables.json', '-tch', '0']))
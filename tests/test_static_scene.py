@@ -0,0 +1,52 @@
+"""Static Scene Tests"""
+
+from Logic.Detection.static_scene import StaticSceneDetector
+from Logic.table_renderer import TableRenderer
+
+
+def render_frames(distance):
+    """Responsible for rendering a table, and the same table after its white ball rolled by a distance"""
+
+    table_renderer = TableRenderer(1920, 1080, seed=0)
+    balls = table_renderer.get_layout(16)
+
+    frame = table_renderer.render_frame(balls)
+
+    balls[0][0] += distance
+    moved_frame = table_renderer.render_frame(balls)
+
+    return frame, moved_frame, table_renderer.board_positions
+
+
+def test_unchanged_board_is_static():
+    frame, _, board_positions = render_frames(0)
+    static_scene = StaticSceneDetector(8)
+
+    assert not static_scene.is_static(frame, board_positions)
+    assert static_scene.is_static(frame.copy(), board_positions)
+
+
+def test_single_rolling_ball_is_not_static():
+    frame, moved_frame, board_positions = render_frames(3)
+    static_scene = StaticSceneDetector(8)
+
+    static_scene.is_static(frame, board_positions)
+
+    assert not static_scene.is_static(moved_frame, board_positions)
+
+
+def test_slow_roll_is_compared_with_the_last_analysed_board():
+    table_renderer = TableRenderer(1920, 1080, seed=0)
+    balls = table_renderer.get_layout(16)
+    static_scene = StaticSceneDetector(8)
+
+    static_scene.is_static(table_renderer.render_frame(balls), table_renderer.board_positions)
+
+    # Every step is small, but the reference stays the last analysed board so the drift is caught
+    reused_frames = 0
+
+    for _ in range(10):
+        balls[0][0] += 1
+        reused_frames += static_scene.is_static(table_renderer.render_frame(balls), table_renderer.board_positions)
+
+    assert reused_frames < 10
@@ -0,0 +1,45 @@
+"""Table Cache Tests"""
+
+import json
+import logging
+
+from Logic.Detection.table_cache import TableCache
+from Logic.table_renderer import TableRenderer
+
+
+def get_table(width, height):
+    """Responsible for rendering an empty table and returning the frame and its corner holes"""
+
+    table_renderer = TableRenderer(width, height, seed=0)
+
+    return table_renderer.render_frame([]), table_renderer.holes[:4]
+
+
+def test_corrupt_cache_is_treated_as_empty(tmp_path, caplog):
+    cache_path = tmp_path / 'tables.json'
+    cache_path.write_text('{"1920x1080": [{"signature"', encoding='utf-8')
+
+    with caplog.at_level(logging.WARNING):
+        table_cache = TableCache(str(cache_path))
+
+    assert table_cache.tables == {}
+    assert 'unreadable table cache' in caplog.text
+
+
+def test_tables_stored_by_another_run_are_kept(tmp_path):
+    cache_path = str(tmp_path / 'tables.json')
+    frame, holes = get_table(1920, 1080)
+    other_frame, other_holes = get_table(1280, 720)
+
+    # Both runs read the empty cache before either of them stored a table
+    table_cache = TableCache(cache_path)
+    other_table_cache = TableCache(cache_path)
+
+    table_cache.store_holes(frame, holes)
+    other_table_cache.store_holes(other_frame, other_holes)
+
+    with open(cache_path, encoding='utf-8') as cache_file:
+        assert sorted(json.load(cache_file)) == ['1280x720', '1920x1080']
+
+    assert TableCache(cache_path).find_holes(frame) == [(int(hole[0]), int(hole[1])) for hole in holes]
+    assert list(tmp_path.iterdir()) == [tmp_path / 'tables.json']
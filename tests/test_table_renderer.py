@@ -0,0 +1,16 @@
+"""Table Renderer Tests"""
+
+import math
+
+from Logic.Detection.ball_detection import BallDetection
+from Logic.table_renderer import TableRenderer
+
+
+def test_default_radii_are_detected_at_other_resolutions():
+    table_renderer = TableRenderer(1280, 720, seed=0)
+
+    detected_holes = BallDetection.find_corner_holes(table_renderer.render_frame(table_renderer.get_layout(2)))
+
+    assert len(detected_holes) == 4
+    assert all(min(math.dist(hole, detected_hole) for detected_hole in detected_holes) <= 3
+               for hole in table_renderer.holes[:4])
@@ -0,0 +1,70 @@
+"""Vectors Tests"""
+
+import random
+
+import numpy as np
+
+from Logic.Path.vectors import Vectors
+
+
+def get_orientation(point, segment_start, segment_finish):
+    """Responsible for returning the side of the segment line the point is on, 0 when it is on the line"""
+
+    cross = (segment_finish[0] - segment_start[0]) * (point[1] - segment_start[1]) - \
+            (segment_finish[1] - segment_start[1]) * (point[0] - segment_start[0])
+
+    return (cross > 0) - (cross < 0)
+
+
+def is_on_segment(point, segment_start, segment_finish):
+    """Responsible for checking whether a point on the segment line is within the segment bounds"""
+
+    return min(segment_start[0], segment_finish[0]) <= point[0] <= max(segment_start[0], segment_finish[0]) and \
+        min(segment_start[1], segment_finish[1]) <= point[1] <= max(segment_start[1], segment_finish[1])
+
+
+def is_intercepting(segment, other_segment):
+    """Responsible for checking whether two integer segments intercept with the exact orientation test"""
+
+    orientations = [get_orientation(other_segment[0], *segment), get_orientation(other_segment[1], *segment),
+                    get_orientation(segment[0], *other_segment), get_orientation(segment[1], *other_segment)]
+
+    if orientations[0] != orientations[1] and orientations[2] != orientations[3] and 0 not in orientations:
+        return True
+
+    return (orientations[0] == 0 and is_on_segment(other_segment[0], *segment)) or \
+        (orientations[1] == 0 and is_on_segment(other_segment[1], *segment)) or \
+        (orientations[2] == 0 and is_on_segment(segment[0], *other_segment)) or \
+        (orientations[3] == 0 and is_on_segment(segment[1], *other_segment))
+
+
+def get_segments(generator, count):
+    """Responsible for returning random integer segments on a small grid, so touching and collinear ones are common"""
+
+    segments = []
+
+    while len(segments) < count:
+        segment = tuple((generator.randint(0, 8), generator.randint(0, 8)) for _ in range(2))
+
+        if segment[0] != segment[1]:
+            segments.append(segment)
+
+    return segments
+
+
+def test_batched_intercepts_match_the_exact_orientation_test():
+    generator = random.Random(0)
+
+    segments = get_segments(generator, 60)
+    other_segments = get_segments(generator, 60)
+
+    intercepts = Vectors.segments_intercept_segments([segment[0] for segment in segments],
+                                                     [segment[1] for segment in segments],
+                                                     [segment[0] for segment in other_segments],
+                                                     [segment[1] for segment in other_segments], 0)
+
+    expected = np.array([[is_intercepting(segment, other_segment) for other_segment in other_segments]
+                         for segment in segments])
+
+    assert np.array_equal(intercepts, expected)
+    assert 0 < expected.sum() < expected.size